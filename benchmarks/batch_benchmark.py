@@ -0,0 +1,56 @@
+# coding=utf-8
+"""
+Benchmark of batch XML import. Compares loading of many files one after another with load_many using pools
+of worker processes.
+
+Usage: python -m benchmarks.batch_benchmark
+"""
+from __future__ import print_function
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import bpmn_python.bpmn_diagram_batch as batch
+import bpmn_python.bpmn_diagram_rep as diagram
+from benchmarks.diagram_generator import generate_diagram
+
+files_count = 200
+diagram_size = 500
+
+
+def load_sequentially(filepaths):
+    for filepath in filepaths:
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(filepath)
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    try:
+        filepaths = []
+        for index in range(files_count):
+            filename = "generated-" + str(index) + ".bpmn"
+            generate_diagram(diagram_size).export_xml_file(directory + os.sep, filename)
+            filepaths.append(os.path.join(directory, filename))
+
+        start = time.time()
+        load_sequentially(filepaths)
+        print("{} files of {} nodes, sequential: {:.2f} s".format(files_count, diagram_size, time.time() - start))
+        workers = 1
+        while workers <= multiprocessing.cpu_count():
+            for streaming in [False, True]:
+                start = time.time()
+                for _ in batch.load_many(filepaths, workers=workers, streaming=streaming, chunksize=4):
+                    pass
+                print("load_many, {} workers, streaming={}: {:.2f} s".format(workers, streaming,
+                                                                             time.time() - start))
+            workers *= 2
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,66 @@
+# coding=utf-8
+"""
+Benchmark of diagram_layout_metrics crossing points counting. Compares grid-bucketed crossing counter, NumPy
+vectorized counter (single layout and a batch of layouts) and pairwise reference implementation on generated diagrams
+with random orthogonal flow waypoints.
+
+Usage: python -m benchmarks.crossing_benchmark
+"""
+from __future__ import print_function
+
+import math
+import random
+import timeit
+
+import bpmn_python.bpmn_python_consts as consts
+import bpmn_python.diagram_layout_metrics as metrics
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [100, 500, 2000, 5000]
+pairwise_limit = 1000
+batch_size = 20
+
+
+def set_random_waypoints(bpmn_graph, seed=0):
+    """
+    Sets orthogonal waypoints of three segments for each flow, endpoints are spread over a canvas growing
+    with the number of flows.
+    """
+    generator = random.Random(seed)
+    flows = bpmn_graph.get_flows()
+    canvas_size = 150 * int(math.sqrt(len(flows)) + 1)
+    for flow in flows:
+        (source_x, source_y) = (generator.uniform(0, canvas_size), generator.uniform(0, canvas_size))
+        (target_x, target_y) = (source_x + generator.uniform(-300, 300), source_y + generator.uniform(-300, 300))
+        middle_x = (source_x + target_x) / 2
+        flow[2][consts.Consts.waypoints] = [(source_x, source_y), (middle_x, source_y), (middle_x, target_y),
+                                            (target_x, target_y)]
+
+
+def run():
+    print("{:>8} {:>10} {:>12} {:>10} {:>16} {:>16} {:>14}".format(
+        "flows", "segments", "crossings", "grid [s]", "vectorized [s]", "batch/layout [s]", "pairwise [s]"))
+    for size in sizes:
+        bpmn_graph = generate_diagram(size)
+        set_random_waypoints(bpmn_graph)
+        crossings = []
+        grid_time = timeit.timeit(lambda: crossings.append(metrics.count_crossing_points(bpmn_graph)), number=1)
+        vectorized_time = timeit.timeit(
+            lambda: crossings.append(metrics.count_crossing_points_vectorized(bpmn_graph)), number=1)
+        layouts = [metrics.get_segments_array(bpmn_graph)] * batch_size
+        batch_time = timeit.timeit(lambda: crossings.extend(metrics.count_crossing_points_batch(layouts)), number=1)
+        assert len(set(crossings)) == 1
+        pairwise = "-"
+        flows_count = len(bpmn_graph.get_flows())
+        if flows_count <= pairwise_limit:
+            expected = []
+            pairwise = "{:.3f}".format(timeit.timeit(
+                lambda: expected.append(metrics.count_crossing_points_pairwise(bpmn_graph)), number=1))
+            assert crossings[0] == expected[0]
+        print("{:>8} {:>10} {:>12} {:>10.3f} {:>16.3f} {:>16.4f} {:>14}".format(
+            flows_count, metrics.count_segments(bpmn_graph), crossings[0], grid_time, vectorized_time,
+            batch_time / batch_size, pairwise))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,55 @@
+# coding=utf-8
+"""
+Helper module, that generates synthetic BPMN diagrams of requested size for benchmarks
+"""
+import random
+
+import bpmn_python.bpmn_diagram_rep as diagram
+
+
+def generate_diagram(nodes_count, split_probability=0.1, branches=3, seed=0, loop_probability=0.0, loop_span=10):
+    """
+    Generates a single-process diagram with roughly nodes_count flow nodes. Diagram is a chain of tasks, where
+    some tasks are replaced by parallel split/join blocks with 'branches' branches of one task each. Optionally,
+    tasks of the chain get flows back to one of preceding nodes of the chain, that close cycles.
+
+    :param nodes_count: approximate number of flow nodes in generated diagram,
+    :param split_probability: probability of inserting split/join block instead of a single task,
+    :param branches: number of branches in each split/join block,
+    :param seed: seed of random number generator, used to make generated diagrams reproducible,
+    :param loop_probability: probability of adding a flow from task back to one of preceding nodes of the chain,
+    :param loop_span: maximal number of chain nodes, that are skipped back by a flow closing cycle.
+    :return: an instance of BpmnDiagramGraph class.
+    """
+    generator = random.Random(seed)
+    bpmn_graph = diagram.BpmnDiagramGraph()
+    bpmn_graph.create_new_diagram_graph(diagram_name="generated")
+    process_id = bpmn_graph.add_process_to_diagram()
+    [last_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start")
+    count = 1
+    chain_ids = [last_id]
+    while count < nodes_count - 1:
+        if generator.random() < split_probability:
+            [split_id, _] = bpmn_graph.add_parallel_gateway_to_diagram(process_id, gateway_name="split" + str(count))
+            [join_id, _] = bpmn_graph.add_parallel_gateway_to_diagram(process_id, gateway_name="join" + str(count))
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, split_id)
+            for branch in range(branches):
+                [task_id, _] = bpmn_graph.add_task_to_diagram(process_id,
+                                                              task_name="task" + str(count) + "_" + str(branch))
+                bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, task_id)
+                bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, join_id)
+            count += branches + 2
+            last_id = join_id
+        else:
+            [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task" + str(count))
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, task_id)
+            count += 1
+            last_id = task_id
+            # immediate predecessor is skipped, flow in opposite direction would be merged with existing one
+            if loop_probability > 0 and len(chain_ids) > 1 and generator.random() < loop_probability:
+                bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id,
+                                                        generator.choice(chain_ids[-loop_span - 1:-1]))
+        chain_ids.append(last_id)
+    [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end")
+    bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, end_id)
+    return bpmn_graph
@@ -0,0 +1,62 @@
+# coding=utf-8
+"""
+Benchmark of importing process elements with the default (minidom based) importer. Document is parsed once, import of
+'process' elements (dispatching child elements by tag name and adding nodes and flows to graph) is measured and
+reported as number of imported XML elements per second.
+
+Usage: python -m benchmarks.element_import_benchmark
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+
+import bpmn_python.bpmn_diagram_import as bpmn_import
+import bpmn_python.bpmn_diagram_rep as diagram
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [1000, 10000, 50000]
+repeats = 3
+
+
+def count_process_children(document):
+    count = 0
+    for process_element in document.getElementsByTagNameNS("*", "process"):
+        count += sum(1 for element in process_element.childNodes if element.nodeType == element.ELEMENT_NODE)
+    return count
+
+
+def measure(document, di_elements):
+    best = None
+    for _ in range(repeats):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        start = time.time()
+        bpmn_import.BpmnDiagramGraphImport.import_process_elements(document, bpmn_graph.diagram_graph,
+                                                                   bpmn_graph.sequence_flows,
+                                                                   bpmn_graph.process_elements, di_elements)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    try:
+        print("{:>8} {:>10} {:>12} {:>16}".format("nodes", "elements", "import [s]", "elements/s"))
+        for size in sizes:
+            filename = "generated-" + str(size) + ".bpmn"
+            generate_diagram(size).export_xml_file(directory + os.sep, filename)
+            document = bpmn_import.BpmnDiagramGraphImport.read_xml_file(os.path.join(directory, filename))
+            plane_element = document.getElementsByTagNameNS("*", "BPMNPlane")[0]
+            di_elements = bpmn_import.BpmnDiagramGraphImport.index_di_elements(plane_element)
+            elements = count_process_children(document)
+            elapsed = measure(document, di_elements)
+            print("{:>8} {:>10} {:>12.3f} {:>16.0f}".format(size, elements, elapsed, elements / elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
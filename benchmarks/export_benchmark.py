@@ -0,0 +1,35 @@
+# coding=utf-8
+"""
+Benchmark of BPMN XML export. Compares time of the default ElementTree based exporter and the streaming one.
+
+Usage: python -m benchmarks.export_benchmark
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import timeit
+
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [1000, 10000, 50000]
+
+
+def run():
+    directory = tempfile.mkdtemp() + os.sep
+    try:
+        print("{:>8} {:>10} {:>12} {:>12}".format("nodes", "file [MB]", "tree [s]", "stream [s]"))
+        for size in sizes:
+            bpmn_graph = generate_diagram(size)
+            tree_time = timeit.timeit(lambda: bpmn_graph.export_xml_file(directory, "tree.bpmn"), number=1)
+            stream_time = timeit.timeit(lambda: bpmn_graph.export_xml_file(directory, "stream.bpmn", streaming=True),
+                                        number=1)
+            print("{:>8} {:>10.1f} {:>12.2f} {:>12.2f}".format(
+                size, os.path.getsize(directory + "stream.bpmn") / 1e6, tree_time, stream_time))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
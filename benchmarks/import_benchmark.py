@@ -0,0 +1,51 @@
+# coding=utf-8
+"""
+Benchmark of BPMN XML import. Compares time and peak memory (measured with tracemalloc) of the default minidom based
+importer and the streaming one.
+
+Usage: python -m benchmarks.import_benchmark
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import bpmn_python.bpmn_diagram_rep as diagram
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [1000, 10000, 50000]
+
+
+def measure(filepath, streaming):
+    tracemalloc.start()
+    start = time.time()
+    bpmn_graph = diagram.BpmnDiagramGraph()
+    bpmn_graph.load_diagram_from_xml_file(filepath, streaming=streaming)
+    elapsed = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    try:
+        print("{:>8} {:>10} {:>12} {:>12} {:>14} {:>14}".format(
+            "nodes", "file [MB]", "dom [s]", "stream [s]", "dom [MB]", "stream [MB]"))
+        for size in sizes:
+            filename = "generated-" + str(size) + ".bpmn"
+            generate_diagram(size).export_xml_file(directory + os.sep, filename)
+            filepath = os.path.join(directory, filename)
+            dom_time, dom_peak = measure(filepath, False)
+            stream_time, stream_peak = measure(filepath, True)
+            print("{:>8} {:>10.1f} {:>12.2f} {:>12.2f} {:>14.1f} {:>14.1f}".format(
+                size, os.path.getsize(filepath) / 1e6, dom_time, stream_time, dom_peak / 1e6, stream_peak / 1e6))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
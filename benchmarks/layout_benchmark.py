@@ -0,0 +1,34 @@
+# coding=utf-8
+"""
+Benchmark of diagram layouter. Measures time of generate_layout and number of crossing points of generated layout
+for generated diagrams of growing size, without and with cycles, for each layout engine.
+
+Usage: python -m benchmarks.layout_benchmark
+"""
+from __future__ import print_function
+
+import timeit
+
+import bpmn_python.bpmn_diagram_layouter as layouter
+import bpmn_python.diagram_layout_metrics as metrics
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [100, 1000, 5000, 20000]
+loop_probabilities = [0.0, 0.05]
+engines = [layouter.grid_engine, layouter.layered_engine]
+
+
+def run():
+    print("{:>8} {:>8} {:>8} {:>12} {:>10}".format("nodes", "flows", "engine", "layout [s]", "crossings"))
+    for loop_probability in loop_probabilities:
+        for size in sizes:
+            for engine in engines:
+                bpmn_graph = generate_diagram(size, loop_probability=loop_probability)
+                layout_time = timeit.timeit(lambda: layouter.generate_layout(bpmn_graph, engine=engine), number=1)
+                print("{:>8} {:>8} {:>8} {:>12.3f} {:>10}".format(
+                    bpmn_graph.diagram_graph.number_of_nodes(), len(bpmn_graph.get_flows()), engine, layout_time,
+                    metrics.count_crossing_points_vectorized(bpmn_graph)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,37 @@
+# coding=utf-8
+"""
+Benchmark of BpmnDiagramGraph node and flow lookups by ID. Average lookup time should stay flat
+when diagram size grows.
+
+Usage: python -m benchmarks.lookup_benchmark
+"""
+from __future__ import print_function
+
+import random
+import timeit
+
+import bpmn_python.bpmn_python_consts as consts
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [100, 1000, 10000, 100000]
+lookups = 10000
+
+
+def run():
+    print("{:>8} {:>22} {:>22}".format("nodes", "get_node_by_id [us]", "get_flow_by_id [us]"))
+    for size in sizes:
+        bpmn_graph = generate_diagram(size)
+        generator = random.Random(size)
+        all_node_ids = list(bpmn_graph.diagram_graph.nodes())
+        all_flow_ids = list(bpmn_graph.sequence_flows)
+        node_ids = [generator.choice(all_node_ids) for _ in range(lookups)]
+        flow_ids = [generator.choice(all_flow_ids) for _ in range(lookups)]
+        node_time = timeit.timeit(lambda: [bpmn_graph.get_node_by_id(node_id) for node_id in node_ids], number=1)
+        flow_time = timeit.timeit(lambda: [bpmn_graph.get_flow_by_id(flow_id) for flow_id in flow_ids], number=1)
+        assert all(bpmn_graph.get_flow_by_id(flow_id)[2][consts.Consts.id] == flow_id for flow_id in flow_ids)
+        print("{:>8} {:>22.3f} {:>22.3f}".format(bpmn_graph.diagram_graph.number_of_nodes(),
+                                                 node_time / lookups * 1e6, flow_time / lookups * 1e6))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,53 @@
+# coding=utf-8
+"""
+Benchmark of memory used by BpmnDiagramGraph. Compares memory retained (measured with tracemalloc) by a diagram
+imported with dictionary attributes and with compact records.
+
+Usage: python -m benchmarks.memory_benchmark
+"""
+from __future__ import print_function
+
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+import bpmn_python.bpmn_diagram_rep as diagram
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [1000, 10000, 50000]
+
+
+def measure(filepath, compact):
+    gc.collect()
+    tracemalloc.start()
+    bpmn_graph = diagram.BpmnDiagramGraph(compact=compact)
+    bpmn_graph.load_diagram_from_xml_file(filepath, streaming=True)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    elements = bpmn_graph.diagram_graph.number_of_nodes() + bpmn_graph.diagram_graph.number_of_edges()
+    return retained, elements
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    try:
+        print("{:>8} {:>12} {:>14} {:>14} {:>16} {:>16}".format(
+            "nodes", "elements", "dict [MB]", "compact [MB]", "dict [B/elem]", "compact [B/elem]"))
+        for size in sizes:
+            filename = "generated-" + str(size) + ".bpmn"
+            generate_diagram(size).export_xml_file(directory + os.sep, filename)
+            filepath = os.path.join(directory, filename)
+            dict_memory, elements = measure(filepath, False)
+            compact_memory, _ = measure(filepath, True)
+            print("{:>8} {:>12} {:>14.1f} {:>14.1f} {:>16.0f} {:>16.0f}".format(
+                size, elements, dict_memory / 1e6, compact_memory / 1e6, float(dict_memory) / elements,
+                float(compact_memory) / elements))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
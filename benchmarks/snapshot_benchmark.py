@@ -0,0 +1,54 @@
+# coding=utf-8
+"""
+Benchmark of diagram loading. Compares time of loading diagram from BPMN XML file (default and streaming importer)
+with loading it from binary snapshot.
+
+Usage: python -m benchmarks.snapshot_benchmark
+"""
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+
+import bpmn_python.bpmn_diagram_layouter as layouter
+import bpmn_python.bpmn_diagram_rep as diagram
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [1000, 10000, 50000]
+
+
+def measure(load):
+    bpmn_graph = diagram.BpmnDiagramGraph()
+    start = time.time()
+    load(bpmn_graph)
+    return time.time() - start
+
+
+def run():
+    directory = tempfile.mkdtemp()
+    try:
+        print("{:>8} {:>10} {:>14} {:>10} {:>12} {:>12} {:>14}".format(
+            "nodes", "xml [MB]", "snapshot [MB]", "dom [s]", "stream [s]", "save [s]", "snapshot [s]"))
+        for size in sizes:
+            bpmn_graph = generate_diagram(size)
+            layouter.generate_layout(bpmn_graph)
+            xml_path = os.path.join(directory, "generated-" + str(size) + ".bpmn")
+            snapshot_path = os.path.join(directory, "generated-" + str(size) + ".snapshot")
+            bpmn_graph.export_xml_file(directory + os.sep, os.path.basename(xml_path))
+            start = time.time()
+            bpmn_graph.save_snapshot(snapshot_path)
+            save_time = time.time() - start
+            dom_time = measure(lambda graph: graph.load_diagram_from_xml_file(xml_path))
+            stream_time = measure(lambda graph: graph.load_diagram_from_xml_file(xml_path, streaming=True))
+            snapshot_time = measure(lambda graph: graph.load_snapshot(snapshot_path))
+            print("{:>8} {:>10.1f} {:>14.1f} {:>10.2f} {:>12.2f} {:>12.2f} {:>14.2f}".format(
+                size, os.path.getsize(xml_path) / 1e6, os.path.getsize(snapshot_path) / 1e6, dom_time, stream_time,
+                save_time, snapshot_time))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
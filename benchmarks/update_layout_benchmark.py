@@ -0,0 +1,40 @@
+# coding=utf-8
+"""
+Benchmark of incremental layout update. Generates grid layout of generated diagram, then adds task connected to
+existing node and measures time of update_grid_layout, compared with generating layout from scratch.
+
+Usage: python -m benchmarks.update_layout_benchmark
+"""
+from __future__ import print_function
+
+import random
+import timeit
+
+import bpmn_python.bpmn_diagram_layouter as layouter
+from benchmarks.diagram_generator import generate_diagram
+
+sizes = [100, 1000, 2000, 5000]
+edits_count = 20
+
+
+def run():
+    print("{:>8} {:>14} {:>16}".format("nodes", "full [ms]", "update [ms]"))
+    for size in sizes:
+        bpmn_graph = generate_diagram(size)
+        process_id = list(bpmn_graph.process_elements.keys())[0]
+        full_time = timeit.timeit(lambda: layouter.generate_grid_layout(bpmn_graph), number=1)
+        grid = layouter.generate_grid_layout(bpmn_graph)
+        nodes_ids = [node_id for (node_id, _) in bpmn_graph.get_nodes()]
+        generator = random.Random(0)
+        update_time = 0.0
+        for index in range(edits_count):
+            source_id = generator.choice(nodes_ids)
+            [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="added" + str(index))
+            [flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, source_id, task_id)
+            update_time += timeit.timeit(lambda: layouter.update_grid_layout(
+                bpmn_graph, grid, added_nodes=[task_id], added_flows=[flow_id]), number=1)
+        print("{:>8} {:>14.2f} {:>16.2f}".format(size, full_time * 1000.0, update_time * 1000.0 / edits_count))
+
+
+if __name__ == "__main__":
+    run()
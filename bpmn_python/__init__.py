@@ -2,6 +2,9 @@
 """
 Package init file
 """
-__all__ = ["bpmn_diagram_export", "bpmn_diagram_import", "bpmn_diagram_layouter",
+__all__ = ["bpmn_diagram_export", "bpmn_diagram_import", "bpmn_diagram_streaming_import",
+           "bpmn_diagram_import_cache", "bpmn_diagram_streaming_export", "bpmn_diagram_batch", "bpmn_diagram_layouter",
+           "bpmn_diagram_layered_layouter", "bpmn_diagram_lanes_layouter", "bpmn_diagram_router",
            "bpmn_diagram_exception", "bpmn_diagram_metrics", "bpmn_diagram_visualizer", "bpmn_import_utils",
-           "bpmn_process_csv_export", "diagram_layout_metrics", "grid_cell_class", "bpmn_diagram_rep"]
+           "bpmn_process_csv_export", "diagram_layout_metrics", "grid_class", "grid_cell_class", "bpmn_diagram_rep",
+           "bpmn_diagram_records", "bpmn_diagram_snapshot"]
@@ -0,0 +1,229 @@
+# coding=utf-8
+"""
+Package provides functions for importing, exporting and converting many BPMN diagrams at once, in a pool of worker
+processes. Diagrams are passed between processes as payloads - tuples of plain Python objects, that are cheaper to
+pickle than BpmnDiagramGraph objects
+"""
+import multiprocessing
+import os
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_import_utils as utils
+import bpmn_python.bpmn_python_consts as consts
+
+# file format -> name of BpmnDiagramGraph export method and extension of output file
+export_formats = {
+    "xml": ("export_xml_file", ".bpmn"),
+    "xml_no_di": ("export_xml_file_no_di", ".bpmn"),
+    "csv": ("export_csv_file", ".csv"),
+}
+
+
+def get_diagram_payload(bpmn_graph):
+    """
+    Converts diagram to payload, a picklable tuple of plain Python objects, which can be passed between processes.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: a tuple of multigraph flag, list of nodes (pairs of node ID and attributes dictionary), list of flows
+        (triples of source ID, target ID and attributes dictionary), sequence flows dictionary, process elements
+        dictionary, collaboration dictionary, diagram attributes and plane attributes.
+    """
+    diagram_graph = bpmn_graph.diagram_graph
+    return (diagram_graph.is_multigraph(),
+            [(node_id, dict(node)) for (node_id, node) in diagram_graph.nodes(data=True)],
+            [(source_ref, target_ref, dict(flow)) for (source_ref, target_ref, flow) in diagram_graph.edges(data=True)],
+            bpmn_graph.sequence_flows, bpmn_graph.process_elements, bpmn_graph.collaboration,
+            bpmn_graph.diagram_attributes, bpmn_graph.plane_attributes)
+
+
+def create_diagram_from_payload(payload, compact=False):
+    """
+    Creates diagram from payload returned by get_diagram_payload.
+
+    :param payload: a tuple returned by get_diagram_payload function,
+    :param compact: boolean flag, if set to True, diagram keeps attributes of nodes and edges in compact records.
+    :return: an instance of BpmnDiagramGraph class.
+    """
+    (multigraph, nodes, flows, sequence_flows, process_elements, collaboration, diagram_attributes,
+     plane_attributes) = payload
+    bpmn_graph = diagram.BpmnDiagramGraph(multigraph=multigraph, compact=compact)
+    diagram_graph = bpmn_graph.diagram_graph
+    for (node_id, node) in nodes:
+        diagram_graph.add_node(node_id)
+        diagram_graph.node[node_id].update(node)
+    for (source_ref, target_ref, flow) in flows:
+        utils.BpmnImportUtils.add_flow_edge(diagram_graph, flow.get(consts.Consts.id), source_ref,
+                                            target_ref).update(flow)
+    bpmn_graph.sequence_flows = sequence_flows
+    bpmn_graph.process_elements = process_elements
+    bpmn_graph.collaboration = collaboration
+    bpmn_graph.diagram_attributes = diagram_attributes
+    bpmn_graph.plane_attributes = plane_attributes
+    bpmn_graph.rebuild_indexes()
+    return bpmn_graph
+
+
+def get_error_message(exception):
+    return type(exception).__name__ + ": " + str(exception)
+
+
+def get_output_filename(filepath, file_format):
+    """
+    Returns name of file, to which converted diagram is exported - name of input file with extension of format.
+
+    :param filepath: string with path to input file,
+    :param file_format: one of keys of export_formats dictionary.
+    :return: string with file name.
+    """
+    return os.path.splitext(os.path.basename(filepath))[0] + export_formats[file_format][1]
+
+
+def check_export_format(file_format):
+    if file_format not in export_formats:
+        raise bpmn_exception.BpmnPythonError("Unknown export format '" + str(file_format) + "', expected one of: "
+                                             + ", ".join(sorted(export_formats)))
+
+
+def load_diagram(load_input):
+    """
+    Loads diagram from XML file and returns its payload. Any exception raised by importer is captured.
+
+    :param load_input: a tuple of file path, streaming flag and multigraph flag.
+    :return: a tuple of file path, diagram payload (or None) and error message (or None).
+    """
+    (filepath, streaming, multigraph) = load_input
+    try:
+        bpmn_graph = diagram.BpmnDiagramGraph(multigraph=multigraph)
+        bpmn_graph.load_diagram_from_xml_file(filepath, streaming=streaming)
+        return filepath, get_diagram_payload(bpmn_graph), None
+    except Exception as exception:
+        return filepath, None, get_error_message(exception)
+
+
+def export_diagram(export_input):
+    """
+    Exports diagram given as payload to file. Any exception raised by exporter is captured.
+
+    :param export_input: a tuple of output file name, diagram payload, output directory and file format.
+    :return: a tuple of output file name and error message (or None).
+    """
+    (filename, payload, directory, file_format) = export_input
+    try:
+        bpmn_graph = create_diagram_from_payload(payload)
+        getattr(bpmn_graph, export_formats[file_format][0])(directory, filename)
+        return filename, None
+    except Exception as exception:
+        return filename, get_error_message(exception)
+
+
+def convert_diagram(convert_input):
+    """
+    Loads diagram from XML file and exports it to file in given format. Any exception is captured.
+
+    :param convert_input: a tuple of file path, output directory, file format and streaming flag.
+    :return: a tuple of file path, output file name and error message (or None).
+    """
+    (filepath, directory, file_format, streaming) = convert_input
+    filename = get_output_filename(filepath, file_format)
+    try:
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(filepath, streaming=streaming)
+        getattr(bpmn_graph, export_formats[file_format][0])(directory, filename)
+        return filepath, filename, None
+    except Exception as exception:
+        return filepath, filename, get_error_message(exception)
+
+
+def map_in_workers(function, inputs, workers=None, ordered=False, chunksize=1):
+    """
+    Generator, that applies function to inputs in pool of worker processes and yields results. Pool is closed when
+    generator is exhausted or closed.
+
+    :param function: module level function of one argument,
+    :param inputs: list of function arguments,
+    :param workers: number of worker processes, by default number of CPUs. If it is 1 (or there is only one input),
+        function is applied in current process,
+    :param ordered: boolean flag, if set to True, results are yielded in order of inputs, otherwise as they are
+        completed,
+    :param chunksize: number of inputs sent to worker process at once.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = min(workers, len(inputs))
+    if workers <= 1:
+        for function_input in inputs:
+            yield function(function_input)
+        return
+    pool = multiprocessing.Pool(workers)
+    try:
+        if ordered:
+            results = pool.imap(function, inputs, chunksize)
+        else:
+            results = pool.imap_unordered(function, inputs, chunksize)
+        for result in results:
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def load_many(filepaths, workers=None, streaming=False, multigraph=False, compact=False, ordered=False,
+              chunksize=1):
+    """
+    Generator, that loads diagrams from XML files in pool of worker processes. Results are yielded as they are
+    completed (or in order of file paths, if ordered flag is set). Errors are captured for each file separately,
+    so a broken file doesn't stop loading of the others.
+
+    :param filepaths: list of paths to BPMN 2.0 XML files,
+    :param workers: number of worker processes, by default number of CPUs,
+    :param streaming: boolean flag, if set to True, files are read with streaming importer,
+    :param multigraph: boolean flag, passed to BpmnDiagramGraph constructor,
+    :param compact: boolean flag, passed to BpmnDiagramGraph constructor,
+    :param ordered: boolean flag, if set to True, results are yielded in order of file paths,
+    :param chunksize: number of files sent to worker process at once.
+    :return: yields tuples of file path, diagram (an instance of BpmnDiagramGraph or None, if loading failed)
+        and error message (or None).
+    """
+    load_inputs = [(filepath, streaming, multigraph) for filepath in filepaths]
+    for (filepath, payload, error) in map_in_workers(load_diagram, load_inputs, workers, ordered, chunksize):
+        bpmn_graph = None if payload is None else create_diagram_from_payload(payload, compact)
+        yield filepath, bpmn_graph, error
+
+
+def export_many(diagrams, directory, file_format="xml", workers=None):
+    """
+    Exports diagrams to files in pool of worker processes. Errors are captured for each diagram separately.
+
+    :param diagrams: list of pairs of output file name and diagram (an instance of BpmnDiagramGraph),
+    :param directory: string representing output directory,
+    :param file_format: "xml" (with Diagram Interchange data), "xml_no_di" or "csv",
+    :param workers: number of worker processes, by default number of CPUs.
+    :return: a list of pairs of output file name and error message (or None), in order of diagrams.
+    """
+    check_export_format(file_format)
+    export_inputs = [(filename, get_diagram_payload(bpmn_graph), directory, file_format)
+                     for (filename, bpmn_graph) in diagrams]
+    return list(map_in_workers(export_diagram, export_inputs, workers, ordered=True))
+
+
+def convert_many(filepaths, directory, file_format="xml", workers=None, streaming=False, ordered=False,
+                 chunksize=1):
+    """
+    Converts diagrams from XML files to given format in pool of worker processes. Diagrams are
+    loaded and exported by worker processes, so they are not passed between processes. Output file name is the name
+    of input file with extension of format.
+
+    :param filepaths: list of paths to BPMN 2.0 XML files,
+    :param directory: string representing output directory,
+    :param file_format: "xml" (with Diagram Interchange data), "xml_no_di" or "csv",
+    :param workers: number of worker processes, by default number of CPUs,
+    :param streaming: boolean flag, if set to True, files are read with streaming importer,
+    :param ordered: boolean flag, if set to True, results are yielded in order of file paths,
+    :param chunksize: number of files sent to worker process at once.
+    :return: an iterator over tuples of file path, output file name and error message (or None), results are
+        available as they are completed (or in order of file paths, if ordered flag is set).
+    """
+    check_export_format(file_format)
+    convert_inputs = [(filepath, directory, file_format, streaming) for filepath in filepaths]
+    return map_in_workers(convert_diagram, convert_inputs, workers, ordered, chunksize)
@@ -22,6 +22,45 @@ class BpmnDiagramGraphExport(object):
     # String "constants" used in multiple places
     bpmndi_namespace = "bpmndi:"
 
+    @staticmethod
+    def format_coordinate(value):
+        """
+        Converts Diagram Interchange value (coordinate or dimension) to string used in exported XML. Integral float
+        numbers are written without fractional part, other values are written with repr, so no precision is lost.
+
+        :param value: float number (or string, if value was set by user as string).
+        """
+        if isinstance(value, float):
+            return str(int(value)) if value.is_integer() else repr(value)
+        return str(value)
+
+    @staticmethod
+    def export_bounds(output_element_di, params):
+        """
+        Creates a new Bounds XML element for given shape parameters and adds it to 'BPMNShape' element.
+
+        :param output_element_di: object of Element class, representing BPMN XML 'BPMNShape' element,
+        :param params: dictionary with 'width', 'height', 'x' and 'y' of shape.
+        """
+        bounds = eTree.SubElement(output_element_di, "omgdc:Bounds")
+        bounds.set(consts.Consts.width, BpmnDiagramGraphExport.format_coordinate(params[consts.Consts.width]))
+        bounds.set(consts.Consts.height, BpmnDiagramGraphExport.format_coordinate(params[consts.Consts.height]))
+        bounds.set(consts.Consts.x, BpmnDiagramGraphExport.format_coordinate(params[consts.Consts.x]))
+        bounds.set(consts.Consts.y, BpmnDiagramGraphExport.format_coordinate(params[consts.Consts.y]))
+
+    @staticmethod
+    def export_waypoints(output_flow, waypoints):
+        """
+        Creates waypoint XML elements for given list of waypoints and adds them to 'BPMNEdge' element.
+
+        :param output_flow: object of Element class, representing BPMN XML 'BPMNEdge' element,
+        :param waypoints: list of (x, y) tuples.
+        """
+        for waypoint in waypoints:
+            waypoint_element = eTree.SubElement(output_flow, "omgdi:waypoint")
+            waypoint_element.set(consts.Consts.x, BpmnDiagramGraphExport.format_coordinate(waypoint[0]))
+            waypoint_element.set(consts.Consts.y, BpmnDiagramGraphExport.format_coordinate(waypoint[1]))
+
     @staticmethod
     def export_task_info(node_params, output_element):
         """
@@ -280,11 +319,7 @@ class BpmnDiagramGraphExport(object):
 
         output_element_di.set(consts.Consts.bpmn_element, lane_id)
         output_element_di.set(consts.Consts.is_horizontal, lane_attr[consts.Consts.is_horizontal])
-        bounds = eTree.SubElement(output_element_di, "omgdc:Bounds")
-        bounds.set(consts.Consts.width, lane_attr[consts.Consts.width])
-        bounds.set(consts.Consts.height, lane_attr[consts.Consts.height])
-        bounds.set(consts.Consts.x, lane_attr[consts.Consts.x])
-        bounds.set(consts.Consts.y, lane_attr[consts.Consts.y])
+        BpmnDiagramGraphExport.export_bounds(output_element_di, lane_attr)
 
     @staticmethod
     def export_diagram_plane_elements(root, diagram_attributes, plane_attributes):
@@ -367,11 +402,7 @@ class BpmnDiagramGraphExport(object):
         output_element_di.set(consts.Consts.id, node_id + "_gui")
 
         output_element_di.set(consts.Consts.bpmn_element, node_id)
-        bounds = eTree.SubElement(output_element_di, "omgdc:Bounds")
-        bounds.set(consts.Consts.width, params[consts.Consts.width])
-        bounds.set(consts.Consts.height, params[consts.Consts.height])
-        bounds.set(consts.Consts.x, params[consts.Consts.x])
-        bounds.set(consts.Consts.y, params[consts.Consts.y])
+        BpmnDiagramGraphExport.export_bounds(output_element_di, params)
         if params[consts.Consts.type] == consts.Consts.subprocess:
             output_element_di.set(consts.Consts.is_expanded, params[consts.Consts.is_expanded])
 
@@ -408,10 +439,80 @@ class BpmnDiagramGraphExport(object):
         output_flow.set(consts.Consts.id, params[consts.Consts.id] + "_gui")
         output_flow.set(consts.Consts.bpmn_element, params[consts.Consts.id])
         waypoints = params[consts.Consts.waypoints]
-        for waypoint in waypoints:
-            waypoint_element = eTree.SubElement(output_flow, "omgdi:waypoint")
-            waypoint_element.set(consts.Consts.x, waypoint[0])
-            waypoint_element.set(consts.Consts.y, waypoint[1])
+        BpmnDiagramGraphExport.export_waypoints(output_flow, waypoints)
+
+    @staticmethod
+    def partition_diagram(bpmn_diagram):
+        """
+        Groups nodes and flows of diagram by parent process in a single pass over nodes and edges of graph. Flows,
+        that are collaboration message flows, are collected separately.
+
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        :return: a tuple of three dictionaries - process ID mapped to list of its nodes (tuples of node ID and
+            node attributes), process ID mapped to list of its flows (tuples of source ID, target ID and flow
+            attributes) and message flow ID mapped to message flow attributes.
+        """
+        message_flows_ids = bpmn_diagram.collaboration.get(consts.Consts.message_flows, {})
+        nodes_by_process = {}
+        for (node_id, node) in bpmn_diagram.diagram_graph.nodes(data=True):
+            nodes_by_process.setdefault(node.get(consts.Consts.process), []).append((node_id, node))
+        flows_by_process = {}
+        message_flows_params = {}
+        for flow in bpmn_diagram.diagram_graph.edges(data=True):
+            flow_id = flow[2].get(consts.Consts.id)
+            if flow_id in message_flows_ids:
+                message_flows_params[flow_id] = flow[2]
+            elif consts.Consts.process in flow[2]:
+                flows_by_process.setdefault(flow[2][consts.Consts.process], []).append(flow)
+        return nodes_by_process, flows_by_process, message_flows_params
+
+    @staticmethod
+    def export_collaboration(definitions, plane, bpmn_diagram, message_flows_params=None):
+        """
+        Creates 'collaboration' element with message flows and participants and adds their DI data
+        to 'plane' element.
+
+        :param definitions: an XML element ('definitions'), root element of BPMN 2.0 document,
+        :param plane: object of Element class, representing BPMN XML 'BPMNPlane' element,
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram,
+        :param message_flows_params: dictionary, that maps message flow ID to its attributes (as returned by
+            partition_diagram). If not given, message flows are looked up by ID.
+        """
+        collaboration = bpmn_diagram.collaboration
+        message_flows = collaboration[consts.Consts.message_flows]
+        participants = collaboration[consts.Consts.participants]
+        collaboration_xml = eTree.SubElement(definitions, consts.Consts.collaboration)
+        collaboration_xml.set(consts.Consts.id, collaboration[consts.Consts.id])
+
+        for message_flow_id, message_flow_attr in message_flows.items():
+            message_flow = eTree.SubElement(collaboration_xml, consts.Consts.message_flow)
+            message_flow.set(consts.Consts.id, message_flow_id)
+            message_flow.set(consts.Consts.name, message_flow_attr[consts.Consts.name])
+            message_flow.set(consts.Consts.source_ref, message_flow_attr[consts.Consts.source_ref])
+            message_flow.set(consts.Consts.target_ref, message_flow_attr[consts.Consts.target_ref])
+
+            if message_flows_params is not None:
+                message_flow_params = message_flows_params[message_flow_id]
+            else:
+                message_flow_params = bpmn_diagram.get_flow_by_id(message_flow_id)[2]
+            output_flow = eTree.SubElement(plane, BpmnDiagramGraphExport.bpmndi_namespace + consts.Consts.bpmn_edge)
+            output_flow.set(consts.Consts.id, message_flow_id + "_gui")
+            output_flow.set(consts.Consts.bpmn_element, message_flow_id)
+            waypoints = message_flow_params[consts.Consts.waypoints]
+            BpmnDiagramGraphExport.export_waypoints(output_flow, waypoints)
+
+        for participant_id, participant_attr in participants.items():
+            participant = eTree.SubElement(collaboration_xml, consts.Consts.participant)
+            participant.set(consts.Consts.id, participant_id)
+            participant.set(consts.Consts.name, participant_attr[consts.Consts.name])
+            participant.set(consts.Consts.process_ref, participant_attr[consts.Consts.process_ref])
+
+            output_element_di = eTree.SubElement(plane, BpmnDiagramGraphExport.bpmndi_namespace +
+                                                 consts.Consts.bpmn_shape)
+            output_element_di.set(consts.Consts.id, participant_id + "_gui")
+            output_element_di.set(consts.Consts.bpmn_element, participant_id)
+            output_element_di.set(consts.Consts.is_horizontal, participant_attr[consts.Consts.is_horizontal])
+            BpmnDiagramGraphExport.export_bounds(output_element_di, participant_attr)
 
     @staticmethod
     def export_xml_file(directory, filename, bpmn_diagram):
@@ -431,45 +532,10 @@ class BpmnDiagramGraphExport(object):
         [_, plane] = BpmnDiagramGraphExport.export_diagram_plane_elements(definitions, diagram_attributes,
                                                                           plane_attributes)
 
+        (nodes_by_process, flows_by_process, message_flows_params) = \
+            BpmnDiagramGraphExport.partition_diagram(bpmn_diagram)
         if collaboration is not None and len(collaboration) > 0:
-            message_flows = collaboration[consts.Consts.message_flows]
-            participants = collaboration[consts.Consts.participants]
-            collaboration_xml = eTree.SubElement(definitions, consts.Consts.collaboration)
-            collaboration_xml.set(consts.Consts.id, collaboration[consts.Consts.id])
-
-            for message_flow_id, message_flow_attr in message_flows.items():
-                message_flow = eTree.SubElement(collaboration_xml, consts.Consts.message_flow)
-                message_flow.set(consts.Consts.id, message_flow_id)
-                message_flow.set(consts.Consts.name, message_flow_attr[consts.Consts.name])
-                message_flow.set(consts.Consts.source_ref, message_flow_attr[consts.Consts.source_ref])
-                message_flow.set(consts.Consts.target_ref, message_flow_attr[consts.Consts.target_ref])
-
-                message_flow_params = bpmn_diagram.get_flow_by_id(message_flow_id)[2]
-                output_flow = eTree.SubElement(plane, BpmnDiagramGraphExport.bpmndi_namespace + consts.Consts.bpmn_edge)
-                output_flow.set(consts.Consts.id, message_flow_id + "_gui")
-                output_flow.set(consts.Consts.bpmn_element, message_flow_id)
-                waypoints = message_flow_params[consts.Consts.waypoints]
-                for waypoint in waypoints:
-                    waypoint_element = eTree.SubElement(output_flow, "omgdi:waypoint")
-                    waypoint_element.set(consts.Consts.x, waypoint[0])
-                    waypoint_element.set(consts.Consts.y, waypoint[1])
-
-            for participant_id, participant_attr in participants.items():
-                participant = eTree.SubElement(collaboration_xml, consts.Consts.participant)
-                participant.set(consts.Consts.id, participant_id)
-                participant.set(consts.Consts.name, participant_attr[consts.Consts.name])
-                participant.set(consts.Consts.process_ref, participant_attr[consts.Consts.process_ref])
-
-                output_element_di = eTree.SubElement(plane, BpmnDiagramGraphExport.bpmndi_namespace +
-                                                     consts.Consts.bpmn_shape)
-                output_element_di.set(consts.Consts.id, participant_id + "_gui")
-                output_element_di.set(consts.Consts.bpmn_element, participant_id)
-                output_element_di.set(consts.Consts.is_horizontal, participant_attr[consts.Consts.is_horizontal])
-                bounds = eTree.SubElement(output_element_di, "omgdc:Bounds")
-                bounds.set(consts.Consts.width, participant_attr[consts.Consts.width])
-                bounds.set(consts.Consts.height, participant_attr[consts.Consts.height])
-                bounds.set(consts.Consts.x, participant_attr[consts.Consts.x])
-                bounds.set(consts.Consts.y, participant_attr[consts.Consts.y])
+            BpmnDiagramGraphExport.export_collaboration(definitions, plane, bpmn_diagram, message_flows_params)
 
         for process_id in process_elements_dict:
             process_element_attr = process_elements_dict[process_id]
@@ -478,7 +544,7 @@ class BpmnDiagramGraphExport(object):
                 BpmnDiagramGraphExport.export_lane_set(process, process_element_attr[consts.Consts.lane_set], plane)
 
             # for each node in graph add correct type of element, its attributes and BPMNShape element
-            nodes = bpmn_diagram.get_nodes_list_by_process_id(process_id)
+            nodes = nodes_by_process.get(process_id, [])
             for node in nodes:
                 node_id = node[0]
                 params = node[1]
@@ -486,7 +552,7 @@ class BpmnDiagramGraphExport(object):
                 # BpmnDiagramGraphExport.export_node_di_data(node_id, params, plane)
 
             # for each edge in graph add sequence flow element, its attributes and BPMNEdge element
-            flows = bpmn_diagram.get_flows_list_by_process_id(process_id)
+            flows = flows_by_process.get(process_id, [])
             for flow in flows:
                 params = flow[2]
                 BpmnDiagramGraphExport.export_flow_process_data(params, process)
@@ -522,23 +588,23 @@ class BpmnDiagramGraphExport(object):
         :param filename: string representing output file name,
         :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
         """
-        diagram_graph = bpmn_diagram.diagram_graph
         process_elements_dict = bpmn_diagram.process_elements
         definitions = BpmnDiagramGraphExport.export_definitions_element()
+        (nodes_by_process, flows_by_process, _) = BpmnDiagramGraphExport.partition_diagram(bpmn_diagram)
 
         for process_id in process_elements_dict:
             process_element_attr = process_elements_dict[process_id]
             process = BpmnDiagramGraphExport.export_process_element(definitions, process_id, process_element_attr)
 
-            # for each node in graph add correct type of element, its attributes and BPMNShape element
-            nodes = diagram_graph.nodes(data=True)
+            # for each node of process add correct type of element and its attributes
+            nodes = nodes_by_process.get(process_id, [])
             for node in nodes:
                 node_id = node[0]
                 params = node[1]
                 BpmnDiagramGraphExport.export_node_data(bpmn_diagram, node_id, params, process)
 
-            # for each edge in graph add sequence flow element, its attributes and BPMNEdge element
-            flows = diagram_graph.edges(data=True)
+            # for each sequence flow of process add sequence flow element and its attributes
+            flows = flows_by_process.get(process_id, [])
             for flow in flows:
                 params = flow[2]
                 BpmnDiagramGraphExport.export_flow_process_data(params, process)
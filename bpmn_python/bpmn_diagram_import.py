@@ -14,6 +14,24 @@ class BpmnDiagramGraphImport(object):
     As a utility class, it only contains static methods. This class is meant to be used from BPMNDiagramGraph class.
     """
 
+    # Event definitions supported by each type of event
+    start_event_definitions = {'messageEventDefinition', 'timerEventDefinition', 'conditionalEventDefinition',
+                               'escalationEventDefinition', 'signalEventDefinition'}
+    intermediate_catch_event_definitions = {'messageEventDefinition', 'timerEventDefinition', 'signalEventDefinition',
+                                            'conditionalEventDefinition', 'escalationEventDefinition'}
+    end_event_definitions = {'messageEventDefinition', 'signalEventDefinition', 'escalationEventDefinition',
+                             'errorEventDefinition', 'compensateEventDefinition', 'terminateEventDefinition'}
+    intermediate_throw_event_definitions = {'messageEventDefinition', 'signalEventDefinition',
+                                            'escalationEventDefinition', 'compensateEventDefinition'}
+    boundary_event_definitions = {'messageEventDefinition', 'timerEventDefinition', 'signalEventDefinition',
+                                  'conditionalEventDefinition', 'escalationEventDefinition', 'errorEventDefinition'}
+
+    # handlers of child elements of 'process' and 'subProcess' elements, keyed by tuple of namespace URI (None
+    # matches any namespace) and local name of element, see register_element_handler
+    element_handlers = {}
+    # copy of element_handlers with default handlers only, see register_default_element_handlers
+    default_element_handlers = {}
+
     def __init__(self):
         pass
 
@@ -39,9 +57,10 @@ class BpmnDiagramGraphImport(object):
         plane_element = diagram_element.getElementsByTagNameNS("*", "BPMNPlane")[0]
         BpmnDiagramGraphImport.import_diagram_and_plane_attributes(diagram_attributes, plane_attributes,
                                                                    diagram_element, plane_element)
+        di_elements = BpmnDiagramGraphImport.index_di_elements(plane_element)
 
         BpmnDiagramGraphImport.import_process_elements(document, diagram_graph, sequence_flows, process_elements_dict,
-                                                       plane_element)
+                                                       di_elements)
 
         collaboration_element_list = document.getElementsByTagNameNS("*", consts.Consts.collaboration)
         if collaboration_element_list is not None and len(collaboration_element_list) > 0:
@@ -65,6 +84,23 @@ class BpmnDiagramGraphImport(object):
                     BpmnDiagramGraphImport.import_shape_di(participants, diagram_graph, element)
                 elif tag_name == consts.Consts.bpmn_edge:
                     BpmnDiagramGraphImport.import_flow_di(diagram_graph, sequence_flows, message_flows, element)
+        bpmn_diagram.rebuild_indexes()
+
+    @staticmethod
+    def index_di_elements(plane_element):
+        """
+        Creates an index of Diagram Interchange elements ('BPMNShape', 'BPMNEdge' etc.), that are children of given
+        'BPMNPlane' element. Returns a dictionary, where key is a value of 'bpmnElement' attribute and value is
+        the DI element. If several DI elements refer to the same BPMN element, the last one is kept. Index is used
+        to look up shapes of lanes, shapes and edges of other elements are imported in document order.
+
+        :param plane_element: object representing a BPMN XML 'plane' element.
+        """
+        di_elements = {}
+        for element in utils.BpmnImportUtils.iterate_elements(plane_element):
+            if element.nodeType != element.TEXT_NODE:
+                di_elements[element.getAttribute(consts.Consts.bpmn_element)] = element
+        return di_elements
 
     @staticmethod
     def import_collaboration_element(diagram_graph, collaboration_element, collaboration_dict):
@@ -104,7 +140,23 @@ class BpmnDiagramGraphImport(object):
         participant_id = participant_element.getAttribute(consts.Consts.id)
         name = participant_element.getAttribute(consts.Consts.name)
         process_ref = participant_element.getAttribute(consts.Consts.process_ref)
-        if participant_element.getAttribute(consts.Consts.process_ref) == '':
+        BpmnDiagramGraphImport.add_participant_to_graph(diagram_graph, participants_dictionary, participant_id, name,
+                                                        process_ref)
+
+    @staticmethod
+    def add_participant_to_graph(diagram_graph, participants_dictionary, participant_id, name, process_ref):
+        """
+        Adds participant to the collaboration dictionary. Participant without process reference (black box pool)
+        is also added to graph as a node, so it can be a source or target of message flows.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param participants_dictionary: dictionary with participant element attributes. Key is participant ID, value
+           is a dictionary of participant attributes,
+        :param participant_id: string object, ID of participant,
+        :param name: string object, name of participant,
+        :param process_ref: string object, ID of process referenced by participant (empty string if none).
+        """
+        if process_ref == '':
             diagram_graph.add_node(participant_id)
             diagram_graph.node[participant_id][consts.Consts.type] = consts.Consts.participant
             diagram_graph.node[participant_id][consts.Consts.process] = participant_id
@@ -138,7 +190,7 @@ class BpmnDiagramGraphImport(object):
         plane_attributes[consts.Consts.bpmn_element] = plane_element.getAttribute(consts.Consts.bpmn_element)
 
     @staticmethod
-    def import_process_elements(document, diagram_graph, sequence_flows, process_elements_dict, plane_element):
+    def import_process_elements(document, diagram_graph, sequence_flows, process_elements_dict, di_elements):
         """
         Method for importing all 'process' elements in diagram.
 
@@ -147,7 +199,7 @@ class BpmnDiagramGraphImport(object):
         :param sequence_flows: a list of sequence flows existing in diagram,
         :param process_elements_dict: dictionary that holds attribute values for imported 'process' elements. Key is
             an ID of process, value - a dictionary of process attributes,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_elements: dictionary of Diagram Interchange elements, as returned by index_di_elements method.
         """
         for process_element in document.getElementsByTagNameNS("*", consts.Consts.process):
             BpmnDiagramGraphImport.import_process_element(process_elements_dict, process_element)
@@ -159,68 +211,154 @@ class BpmnDiagramGraphImport(object):
             if lane_set_list is not None and len(lane_set_list) > 0:
                 # according to BPMN 2.0 XML Schema, there's at most one 'laneSet' element inside 'process'
                 lane_set = lane_set_list[0]
-                BpmnDiagramGraphImport.import_lane_set_element(process_attributes, lane_set, plane_element)
-
-            for element in utils.BpmnImportUtils.iterate_elements(process_element):
-                if element.nodeType != element.TEXT_NODE:
-                    tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
-                    BpmnDiagramGraphImport.__import_element_by_tag_name(diagram_graph, sequence_flows, process_id,
-                                                                        process_attributes, element, tag_name)
-
-            for flow in utils.BpmnImportUtils.iterate_elements(process_element):
-                if flow.nodeType != flow.TEXT_NODE:
-                    tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(flow.tagName)
-                    if tag_name == consts.Consts.sequence_flow:
-                        BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id,
-                                                                             flow)
-
-    @staticmethod
-    def __import_element_by_tag_name(diagram_graph, sequence_flows, process_id, process_attributes, element, tag_name):
-        if tag_name == consts.Consts.task \
-                or tag_name == consts.Consts.user_task \
-                or tag_name == consts.Consts.service_task \
-                or tag_name == consts.Consts.manual_task:
-            BpmnDiagramGraphImport.import_task_to_graph(diagram_graph, process_id, process_attributes, element)
-        elif tag_name == consts.Consts.subprocess:
-            BpmnDiagramGraphImport.import_subprocess_to_graph(diagram_graph, sequence_flows, process_id,
-                                                              process_attributes, element)
-        elif tag_name == consts.Consts.data_object:
-            BpmnDiagramGraphImport.import_data_object_to_graph(diagram_graph, process_id, process_attributes, element)
-        elif tag_name == consts.Consts.inclusive_gateway or tag_name == consts.Consts.exclusive_gateway:
-            BpmnDiagramGraphImport.import_incl_or_excl_gateway_to_graph(diagram_graph, process_id, process_attributes,
-                                                                        element)
-        elif tag_name == consts.Consts.parallel_gateway:
-            BpmnDiagramGraphImport.import_parallel_gateway_to_graph(diagram_graph, process_id, process_attributes,
-                                                                    element)
-        elif tag_name == consts.Consts.event_based_gateway:
-            BpmnDiagramGraphImport.import_event_based_gateway_to_graph(diagram_graph, process_id, process_attributes,
-                                                                       element)
-        elif tag_name == consts.Consts.complex_gateway:
-            BpmnDiagramGraphImport.import_complex_gateway_to_graph(diagram_graph, process_id, process_attributes,
-                                                                   element)
-        elif tag_name == consts.Consts.start_event:
-            BpmnDiagramGraphImport.import_start_event_to_graph(diagram_graph, process_id, process_attributes, element)
-        elif tag_name == consts.Consts.end_event:
-            BpmnDiagramGraphImport.import_end_event_to_graph(diagram_graph, process_id, process_attributes, element)
-        elif tag_name == consts.Consts.intermediate_catch_event:
-            BpmnDiagramGraphImport.import_intermediate_catch_event_to_graph(diagram_graph, process_id,
-                                                                            process_attributes, element)
-        elif tag_name == consts.Consts.intermediate_throw_event:
-            BpmnDiagramGraphImport.import_intermediate_throw_event_to_graph(diagram_graph, process_id,
-                                                                            process_attributes, element)
-        elif tag_name == consts.Consts.boundary_event:
-            BpmnDiagramGraphImport.import_boundary_event_to_graph(diagram_graph, process_id, process_attributes,
-                                                                  element)
-
-    @staticmethod
-    def import_lane_set_element(process_attributes, lane_set_element, plane_element):
+                BpmnDiagramGraphImport.import_lane_set_element(process_attributes, lane_set, di_elements)
+
+            BpmnDiagramGraphImport.import_child_elements(diagram_graph, sequence_flows, process_id,
+                                                         process_attributes, process_element)
+
+    @staticmethod
+    def register_element_handler(local_name, handler, namespace=None):
+        """
+        Registers handler of child element of 'process' or 'subProcess' element, replacing previous handler of the
+        same element. Handler is called with arguments: diagram_graph, sequence_flows, process_id, process_attributes
+        and element (minidom Element object). It can be used to import extension elements, or to wrap default handler
+        (see get_element_handler) of flow node, e.g. to read its 'extensionElements'. Handlers of 'sequenceFlow'
+        element are called after all other child elements of the same parent were imported.
+
+        Handlers are used only by this importer. BpmnDiagramGraphStreamingImport refuses to import, and
+        BpmnDiagramImportCache doesn't cache diagrams, while non-default handlers are registered.
+
+        :param local_name: string with tag name of element without namespace prefix,
+        :param handler: function, that imports element,
+        :param namespace: string with namespace URI of element. Default value - None, handler is used for elements
+            of any namespace, unless there is a handler registered for element namespace.
+        """
+        BpmnDiagramGraphImport.element_handlers[(namespace, local_name)] = handler
+
+    @staticmethod
+    def register_default_element_handlers():
+        """
+        Registers default handlers of flow nodes, subprocesses and sequence flows, replacing previously registered
+        handlers of the same elements, and saves copy of registry in default_element_handlers.
+        """
+        importer = BpmnDiagramGraphImport
+        flow_node_import_functions = {
+            consts.Consts.task: importer.import_task_to_graph,
+            consts.Consts.user_task: importer.import_task_to_graph,
+            consts.Consts.service_task: importer.import_task_to_graph,
+            consts.Consts.manual_task: importer.import_task_to_graph,
+            consts.Consts.data_object: importer.import_data_object_to_graph,
+            consts.Consts.inclusive_gateway: importer.import_incl_or_excl_gateway_to_graph,
+            consts.Consts.exclusive_gateway: importer.import_incl_or_excl_gateway_to_graph,
+            consts.Consts.parallel_gateway: importer.import_parallel_gateway_to_graph,
+            consts.Consts.event_based_gateway: importer.import_event_based_gateway_to_graph,
+            consts.Consts.complex_gateway: importer.import_complex_gateway_to_graph,
+            consts.Consts.start_event: importer.import_start_event_to_graph,
+            consts.Consts.end_event: importer.import_end_event_to_graph,
+            consts.Consts.intermediate_catch_event: importer.import_intermediate_catch_event_to_graph,
+            consts.Consts.intermediate_throw_event: importer.import_intermediate_throw_event_to_graph,
+            consts.Consts.boundary_event: importer.import_boundary_event_to_graph}
+        for (local_name, import_function) in flow_node_import_functions.items():
+            importer.register_element_handler(local_name, importer.get_flow_node_handler(import_function))
+        importer.register_element_handler(consts.Consts.subprocess, importer.import_subprocess_to_graph)
+        importer.register_element_handler(consts.Consts.sequence_flow, importer.import_sequence_flow_element)
+        importer.default_element_handlers = dict(importer.element_handlers)
+
+    @staticmethod
+    def has_default_element_handlers():
+        """
+        :return: True, if registry of element handlers contains only default handlers, False otherwise.
+        """
+        return BpmnDiagramGraphImport.element_handlers == BpmnDiagramGraphImport.default_element_handlers
+
+    @staticmethod
+    def unregister_element_handler(local_name, namespace=None):
+        """
+        Removes handler of child element of 'process' or 'subProcess' element.
+
+        :param local_name: string with tag name of element without namespace prefix,
+        :param namespace: string with namespace URI of element or None.
+        """
+        BpmnDiagramGraphImport.element_handlers.pop((namespace, local_name), None)
+
+    @staticmethod
+    def get_element_handler(local_name, namespace=None):
+        """
+        Returns handler of child element of 'process' or 'subProcess' element.
+
+        :param local_name: string with tag name of element without namespace prefix,
+        :param namespace: string with namespace URI of element or None.
+        :return: handler function or None, if there is no handler registered for given element.
+        """
+        return BpmnDiagramGraphImport.element_handlers.get((namespace, local_name))
+
+    @staticmethod
+    def import_child_elements(diagram_graph, sequence_flows, process_id, process_attributes, parent_element):
+        """
+        Imports child elements of 'process' or 'subProcess' element with registered handlers. Handler is looked up
+        by namespace URI and local name of element (already split by XML parser), if there is none, a handler
+        registered for any namespace is used. 'sequenceFlow' elements are passed to their handlers after all other
+        child elements were imported, so that flow nodes connected by flows already exist in graph.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: a list of sequence flows existing in diagram,
+        :param process_id: string object, representing an ID of process or subprocess element,
+        :param process_attributes: dictionary that holds attribute values of parent element,
+        :param parent_element: object representing a BPMN XML 'process' or 'subProcess' element.
+        """
+        flows = []
+        for element in utils.BpmnImportUtils.iterate_elements(parent_element):
+            if element.nodeType != element.TEXT_NODE:
+                if element.localName == consts.Consts.sequence_flow:
+                    flows.append(element)
+                else:
+                    BpmnDiagramGraphImport.import_child_element(diagram_graph, sequence_flows, process_id,
+                                                                process_attributes, element)
+
+        for flow in flows:
+            BpmnDiagramGraphImport.import_child_element(diagram_graph, sequence_flows, process_id, process_attributes,
+                                                        flow)
+
+    @staticmethod
+    def import_child_element(diagram_graph, sequence_flows, process_id, process_attributes, element):
+        """
+        Imports child element of 'process' or 'subProcess' element with handler registered for its namespace URI
+        and local name, or with handler registered for any namespace. Elements without handler are skipped.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: a list of sequence flows existing in diagram,
+        :param process_id: string object, representing an ID of process or subprocess element,
+        :param process_attributes: dictionary that holds attribute values of parent element,
+        :param element: object representing a child element of BPMN XML 'process' or 'subProcess' element.
+        """
+        element_handlers = BpmnDiagramGraphImport.element_handlers
+        handler = element_handlers.get((element.namespaceURI, element.localName))
+        if handler is None:
+            handler = element_handlers.get((None, element.localName))
+        if handler is not None:
+            handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+
+    @staticmethod
+    def get_flow_node_handler(import_function):
+        """
+        Returns element handler, that calls flow node import function, which doesn't use sequence flows.
+
+        :param import_function: function with arguments diagram_graph, process_id, process_attributes and element.
+        """
+        def handler(diagram_graph, sequence_flows, process_id, process_attributes, element):
+            import_function(diagram_graph, process_id, process_attributes, element)
+
+        return handler
+
+    @staticmethod
+    def import_lane_set_element(process_attributes, lane_set_element, di_elements):
         """
         Method for importing 'laneSet' element from diagram file.
 
         :param process_attributes: dictionary that holds attribute values of 'process' element, which is parent of
             imported flow node,
         :param lane_set_element: XML document element,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_elements: dictionary of Diagram Interchange elements, as returned by index_di_elements method.
         """
         lane_set_id = lane_set_element.getAttribute(consts.Consts.id)
         lanes_attr = {}
@@ -230,19 +368,19 @@ class BpmnDiagramGraphImport(object):
                 if tag_name == consts.Consts.lane:
                     lane = element
                     lane_id = lane.getAttribute(consts.Consts.id)
-                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, plane_element)
+                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, di_elements)
                     lanes_attr[lane_id] = lane_attr
 
         lane_set_attr = {consts.Consts.id: lane_set_id, consts.Consts.lanes: lanes_attr}
         process_attributes[consts.Consts.lane_set] = lane_set_attr
 
     @staticmethod
-    def import_child_lane_set_element(child_lane_set_element, plane_element):
+    def import_child_lane_set_element(child_lane_set_element, di_elements):
         """
         Method for importing 'childLaneSet' element from diagram file.
 
         :param child_lane_set_element: XML document element,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_elements: dictionary of Diagram Interchange elements, as returned by index_di_elements method.
         """
         lane_set_id = child_lane_set_element.getAttribute(consts.Consts.id)
         lanes_attr = {}
@@ -252,19 +390,19 @@ class BpmnDiagramGraphImport(object):
                 if tag_name == consts.Consts.lane:
                     lane = element
                     lane_id = lane.getAttribute(consts.Consts.id)
-                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, plane_element)
+                    lane_attr = BpmnDiagramGraphImport.import_lane_element(lane, di_elements)
                     lanes_attr[lane_id] = lane_attr
 
         child_lane_set_attr = {consts.Consts.id: lane_set_id, consts.Consts.lanes: lanes_attr}
         return child_lane_set_attr
 
     @staticmethod
-    def import_lane_element(lane_element, plane_element):
+    def import_lane_element(lane_element, di_elements):
         """
         Method for importing 'laneSet' element from diagram file.
 
         :param lane_element: XML document element,
-        :param plane_element: object representing a BPMN XML 'plane' element.
+        :param di_elements: dictionary of Diagram Interchange elements, as returned by index_di_elements method.
         """
         lane_id = lane_element.getAttribute(consts.Consts.id)
         lane_name = lane_element.getAttribute(consts.Consts.name)
@@ -274,7 +412,7 @@ class BpmnDiagramGraphImport(object):
             if element.nodeType != element.TEXT_NODE:
                 tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
                 if tag_name == consts.Consts.child_lane_set:
-                    child_lane_set_attr = BpmnDiagramGraphImport.import_child_lane_set_element(element, plane_element)
+                    child_lane_set_attr = BpmnDiagramGraphImport.import_child_lane_set_element(element, di_elements)
                 elif tag_name == consts.Consts.flow_node_ref:
                     flow_node_ref_id = element.firstChild.nodeValue
                     flow_node_refs.append(flow_node_ref_id)
@@ -283,19 +421,27 @@ class BpmnDiagramGraphImport(object):
                      consts.Consts.child_lane_set: child_lane_set_attr,
                      consts.Consts.flow_node_refs: flow_node_refs}
 
-        shape_element = None
-        for element in utils.BpmnImportUtils.iterate_elements(plane_element):
-            if element.nodeType != element.TEXT_NODE and element.getAttribute(consts.Consts.bpmn_element) == lane_id:
-                shape_element = element
+        shape_element = di_elements.get(lane_id)
         if shape_element is not None:
-            bounds = shape_element.getElementsByTagNameNS("*", "Bounds")[0]
-            lane_attr[consts.Consts.is_horizontal] = shape_element.getAttribute(consts.Consts.is_horizontal)
-            lane_attr[consts.Consts.width] = bounds.getAttribute(consts.Consts.width)
-            lane_attr[consts.Consts.height] = bounds.getAttribute(consts.Consts.height)
-            lane_attr[consts.Consts.x] = bounds.getAttribute(consts.Consts.x)
-            lane_attr[consts.Consts.y] = bounds.getAttribute(consts.Consts.y)
+            BpmnDiagramGraphImport.add_lane_di(lane_attr,
+                                               BpmnDiagramGraphImport.read_shape_attributes(shape_element))
         return lane_attr
 
+    @staticmethod
+    def add_lane_di(lane_attr, shape_attributes):
+        """
+        Adds Diagram Interchange information of lane to the lane attributes dictionary.
+
+        :param lane_attr: dictionary with lane element attributes,
+        :param shape_attributes: dictionary with attributes of BPMNShape element connected with lane, as returned by
+            read_shape_attributes method.
+        """
+        lane_attr[consts.Consts.is_horizontal] = shape_attributes[consts.Consts.is_horizontal]
+        lane_attr[consts.Consts.width] = shape_attributes[consts.Consts.width]
+        lane_attr[consts.Consts.height] = shape_attributes[consts.Consts.height]
+        lane_attr[consts.Consts.x] = shape_attributes[consts.Consts.x]
+        lane_attr[consts.Consts.y] = shape_attributes[consts.Consts.y]
+
     @staticmethod
     def import_process_element(process_elements_dict, process_element):
         """
@@ -416,18 +562,8 @@ class BpmnDiagramGraphImport(object):
 
         subprocess_attributes = diagram_graph.node[subprocess_id]
         subprocess_attributes[consts.Consts.node_ids] = []
-        for element in utils.BpmnImportUtils.iterate_elements(subprocess_element):
-            if element.nodeType != element.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
-                BpmnDiagramGraphImport.__import_element_by_tag_name(diagram_graph, sequence_flows, subprocess_id,
-                                                                    subprocess_attributes, element, tag_name)
-
-        for flow in utils.BpmnImportUtils.iterate_elements(subprocess_element):
-            if flow.nodeType != flow.TEXT_NODE:
-                tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(flow.tagName)
-                if tag_name == consts.Consts.sequence_flow:
-                    BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph, sequence_flows, subprocess_id,
-                                                                         flow)
+        BpmnDiagramGraphImport.import_child_elements(diagram_graph, sequence_flows, subprocess_id,
+                                                     subprocess_attributes, subprocess_element)
 
     @staticmethod
     def import_data_object_to_graph(diagram_graph, process_id, process_attributes, data_object_element):
@@ -596,8 +732,6 @@ class BpmnDiagramGraphImport(object):
         :param element: object representing a BPMN XML 'startEvent' element.
         """
         element_id = element.getAttribute(consts.Consts.id)
-        start_event_definitions = {'messageEventDefinition', 'timerEventDefinition', 'conditionalEventDefinition',
-                                   'escalationEventDefinition', 'signalEventDefinition'}
         BpmnDiagramGraphImport.import_flow_node_to_graph(diagram_graph, process_id, process_attributes, element)
         diagram_graph.node[element_id][consts.Consts.parallel_multiple] = \
             element.getAttribute(consts.Consts.parallel_multiple) \
@@ -605,7 +739,8 @@ class BpmnDiagramGraphImport(object):
         diagram_graph.node[element_id][consts.Consts.is_interrupting] = \
             element.getAttribute(consts.Consts.is_interrupting) \
                 if element.hasAttribute(consts.Consts.is_interrupting) else "true"
-        BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element, start_event_definitions)
+        BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element,
+                                                                BpmnDiagramGraphImport.start_event_definitions)
 
     @staticmethod
     def import_intermediate_catch_event_to_graph(diagram_graph, process_id, process_attributes, element):
@@ -623,15 +758,12 @@ class BpmnDiagramGraphImport(object):
         :param element: object representing a BPMN XML 'intermediateCatchEvent' element.
         """
         element_id = element.getAttribute(consts.Consts.id)
-        intermediate_catch_event_definitions = {'messageEventDefinition', 'timerEventDefinition',
-                                                'signalEventDefinition', 'conditionalEventDefinition',
-                                                'escalationEventDefinition'}
         BpmnDiagramGraphImport.import_flow_node_to_graph(diagram_graph, process_id, process_attributes, element)
         diagram_graph.node[element_id][consts.Consts.parallel_multiple] = \
             element.getAttribute(consts.Consts.parallel_multiple) \
                 if element.hasAttribute(consts.Consts.parallel_multiple) else "false"
-        BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element,
-                                                                intermediate_catch_event_definitions)
+        BpmnDiagramGraphImport.import_event_definition_elements(
+            diagram_graph, element, BpmnDiagramGraphImport.intermediate_catch_event_definitions)
 
     @staticmethod
     def import_end_event_to_graph(diagram_graph, process_id, process_attributes, element):
@@ -647,10 +779,9 @@ class BpmnDiagramGraphImport(object):
             imported flow node,
         :param element: object representing a BPMN XML 'endEvent' element.
         """
-        end_event_definitions = {'messageEventDefinition', 'signalEventDefinition', 'escalationEventDefinition',
-                                 'errorEventDefinition', 'compensateEventDefinition', 'terminateEventDefinition'}
         BpmnDiagramGraphImport.import_flow_node_to_graph(diagram_graph, process_id, process_attributes, element)
-        BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element, end_event_definitions)
+        BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element,
+                                                                BpmnDiagramGraphImport.end_event_definitions)
 
     @staticmethod
     def import_intermediate_throw_event_to_graph(diagram_graph, process_id, process_attributes, element):
@@ -666,11 +797,9 @@ class BpmnDiagramGraphImport(object):
            imported flow node,
         :param element: object representing a BPMN XML 'intermediateThrowEvent' element.
         """
-        intermediate_throw_event_definitions = {'messageEventDefinition', 'signalEventDefinition',
-                                                'escalationEventDefinition', 'compensateEventDefinition'}
         BpmnDiagramGraphImport.import_flow_node_to_graph(diagram_graph, process_id, process_attributes, element)
-        BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element,
-                                                                intermediate_throw_event_definitions)
+        BpmnDiagramGraphImport.import_event_definition_elements(
+            diagram_graph, element, BpmnDiagramGraphImport.intermediate_throw_event_definitions)
 
     @staticmethod
     def import_boundary_event_to_graph(diagram_graph, process_id, process_attributes, element):
@@ -687,8 +816,6 @@ class BpmnDiagramGraphImport(object):
         :param element: object representing a BPMN XML 'endEvent' element.
         """
         element_id = element.getAttribute(consts.Consts.id)
-        boundary_event_definitions = {'messageEventDefinition', 'timerEventDefinition', 'signalEventDefinition',
-                                      'conditionalEventDefinition', 'escalationEventDefinition', 'errorEventDefinition'}
         BpmnDiagramGraphImport.import_flow_node_to_graph(diagram_graph, process_id, process_attributes, element)
 
         diagram_graph.node[element_id][consts.Consts.parallel_multiple] = \
@@ -701,7 +828,20 @@ class BpmnDiagramGraphImport(object):
             element.getAttribute(consts.Consts.attached_to_ref)
 
         BpmnDiagramGraphImport.import_event_definition_elements(diagram_graph, element,
-                                                                boundary_event_definitions)
+                                                                BpmnDiagramGraphImport.boundary_event_definitions)
+
+    @staticmethod
+    def import_sequence_flow_element(diagram_graph, sequence_flows, process_id, process_attributes, flow_element):
+        """
+        Default handler of 'sequenceFlow' element, see import_sequence_flow_to_graph.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: dictionary (associative list) of sequence flows existing in diagram,
+        :param process_id: string object, representing an ID of process element,
+        :param process_attributes: dictionary that holds attribute values of parent element,
+        :param flow_element: object representing a BPMN XML 'sequenceFlow' element.
+        """
+        BpmnDiagramGraphImport.import_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id, flow_element)
 
     @staticmethod
     def import_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id, flow_element):
@@ -726,29 +866,59 @@ class BpmnDiagramGraphImport(object):
         name = flow_element.getAttribute(consts.Consts.name) if flow_element.hasAttribute(consts.Consts.name) else ""
         source_ref = flow_element.getAttribute(consts.Consts.source_ref)
         target_ref = flow_element.getAttribute(consts.Consts.target_ref)
-        sequence_flows[flow_id] = {consts.Consts.name: name, consts.Consts.source_ref: source_ref,
-                                   consts.Consts.target_ref: target_ref}
-        diagram_graph.add_edge(source_ref, target_ref)
-        diagram_graph[source_ref][target_ref][consts.Consts.id] = flow_id
-        diagram_graph[source_ref][target_ref][consts.Consts.process] = process_id
-        diagram_graph[source_ref][target_ref][consts.Consts.name] = name
-        diagram_graph[source_ref][target_ref][consts.Consts.source_ref] = source_ref
-        diagram_graph[source_ref][target_ref][consts.Consts.target_ref] = target_ref
+        condition_expression = None
         for element in utils.BpmnImportUtils.iterate_elements(flow_element):
             if element.nodeType != element.TEXT_NODE:
                 tag_name = utils.BpmnImportUtils.remove_namespace_from_tag_name(element.tagName)
                 if tag_name == consts.Consts.condition_expression:
-                    condition_expression = element.firstChild.nodeValue
-                    diagram_graph[source_ref][target_ref][consts.Consts.condition_expression] = {
+                    condition_expression = {
                         consts.Consts.id: element.getAttribute(consts.Consts.id),
-                        consts.Consts.condition_expression: condition_expression
+                        consts.Consts.condition_expression: element.firstChild.nodeValue
                     }
+        BpmnDiagramGraphImport.add_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id, flow_id, name,
+                                                          source_ref, target_ref, condition_expression)
+
+    @staticmethod
+    def add_sequence_flow_to_graph(diagram_graph, sequence_flows, process_id, flow_id, name, source_ref, target_ref,
+                                   condition_expression=None):
+        """
+        Adds a new edge, that represents sequence flow, to graph and a record to sequence_flows dictionary.
+        Adds flow ID to outgoing flows list of source node and incoming flows list of target node.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: dictionary (associative list) of sequence flows existing in diagram,
+        :param process_id: string object, representing an ID of process element,
+        :param flow_id: string object, ID of sequence flow,
+        :param name: string object, name of sequence flow,
+        :param source_ref: string object, ID of source node,
+        :param target_ref: string object, ID of target node,
+        :param condition_expression: dictionary with 'id' and 'conditionExpression' of sequence flow condition,
+            None if sequence flow has no condition.
+        """
+        sequence_flows[flow_id] = {consts.Consts.name: name, consts.Consts.source_ref: source_ref,
+                                   consts.Consts.target_ref: target_ref}
+        flow = utils.BpmnImportUtils.add_flow_edge(diagram_graph, flow_id, source_ref, target_ref)
+        flow[consts.Consts.id] = flow_id
+        flow[consts.Consts.process] = process_id
+        flow[consts.Consts.name] = name
+        flow[consts.Consts.source_ref] = source_ref
+        flow[consts.Consts.target_ref] = target_ref
+        if condition_expression is not None:
+            flow[consts.Consts.condition_expression] = condition_expression
+        BpmnDiagramGraphImport.add_flow_to_nodes(diagram_graph, flow_id, source_ref, target_ref)
 
-        '''
-        # Add incoming / outgoing nodes to corresponding elements. May be redundant action since this information is
-        added when processing nodes, but listing incoming / outgoing nodes under node element is optional - this way
+    @staticmethod
+    def add_flow_to_nodes(diagram_graph, flow_id, source_ref, target_ref):
+        """
+        Add incoming / outgoing flows to corresponding elements. May be redundant action since this information is
+        added when processing nodes, but listing incoming / outgoing flows under node element is optional - this way
         we can make sure this info will be imported.
-        '''
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param flow_id: string object, ID of flow,
+        :param source_ref: string object, ID of source node,
+        :param target_ref: string object, ID of target node.
+        """
         if consts.Consts.outgoing_flow not in diagram_graph.node[source_ref]:
             diagram_graph.node[source_ref][consts.Consts.outgoing_flow] = []
         outgoing_list = diagram_graph.node[source_ref][consts.Consts.outgoing_flow]
@@ -783,38 +953,38 @@ class BpmnDiagramGraphImport(object):
         name = flow_element.getAttribute(consts.Consts.name) if flow_element.hasAttribute(consts.Consts.name) else ""
         source_ref = flow_element.getAttribute(consts.Consts.source_ref)
         target_ref = flow_element.getAttribute(consts.Consts.target_ref)
+        BpmnDiagramGraphImport.add_message_flow_to_graph(diagram_graph, message_flows, flow_id, name, source_ref,
+                                                         target_ref)
+
+    @staticmethod
+    def add_message_flow_to_graph(diagram_graph, message_flows, flow_id, name, source_ref, target_ref):
+        """
+        Adds a new edge, that represents message flow, to graph and a record to message flows dictionary.
+        Adds flow ID to outgoing flows list of source node and incoming flows list of target node.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param message_flows: dictionary (associative list) of message flows existing in diagram,
+        :param flow_id: string object, ID of message flow,
+        :param name: string object, name of message flow,
+        :param source_ref: string object, ID of source node,
+        :param target_ref: string object, ID of target node.
+        """
         message_flows[flow_id] = {consts.Consts.id: flow_id, consts.Consts.name: name,
                                   consts.Consts.source_ref: source_ref,
                                   consts.Consts.target_ref: target_ref}
-        diagram_graph.add_edge(source_ref, target_ref)
-        diagram_graph[source_ref][target_ref][consts.Consts.id] = flow_id
-        diagram_graph[source_ref][target_ref][consts.Consts.name] = name
-        diagram_graph[source_ref][target_ref][consts.Consts.source_ref] = source_ref
-        diagram_graph[source_ref][target_ref][consts.Consts.target_ref] = target_ref
-
-        '''
-        # Add incoming / outgoing nodes to corresponding elements. May be redundant action since this information is
-        added when processing nodes, but listing incoming / outgoing nodes under node element is optional - this way
-        we can make sure this info will be imported.
-        '''
-        if consts.Consts.outgoing_flow not in diagram_graph.node[source_ref]:
-            diagram_graph.node[source_ref][consts.Consts.outgoing_flow] = []
-        outgoing_list = diagram_graph.node[source_ref][consts.Consts.outgoing_flow]
-        if flow_id not in outgoing_list:
-            outgoing_list.append(flow_id)
-
-        if consts.Consts.incoming_flow not in diagram_graph.node[target_ref]:
-            diagram_graph.node[target_ref][consts.Consts.incoming_flow] = []
-        incoming_list = diagram_graph.node[target_ref][consts.Consts.incoming_flow]
-        if flow_id not in incoming_list:
-            incoming_list.append(flow_id)
+        flow = utils.BpmnImportUtils.add_flow_edge(diagram_graph, flow_id, source_ref, target_ref)
+        flow[consts.Consts.id] = flow_id
+        flow[consts.Consts.name] = name
+        flow[consts.Consts.source_ref] = source_ref
+        flow[consts.Consts.target_ref] = target_ref
+        BpmnDiagramGraphImport.add_flow_to_nodes(diagram_graph, flow_id, source_ref, target_ref)
 
     @staticmethod
     def import_shape_di(participants_dict, diagram_graph, shape_element):
         """
         Adds Diagram Interchange information (information about rendering a diagram) to appropriate
         BPMN diagram element in graph node.
-        We assume that those attributes are required for each BPMNShape:
+        We assume that those attributes are required for each BPMNShape (values are kept as float numbers):
 
         - width - width of BPMNShape,
         - height - height of BPMNShape,
@@ -826,26 +996,56 @@ class BpmnDiagramGraphImport(object):
         :param shape_element: object representing a BPMN XML 'BPMNShape' element.
         """
         element_id = shape_element.getAttribute(consts.Consts.bpmn_element)
+        BpmnDiagramGraphImport.add_shape_di_to_graph(participants_dict, diagram_graph, element_id,
+                                                     BpmnDiagramGraphImport.read_shape_attributes(shape_element))
+
+    @staticmethod
+    def read_shape_attributes(shape_element):
+        """
+        Reads attributes of 'BPMNShape' element and its 'Bounds' child element.
+        Returns a dictionary with keys 'isHorizontal', 'isExpanded' (None if attribute is missing), 'width', 'height',
+        'x' and 'y'. Bounds values are parsed to float numbers.
+
+        :param shape_element: object representing a BPMN XML 'BPMNShape' element.
+        """
         bounds = shape_element.getElementsByTagNameNS("*", "Bounds")[0]
+        return {consts.Consts.is_horizontal: shape_element.getAttribute(consts.Consts.is_horizontal),
+                consts.Consts.is_expanded: shape_element.getAttribute(consts.Consts.is_expanded)
+                if shape_element.hasAttribute(consts.Consts.is_expanded) else None,
+                consts.Consts.width: float(bounds.getAttribute(consts.Consts.width)),
+                consts.Consts.height: float(bounds.getAttribute(consts.Consts.height)),
+                consts.Consts.x: float(bounds.getAttribute(consts.Consts.x)),
+                consts.Consts.y: float(bounds.getAttribute(consts.Consts.y))}
+
+    @staticmethod
+    def add_shape_di_to_graph(participants_dict, diagram_graph, element_id, shape_attributes):
+        """
+        Adds Diagram Interchange information of BPMNShape to graph node or participant, connected with the shape.
+
+        :param participants_dict: dictionary with 'participant' elements attributes,
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param element_id: string object, ID of BPMN element connected with the shape,
+        :param shape_attributes: dictionary with attributes of BPMNShape element, as returned by
+            read_shape_attributes method.
+        """
         if diagram_graph.has_node(element_id):
             node = diagram_graph.node[element_id]
-            node[consts.Consts.width] = bounds.getAttribute(consts.Consts.width)
-            node[consts.Consts.height] = bounds.getAttribute(consts.Consts.height)
+            node[consts.Consts.width] = shape_attributes[consts.Consts.width]
+            node[consts.Consts.height] = shape_attributes[consts.Consts.height]
 
             if node[consts.Consts.type] == consts.Consts.subprocess:
-                node[consts.Consts.is_expanded] = \
-                    shape_element.getAttribute(consts.Consts.is_expanded) \
-                        if shape_element.hasAttribute(consts.Consts.is_expanded) else "false"
-            node[consts.Consts.x] = bounds.getAttribute(consts.Consts.x)
-            node[consts.Consts.y] = bounds.getAttribute(consts.Consts.y)
+                is_expanded = shape_attributes[consts.Consts.is_expanded]
+                node[consts.Consts.is_expanded] = is_expanded if is_expanded is not None else "false"
+            node[consts.Consts.x] = shape_attributes[consts.Consts.x]
+            node[consts.Consts.y] = shape_attributes[consts.Consts.y]
         if element_id in participants_dict:
             # BPMNShape is either connected with FlowNode or Participant
             participant_attr = participants_dict[element_id]
-            participant_attr[consts.Consts.is_horizontal] = shape_element.getAttribute(consts.Consts.is_horizontal)
-            participant_attr[consts.Consts.width] = bounds.getAttribute(consts.Consts.width)
-            participant_attr[consts.Consts.height] = bounds.getAttribute(consts.Consts.height)
-            participant_attr[consts.Consts.x] = bounds.getAttribute(consts.Consts.x)
-            participant_attr[consts.Consts.y] = bounds.getAttribute(consts.Consts.y)
+            participant_attr[consts.Consts.is_horizontal] = shape_attributes[consts.Consts.is_horizontal]
+            participant_attr[consts.Consts.width] = shape_attributes[consts.Consts.width]
+            participant_attr[consts.Consts.height] = shape_attributes[consts.Consts.height]
+            participant_attr[consts.Consts.x] = shape_attributes[consts.Consts.x]
+            participant_attr[consts.Consts.y] = shape_attributes[consts.Consts.y]
 
     @staticmethod
     def import_flow_di(diagram_graph, sequence_flows, message_flows, flow_element):
@@ -853,7 +1053,7 @@ class BpmnDiagramGraphImport(object):
         Adds Diagram Interchange information (information about rendering a diagram) to appropriate
         BPMN sequence flow represented as graph edge.
         We assume that each BPMNEdge has a list of 'waypoint' elements. BPMN 2.0 XML Schema states,
-        that each BPMNEdge must have at least two waypoints.
+        that each BPMNEdge must have at least two waypoints. Waypoints are kept as tuples of float numbers.
 
         :param diagram_graph: NetworkX graph representing a BPMN process diagram,
         :param sequence_flows: dictionary (associative list) of sequence flows existing in diagram.
@@ -870,10 +1070,22 @@ class BpmnDiagramGraphImport(object):
 
         waypoints = [None] * length
         for index in range(length):
-            waypoint_tmp = (waypoints_xml[index].getAttribute(consts.Consts.x),
-                            waypoints_xml[index].getAttribute(consts.Consts.y))
+            waypoint_tmp = (float(waypoints_xml[index].getAttribute(consts.Consts.x)),
+                            float(waypoints_xml[index].getAttribute(consts.Consts.y)))
             waypoints[index] = waypoint_tmp
+        BpmnDiagramGraphImport.add_flow_di_to_graph(diagram_graph, sequence_flows, message_flows, flow_id, waypoints)
+
+    @staticmethod
+    def add_flow_di_to_graph(diagram_graph, sequence_flows, message_flows, flow_id, waypoints):
+        """
+        Adds Diagram Interchange information of BPMNEdge to graph edge, that represents connected flow.
 
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: dictionary (associative list) of sequence flows existing in diagram,
+        :param message_flows: dictionary (associative list) of message flows existing in diagram,
+        :param flow_id: string object, ID of flow connected with BPMNEdge,
+        :param waypoints: list of (x, y) tuples, waypoints of BPMNEdge.
+        """
         flow_data = None
         if flow_id in sequence_flows:
             flow_data = sequence_flows[flow_id]
@@ -881,11 +1093,10 @@ class BpmnDiagramGraphImport(object):
             flow_data = message_flows[flow_id]
 
         if flow_data is not None:
-            name = flow_data[consts.Consts.name]
-            source_ref = flow_data[consts.Consts.source_ref]
-            target_ref = flow_data[consts.Consts.target_ref]
-            diagram_graph[source_ref][target_ref][consts.Consts.waypoints] = waypoints
-            diagram_graph[source_ref][target_ref][consts.Consts.name] = name
+            flow = utils.BpmnImportUtils.get_flow_edge(diagram_graph, flow_id, flow_data[consts.Consts.source_ref],
+                                                       flow_data[consts.Consts.target_ref])
+            flow[consts.Consts.waypoints] = waypoints
+            flow[consts.Consts.name] = flow_data[consts.Consts.name]
 
     @staticmethod
     def read_xml_file(filepath):
@@ -896,3 +1107,6 @@ class BpmnDiagramGraphImport(object):
         """
         dom_tree = minidom.parse(filepath)
         return dom_tree
+
+
+BpmnDiagramGraphImport.register_default_element_handlers()
@@ -0,0 +1,219 @@
+# coding=utf-8
+"""
+Package provides cache of imported BPMN diagrams, keyed by hash of XML file content
+"""
+import collections
+import errno
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_import as bpmn_import
+import bpmn_python.bpmn_diagram_snapshot as bpmn_snapshot
+import bpmn_python.bpmn_diagram_streaming_import as bpmn_streaming_import
+
+
+class BpmnDiagramImportCache(object):
+    """
+    Class BpmnDiagramImportCache keeps imported diagrams as binary snapshots (see BpmnDiagramGraphSnapshot), keyed
+    by SHA-256 hash of XML file content, importer name, kind of diagram graph (simple graph merges parallel flows)
+    and importer version. Each cache hit loads the snapshot into the given diagram, so every caller gets independent
+    objects and cannot modify cached state.
+
+    Snapshots are kept in memory, least recently used snapshots are evicted when their total size exceeds max_size.
+    If directory is given, snapshots are also saved there as files (on-disk tier, which is not evicted), so they
+    survive restarts and can be shared by processes. Corrupted snapshot is removed and file is imported again,
+    diagram that cannot be saved as snapshot (e.g. with attributes not serializable to JSON) is not cached.
+    Cache is bypassed, while non-default element handlers are registered in BpmnDiagramGraphImport, because
+    snapshots don't reflect them.
+
+    Fields:
+
+    * hits - number of loads served from memory or from directory,
+    * misses - number of loads, that required XML import.
+    """
+
+    # version of importers output, it must be increased when importers produce different diagrams for the same file
+    importer_version = 1
+    snapshot_extension = ".snapshot"
+
+    def __init__(self, max_size=64 * 1024 * 1024, directory=None):
+        """
+        :param max_size: maximal total size (in bytes) of snapshots kept in memory, 0 disables the in-memory tier,
+        :param directory: string representing directory of on-disk tier, or None, if snapshots are kept only in memory.
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__snapshots = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def load_diagram_from_xml_file(self, filepath, bpmn_diagram, streaming=False):
+        """
+        Loads diagram from XML file into inner representation of BPMN diagram. If the same content was already
+        imported by the same importer, diagram is loaded from cached snapshot without XML parsing. On cache miss,
+        the same content, that was hashed, is imported (file is read only once).
+
+        :param filepath: string with XML file path,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param streaming: boolean flag. If set to True, BpmnDiagramGraphStreamingImport is used on cache miss,
+            otherwise BpmnDiagramGraphImport.
+        """
+        if not bpmn_import.BpmnDiagramGraphImport.has_default_element_handlers():
+            with self.__lock:
+                self.misses += 1
+            if streaming:
+                bpmn_streaming_import.BpmnDiagramGraphStreamingImport.load_diagram_from_xml(filepath, bpmn_diagram)
+            else:
+                bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml(filepath, bpmn_diagram)
+            return
+
+        with open(filepath, "rb") as input_file:
+            content = input_file.read()
+        key = self.get_key(content, streaming, bpmn_diagram.diagram_graph.is_multigraph())
+        data = self.get_snapshot(key)
+        if data is not None:
+            try:
+                bpmn_snapshot.BpmnDiagramGraphSnapshot.read_snapshot(data, bpmn_diagram)
+                return
+            except bpmn_exception.BpmnPythonError:
+                self.remove_snapshot(key)
+                BpmnDiagramImportCache.clear_diagram(bpmn_diagram)
+                with self.__lock:
+                    # load of corrupted snapshot is counted as a miss
+                    self.hits -= 1
+                    self.misses += 1
+
+        if streaming:
+            bpmn_streaming_import.BpmnDiagramGraphStreamingImport.load_diagram_from_xml(io.BytesIO(content),
+                                                                                        bpmn_diagram)
+        else:
+            bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml(io.BytesIO(content), bpmn_diagram)
+        output = io.BytesIO()
+        try:
+            bpmn_snapshot.BpmnDiagramGraphSnapshot.write_snapshot(output, bpmn_diagram)
+        except bpmn_exception.BpmnPythonError:
+            return
+        self.put_snapshot(key, output.getvalue())
+
+    def get_key(self, content, streaming, multigraph):
+        """
+        :param content: bytes of XML file,
+        :param streaming: boolean flag, if streaming importer is used,
+        :param multigraph: boolean flag, if diagram graph is a multigraph (parallel flows are not merged).
+        :return: string key of snapshot.
+        """
+        return "{}-{}-{}-{}-{}".format(hashlib.sha256(content).hexdigest(), "streaming" if streaming else "dom",
+                                       "multigraph" if multigraph else "graph", self.importer_version,
+                                       bpmn_snapshot.BpmnDiagramGraphSnapshot.version)
+
+    def get_snapshot(self, key):
+        """
+        Returns snapshot with given key from memory or from directory. Snapshot found in directory is added to memory.
+
+        :param key: string key of snapshot.
+        :return: bytes of snapshot or None, if snapshot is not cached.
+        """
+        with self.__lock:
+            data = self.__snapshots.pop(key, None)
+            if data is not None:
+                self.__snapshots[key] = data
+                self.hits += 1
+                return data
+        if self.directory is not None:
+            try:
+                with open(self.get_snapshot_path(key), "rb") as input_file:
+                    data = input_file.read()
+            except IOError as exception:
+                if exception.errno != errno.ENOENT:
+                    raise
+        with self.__lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__add_to_memory(key, data)
+            return data
+
+    def put_snapshot(self, key, data):
+        """
+        Adds snapshot to memory and, if cache has directory, saves it to file.
+
+        :param key: string key of snapshot,
+        :param data: bytes of snapshot.
+        """
+        if self.directory is not None:
+            try:
+                os.makedirs(self.directory)
+            except OSError as exception:
+                if exception.errno != errno.EEXIST:
+                    raise
+            # snapshot is written to temporary file and renamed, so other processes never read incomplete file
+            (file_descriptor, temporary_path) = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(file_descriptor, "wb") as output_file:
+                output_file.write(data)
+            os.rename(temporary_path, self.get_snapshot_path(key))
+        with self.__lock:
+            self.__add_to_memory(key, data)
+
+    def remove_snapshot(self, key):
+        """
+        Removes snapshot from memory and from directory.
+
+        :param key: string key of snapshot.
+        """
+        if self.directory is not None:
+            try:
+                os.remove(self.get_snapshot_path(key))
+            except OSError as exception:
+                if exception.errno != errno.ENOENT:
+                    raise
+        with self.__lock:
+            if key in self.__snapshots:
+                self.size -= len(self.__snapshots.pop(key))
+
+    def clear(self):
+        """
+        Removes all snapshots from memory. Files of on-disk tier are not removed.
+        """
+        with self.__lock:
+            self.__snapshots.clear()
+            self.size = 0
+
+    @staticmethod
+    def clear_diagram(bpmn_diagram):
+        """
+        Removes all elements of diagram, that could be loaded from corrupted snapshot.
+
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class.
+        """
+        bpmn_diagram.diagram_graph.clear()
+        for attributes in [bpmn_diagram.sequence_flows, bpmn_diagram.process_elements, bpmn_diagram.collaboration,
+                           bpmn_diagram.diagram_attributes, bpmn_diagram.plane_attributes]:
+            attributes.clear()
+        bpmn_diagram.rebuild_indexes()
+
+    def get_snapshot_path(self, key):
+        return os.path.join(self.directory, key + self.snapshot_extension)
+
+    def __add_to_memory(self, key, data):
+        if key in self.__snapshots:
+            self.size -= len(self.__snapshots.pop(key))
+        if len(data) > self.max_size:
+            return
+        self.__snapshots[key] = data
+        self.size += len(data)
+        while self.size > self.max_size:
+            (_, evicted_data) = self.__snapshots.popitem(last=False)
+            self.size -= len(evicted_data)
+
+    def __len__(self):
+        return len(self.__snapshots)
+
+    def __contains__(self, key):
+        return key in self.__snapshots
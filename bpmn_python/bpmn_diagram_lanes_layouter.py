@@ -0,0 +1,241 @@
+# coding=utf-8
+"""
+Lane and pool aware layout engine. Each process (pool) is laid out separately with layered layout engine, nodes are
+placed in horizontal bands of lanes, that reference them with 'flowNodeRef' elements. Pools are laid out in parallel,
+in worker processes, and then stacked from top to bottom. Bounds of lanes and participants are computed, so they can
+be exported together with diagram.
+"""
+import multiprocessing
+
+import bpmn_python.bpmn_diagram_layered_layouter as layered_layouter
+import bpmn_python.bpmn_python_consts as consts
+
+pool_header_width = 30.0
+lane_header_width = 30.0
+pool_gap = 50.0
+black_box_pool_height = 60.0
+min_pool_content_width = 200.0
+
+
+def generate_layout(bpmn_graph, workers=None):
+    """
+    Generates layout of diagram, keeping nodes of each pool together and nodes of each lane in the band of lane.
+    Node coordinates, flow waypoints and bounds of lanes and participants are overwritten, node sizes are kept.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param workers: number of worker processes. By default, one worker per pool is used (limited by number of CPUs).
+        With one worker, or if diagram has only one pool, layout is computed in current process.
+    """
+    participants = bpmn_graph.collaboration.get(consts.Consts.participants, {})
+    participant_by_process = dict((participant_attr[consts.Consts.process_ref], participant_id)
+                                  for (participant_id, participant_attr) in participants.items()
+                                  if participant_attr[consts.Consts.process_ref])
+
+    # pools are laid out in order of processes, then black box pools and processes without process element
+    pools_ids = list(bpmn_graph.process_elements.keys())
+    known_pools_ids = set(pools_ids)
+    for (node_id, node) in bpmn_graph.get_nodes():
+        pool_id = node.get(consts.Consts.process)
+        if pool_id not in known_pools_ids:
+            pools_ids.append(pool_id)
+            known_pools_ids.add(pool_id)
+    pool_of_node = {}
+    for pool_id in pools_ids:
+        for (node_id, _) in bpmn_graph.get_nodes_list_by_process_id(pool_id):
+            pool_of_node[node_id] = pool_id
+
+    message_flows_ids = set(bpmn_graph.collaboration.get(consts.Consts.message_flows, {}).keys())
+    pools_flows = dict((pool_id, []) for pool_id in pools_ids)
+    inter_pool_flows = []
+    for flow in bpmn_graph.get_flows():
+        source_pool_id = pool_of_node.get(flow[2][consts.Consts.source_ref])
+        target_pool_id = pool_of_node.get(flow[2][consts.Consts.target_ref])
+        if source_pool_id is None or target_pool_id is None:
+            continue
+        if source_pool_id != target_pool_id or flow[2][consts.Consts.id] in message_flows_ids:
+            inter_pool_flows.append(flow)
+        else:
+            pools_flows[source_pool_id].append(flow)
+
+    pools = []
+    layout_inputs = []
+    for pool_id in pools_ids:
+        nodes = bpmn_graph.get_nodes_list_by_process_id(pool_id)
+        if pool_id in participants and all(node[1][consts.Consts.type] == consts.Consts.participant
+                                           for node in nodes):
+            # black box pool, participant node is drawn as pool
+            pools.append((pool_id, pool_id, nodes, [], None))
+            continue
+        lane_set = bpmn_graph.process_elements.get(pool_id, {}).get(consts.Consts.lane_set)
+        lanes = []
+        band_of_node = {}
+        bands_count = 1
+        if lane_set is not None and lane_set.get(consts.Consts.lanes):
+            bands_count = collect_lanes(lane_set[consts.Consts.lanes], 1, 0, lanes, band_of_node)
+        (nodes_ids, widths, heights, flows_refs) = layered_layouter.get_layout_input(nodes, pools_flows[pool_id])
+        bands = [band_of_node.get(node_id, 0) for node_id in nodes_ids]
+        pools.append((pool_id, participant_by_process.get(pool_id), nodes, lanes, len(layout_inputs)))
+        layout_inputs.append((nodes_ids, widths, heights, flows_refs, bands, bands_count))
+    layouts = compute_pools_layouts(layout_inputs, workers)
+
+    # pools have common width, given by the widest pool
+    pool_x = layered_layouter.margin
+    pools_contents_left = []
+    pool_right = pool_x + min_pool_content_width
+    for (pool_id, participant_id, nodes, lanes, layout_index) in pools:
+        content_left = pool_x
+        if participant_id is not None:
+            content_left += pool_header_width
+        if lanes:
+            content_left += lane_header_width * max(lane[2] for lane in lanes)
+        pools_contents_left.append(content_left)
+        if layout_index is not None:
+            nodes_positions = layouts[layout_index][0]
+            content_width = max([position[0] + width - layered_layouter.margin for (position, width)
+                                 in zip(nodes_positions, layout_inputs[layout_index][1])] or [0.0])
+            content_width = max(content_width, min_pool_content_width)
+            pool_right = max(pool_right, content_left + content_width + 2 * layered_layouter.lane_padding)
+
+    pool_top = layered_layouter.margin
+    pools_bounds = {}
+    for ((pool_id, participant_id, nodes, lanes, layout_index), content_left) in zip(pools, pools_contents_left):
+        if layout_index is None:
+            pool_height = black_box_pool_height
+            for (_, node) in nodes:
+                set_bounds(node, pool_x, pool_top, pool_right - pool_x, pool_height)
+        else:
+            (nodes_positions, flows_waypoints, bands_bounds) = layouts[layout_index]
+            shift_x = content_left + layered_layouter.lane_padding - layered_layouter.margin
+            shift_y = pool_top - layered_layouter.margin
+            for ((_, node), position) in zip(nodes, nodes_positions):
+                node[consts.Consts.x] = position[0] + shift_x
+                node[consts.Consts.y] = position[1] + shift_y
+            for flow in pools_flows[pool_id]:
+                waypoints = flows_waypoints.get(flow[2][consts.Consts.id])
+                if waypoints is not None:
+                    flow[2][consts.Consts.waypoints] = [(x + shift_x, y + shift_y) for (x, y) in waypoints]
+            lanes_depth = max([lane[2] for lane in lanes] or [0])
+            for (lane_id, lane_attr, depth, first_band, last_band) in lanes:
+                lane_x = content_left - lane_header_width * (lanes_depth - depth + 1)
+                set_bounds(lane_attr, lane_x, bands_bounds[first_band][0] + shift_y, pool_right - lane_x,
+                           bands_bounds[last_band][1] - bands_bounds[first_band][0])
+            pool_height = bands_bounds[-1][1] - bands_bounds[0][0]
+        if participant_id is not None:
+            set_bounds(participants[participant_id], pool_x, pool_top, pool_right - pool_x, pool_height)
+        pools_bounds[pool_id] = (pool_top, pool_top + pool_height)
+        pool_top += pool_height + pool_gap
+
+    for flow in inter_pool_flows:
+        source_node = bpmn_graph.get_node_by_id(flow[2][consts.Consts.source_ref])[1]
+        target_node = bpmn_graph.get_node_by_id(flow[2][consts.Consts.target_ref])[1]
+        flow[2][consts.Consts.waypoints] = get_message_flow_waypoints(
+            source_node, target_node, pools_bounds[pool_of_node[flow[2][consts.Consts.target_ref]]])
+
+
+def collect_lanes(lanes_attr, depth, first_band, lanes, band_of_node):
+    """
+    Collects lanes of lane set in depth-first order. Each lane without child lanes is a band, nodes are assigned to
+    band of the deepest lane, that references them (or to the first band of lane, that has child lanes).
+
+    :param lanes_attr: dictionary of lanes, as kept in 'lanes' of lane set,
+    :param depth: depth of lanes (lanes of process lane set have depth 1),
+    :param first_band: number of the first band of collected lanes,
+    :param lanes: list of collected lanes, tuples (lane ID, lane attributes, depth, first band, last band) are
+        appended to it,
+    :param band_of_node: dictionary, that maps node ID to band number, it is updated with nodes of collected lanes.
+    :return: number of band after the last band of collected lanes.
+    """
+    for (lane_id, lane_attr) in lanes_attr.items():
+        lane_index = len(lanes)
+        lanes.append(None)
+        for node_id in lane_attr.get(consts.Consts.flow_node_refs, []):
+            band_of_node[node_id] = first_band
+        child_lane_set = lane_attr.get(consts.Consts.child_lane_set)
+        if child_lane_set and child_lane_set.get(consts.Consts.lanes):
+            next_band = collect_lanes(child_lane_set[consts.Consts.lanes], depth + 1, first_band, lanes, band_of_node)
+        else:
+            next_band = first_band + 1
+        lanes[lane_index] = (lane_id, lane_attr, depth, first_band, next_band - 1)
+        first_band = next_band
+    return first_band
+
+
+def compute_pool_layout(layout_input):
+    """
+    Computes layout of a single pool, arguments of layered_layouter.compute_layout function are passed as a tuple.
+
+    :param layout_input: a tuple of compute_layout arguments.
+    :return: result of compute_layout function.
+    """
+    return layered_layouter.compute_layout(*layout_input)
+
+
+def compute_pools_layouts(layout_inputs, workers=None):
+    """
+    Computes layouts of pools, in pool of worker processes if more than one worker is requested.
+
+    :param layout_inputs: list of tuples with compute_layout arguments,
+    :param workers: number of worker processes, by default one worker per pool, limited by number of CPUs.
+    :return: list of compute_layout results.
+    """
+    if workers is None:
+        workers = min(len(layout_inputs), multiprocessing.cpu_count())
+    workers = min(workers, len(layout_inputs))
+    if workers <= 1:
+        return [compute_pool_layout(layout_input) for layout_input in layout_inputs]
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(compute_pool_layout, layout_inputs)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def set_bounds(element_attr, x, y, width, height):
+    """
+    Sets Diagram Interchange bounds of lane, participant or node.
+
+    :param element_attr: dictionary of element attributes,
+    :param x: first coordinate of upper left corner,
+    :param y: second coordinate of upper left corner,
+    :param width: width of element,
+    :param height: height of element.
+    """
+    element_attr[consts.Consts.x] = float(x)
+    element_attr[consts.Consts.y] = float(y)
+    element_attr[consts.Consts.width] = float(width)
+    element_attr[consts.Consts.height] = float(height)
+    if consts.Consts.is_horizontal not in element_attr or not element_attr[consts.Consts.is_horizontal]:
+        element_attr[consts.Consts.is_horizontal] = "true"
+
+
+def get_message_flow_waypoints(source_node, target_node, target_pool_bounds):
+    """
+    Computes orthogonal waypoints of flow between pools. Flow leaves source node from bottom (or top, if target is
+    above) and is bent in the gap next to pool of target node.
+
+    :param source_node: dictionary of source node attributes,
+    :param target_node: dictionary of target node attributes,
+    :param target_pool_bounds: pair (top, bottom) with vertical bounds of target pool.
+    :return: list of waypoints.
+    """
+    # nodes imported without shape have no size, layered layout engine uses the default one
+    source_width = source_node.get(consts.Consts.width, layered_layouter.default_node_size)
+    source_height = source_node.get(consts.Consts.height, layered_layouter.default_node_size)
+    target_width = target_node.get(consts.Consts.width, layered_layouter.default_node_size)
+    target_height = target_node.get(consts.Consts.height, layered_layouter.default_node_size)
+    source_center_x = source_node[consts.Consts.x] + source_width / 2.0
+    target_center_x = target_node[consts.Consts.x] + target_width / 2.0
+    if target_node[consts.Consts.y] >= source_node[consts.Consts.y] + source_height:
+        start = (source_center_x, source_node[consts.Consts.y] + source_height)
+        end = (target_center_x, target_node[consts.Consts.y])
+        channel_y = max(target_pool_bounds[0] - pool_gap / 2.0, start[1])
+    else:
+        start = (source_center_x, source_node[consts.Consts.y])
+        end = (target_center_x, target_node[consts.Consts.y] + target_height)
+        channel_y = min(target_pool_bounds[1] + pool_gap / 2.0, start[1])
+    waypoints = [start]
+    for point in [(start[0], channel_y), (end[0], channel_y), end]:
+        if point != waypoints[-1]:
+            waypoints.append(point)
+    return waypoints
@@ -0,0 +1,504 @@
+# coding=utf-8
+"""
+Layered (Sugiyama style) layout engine. Diagram is drawn from left to right in four phases: flows closing cycles
+are reversed, nodes are assigned to layers (columns) with longest path layering, nodes in layers are ordered with
+median heuristic to reduce crossings and finally coordinates are assigned with respect to node widths and heights.
+Flows spanning more than one layer are split with dummy vertices, which become bend points of flow waypoints.
+"""
+
+import bpmn_python.bpmn_python_consts as consts
+
+ordering_sweeps = 8
+alignment_sweeps = 4
+layer_gap = 80.0
+node_gap = 40.0
+dummy_gap = 20.0
+margin = 50.0
+default_node_size = 100.0
+self_loop_offset = 20.0
+lane_padding = 30.0
+empty_band_height = 100.0
+# weights of edges in vertical alignment, indexed by number of dummy vertices at edge ends
+edge_weights = (1.0, 2.0, 8.0)
+
+
+def generate_layout(bpmn_graph):
+    """
+    Generates layout of diagram nodes and flows with layered (Sugiyama style) algorithm. Node coordinates and flow
+    waypoints are overwritten, node sizes are kept.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    """
+    nodes = bpmn_graph.get_nodes()
+    flows = bpmn_graph.get_flows()
+    (nodes_ids, widths, heights, flows_refs) = get_layout_input(nodes, flows)
+    (nodes_positions, flows_waypoints, _) = compute_layout(nodes_ids, widths, heights, flows_refs)
+    for (node, position) in zip(nodes, nodes_positions):
+        node[1][consts.Consts.x] = position[0]
+        node[1][consts.Consts.y] = position[1]
+    for flow in flows:
+        waypoints = flows_waypoints.get(flow[2][consts.Consts.id])
+        if waypoints is not None:
+            flow[2][consts.Consts.waypoints] = waypoints
+
+
+def get_layout_input(nodes, flows):
+    """
+    Converts nodes and flows of diagram into input of compute_layout function. Flows, that connect nodes outside
+    of given list, are skipped.
+
+    :param nodes: list of nodes (pairs of node ID and node attributes),
+    :param flows: list of flows (as returned by BpmnDiagramGraph.get_flows).
+    :return: a tuple of nodes IDs list, widths list, heights list and list of tuples (flow ID, source node ID,
+        target node ID).
+    """
+    nodes_ids = [node[0] for node in nodes]
+    widths = [float(node[1].get(consts.Consts.width, default_node_size)) for node in nodes]
+    heights = [float(node[1].get(consts.Consts.height, default_node_size)) for node in nodes]
+    nodes_ids_set = set(nodes_ids)
+    flows_refs = []
+    for flow in flows:
+        source_id = flow[2][consts.Consts.source_ref]
+        target_id = flow[2][consts.Consts.target_ref]
+        if source_id in nodes_ids_set and target_id in nodes_ids_set:
+            flows_refs.append((flow[2][consts.Consts.id], source_id, target_id))
+    return nodes_ids, widths, heights, flows_refs
+
+
+def compute_layout(nodes_ids, widths, heights, flows, bands=None, bands_count=None):
+    """
+    Computes layered layout of graph given by plain lists, so it can be computed in a worker process. Optionally,
+    nodes are assigned to horizontal bands (lanes) - nodes of each band are ordered and aligned separately and bands
+    are stacked from top to bottom, each band has lane_padding margin around its nodes.
+
+    :param nodes_ids: list of node IDs,
+    :param widths: list of node widths,
+    :param heights: list of node heights,
+    :param flows: list of tuples (flow ID, source node ID, target node ID),
+    :param bands: list of band numbers (counted from zero) of nodes or None, if nodes are not assigned to bands,
+    :param bands_count: number of bands, including bands without nodes. By default, bands up to the greatest
+        band number are laid out.
+    :return: a tuple of list of nodes positions (coordinates of upper left corner), dictionary that maps flow ID to
+        list of waypoints and list of pairs (top, bottom) with vertical bounds of bands.
+    """
+    vertex_by_id = dict((node_id, vertex) for (vertex, node_id) in enumerate(nodes_ids))
+    outgoing_edges = dict((node_id, []) for node_id in nodes_ids)
+    self_loops = []
+    for (flow_id, source_id, target_id) in flows:
+        if source_id == target_id:
+            self_loops.append((flow_id, vertex_by_id[source_id]))
+        else:
+            outgoing_edges[source_id].append((flow_id, target_id))
+    backward_flows_ids = set(find_back_edges(nodes_ids, outgoing_edges))
+
+    # edges of acyclic graph, flows closing cycles are reversed
+    edges = []
+    for node_id in nodes_ids:
+        for (flow_id, target_id) in outgoing_edges[node_id]:
+            if flow_id in backward_flows_ids:
+                edges.append((vertex_by_id[target_id], vertex_by_id[node_id], flow_id, True))
+            else:
+                edges.append((vertex_by_id[node_id], vertex_by_id[target_id], flow_id, False))
+
+    layer_of_vertex = assign_layers(len(nodes_ids), edges)
+    (layers, predecessors, successors, layer_of_vertex, chains) = split_long_edges(layer_of_vertex, edges)
+    if bands is None:
+        bands_count = 1
+        padding = 0.0
+        band_of_vertex = [0] * len(layer_of_vertex)
+    else:
+        if bands_count is None:
+            bands_count = max(bands) + 1 if bands else 1
+        padding = lane_padding
+        # dummy vertices belong to band of first vertex of their chain
+        band_of_vertex = list(bands) + [0] * (len(layer_of_vertex) - len(bands))
+        for (_, chain, _) in chains:
+            for dummy in chain[1:-1]:
+                band_of_vertex[dummy] = bands[chain[0]]
+        for layer in layers:
+            layer.sort(key=band_of_vertex.__getitem__)
+    order_layers(layers, predecessors, successors, None if bands is None else band_of_vertex)
+
+    vertex_widths = widths + [0.0] * (len(layer_of_vertex) - len(widths))
+    vertex_heights = heights + [0.0] * (len(layer_of_vertex) - len(heights))
+    centers_y = [0.0] * len(layer_of_vertex)
+    bands_bounds = []
+    band_top = margin
+    for band in range(bands_count):
+        band_layers = [[vertex for vertex in layer if band_of_vertex[vertex] == band] for layer in layers]
+        band_predecessors = [[predecessor for predecessor in predecessors[vertex]
+                              if band_of_vertex[predecessor] == band_of_vertex[vertex]]
+                             for vertex in range(len(layer_of_vertex))]
+        band_successors = [[successor for successor in successors[vertex]
+                            if band_of_vertex[successor] == band_of_vertex[vertex]]
+                           for vertex in range(len(layer_of_vertex))]
+        band_centers = assign_vertical_coordinates(band_layers, band_predecessors, band_successors, vertex_heights,
+                                                   len(nodes_ids))
+        band_vertices = [vertex for layer in band_layers for vertex in layer]
+        if band_vertices:
+            min_y = min(band_centers[vertex] - vertex_heights[vertex] / 2.0 for vertex in band_vertices)
+            max_y = max(band_centers[vertex] + vertex_heights[vertex] / 2.0 for vertex in band_vertices)
+        else:
+            (min_y, max_y) = (0.0, empty_band_height - 2 * padding)
+        for vertex in band_vertices:
+            centers_y[vertex] = band_centers[vertex] - min_y + band_top + padding
+        band_bottom = band_top + max_y - min_y + 2 * padding
+        bands_bounds.append((band_top, band_bottom))
+        band_top = band_bottom
+
+    layers_x = []
+    layers_widths = []
+    x = margin
+    for layer in layers:
+        layer_width = max(vertex_widths[vertex] for vertex in layer)
+        layers_x.append(x)
+        layers_widths.append(layer_width)
+        x += layer_width + layer_gap
+    centers_x = [layers_x[layer_of_vertex[vertex]] + layers_widths[layer_of_vertex[vertex]] / 2.0
+                 for vertex in range(len(layer_of_vertex))]
+    # flows are bent in the middle of the gap after layer of their source vertex
+    bends_x = [layers_x[layer_of_vertex[vertex]] + layers_widths[layer_of_vertex[vertex]] + layer_gap / 2.0
+               for vertex in range(len(layer_of_vertex))]
+
+    nodes_positions = [(centers_x[vertex] - widths[vertex] / 2.0, centers_y[vertex] - heights[vertex] / 2.0)
+                       for vertex in range(len(nodes_ids))]
+    flows_waypoints = {}
+    for (flow_id, chain, is_reversed) in chains:
+        waypoints = get_chain_waypoints(chain, centers_x, centers_y, vertex_widths, bends_x, predecessors,
+                                        successors)
+        if is_reversed:
+            waypoints.reverse()
+        flows_waypoints[flow_id] = waypoints
+    for (flow_id, vertex) in self_loops:
+        right = centers_x[vertex] + widths[vertex] / 2.0 + self_loop_offset
+        top = centers_y[vertex] - heights[vertex] / 2.0
+        flows_waypoints[flow_id] = [(centers_x[vertex] + widths[vertex] / 2.0, centers_y[vertex]),
+                                    (right, centers_y[vertex]),
+                                    (right, top - self_loop_offset),
+                                    (centers_x[vertex], top - self_loop_offset),
+                                    (centers_x[vertex], top)]
+    return nodes_positions, flows_waypoints, bands_bounds
+
+
+def find_back_edges(nodes_ids, outgoing_edges):
+    """
+    Finds edges closing cycles (back edges) with iterative depth-first search. Search starts from nodes without
+    incoming edges, then from remaining unvisited nodes, in order of nodes_ids list. Outgoing edges are visited in
+    order of outgoing edges lists.
+
+    :param nodes_ids: list of node IDs,
+    :param outgoing_edges: dictionary, that maps node ID to list of pairs (edge, target node ID).
+    :return: list of back edges.
+    """
+    on_stack = 1
+    finished = 2
+
+    targets = set(target_id for node_id in nodes_ids for (_, target_id) in outgoing_edges[node_id])
+    roots = [node_id for node_id in nodes_ids if node_id not in targets] \
+        + [node_id for node_id in nodes_ids if node_id in targets]
+    state = {}
+    back_edges = []
+    for root_id in roots:
+        if root_id in state:
+            continue
+        state[root_id] = on_stack
+        stack = [(root_id, iter(outgoing_edges[root_id]))]
+        while stack:
+            (node_id, successors) = stack[-1]
+            for (edge, target_id) in successors:
+                if target_id not in state:
+                    state[target_id] = on_stack
+                    stack.append((target_id, iter(outgoing_edges[target_id])))
+                    break
+                elif state[target_id] == on_stack:
+                    back_edges.append(edge)
+            else:
+                state[node_id] = finished
+                stack.pop()
+    return back_edges
+
+
+def assign_layers(vertices_count, edges):
+    """
+    Assigns vertices of acyclic graph to layers with longest path layering - each vertex is placed in the first
+    layer after all its predecessors. Vertices without predecessors are then moved right, just before their
+    nearest successor, so that start events are not separated from the rest of process.
+
+    :param vertices_count: number of vertices (vertices are numbered from zero),
+    :param edges: list of tuples, where first two values are source and target vertex.
+    :return: list of layer numbers, indexed by vertex.
+    """
+    successors = [[] for _ in range(vertices_count)]
+    in_degree = [0] * vertices_count
+    for edge in edges:
+        successors[edge[0]].append(edge[1])
+        in_degree[edge[1]] += 1
+
+    layer_of_vertex = [0] * vertices_count
+    sources = [vertex for vertex in range(vertices_count) if in_degree[vertex] == 0]
+    sorted_vertices = list(sources)
+    index = 0
+    while index < len(sorted_vertices):
+        vertex = sorted_vertices[index]
+        index += 1
+        for successor in successors[vertex]:
+            if layer_of_vertex[successor] < layer_of_vertex[vertex] + 1:
+                layer_of_vertex[successor] = layer_of_vertex[vertex] + 1
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                sorted_vertices.append(successor)
+
+    for vertex in sources:
+        if successors[vertex]:
+            layer_of_vertex[vertex] = min(layer_of_vertex[successor] for successor in successors[vertex]) - 1
+    return layer_of_vertex
+
+
+def split_long_edges(layer_of_vertex, edges):
+    """
+    Replaces edges spanning more than one layer with chains of dummy vertices, one dummy vertex in each crossed
+    layer. Dummy vertices are numbered after vertices of graph.
+
+    :param layer_of_vertex: list of layer numbers, indexed by vertex,
+    :param edges: list of tuples (source vertex, target vertex, flow attributes, reversed flag).
+    :return: a tuple of layers (lists of vertices), predecessors and successors lists, extended list of layer
+        numbers and list of tuples (flow attributes, chain of vertices, reversed flag).
+    """
+    layer_of_vertex = list(layer_of_vertex)
+    layers_count = max(layer_of_vertex) + 1 if layer_of_vertex else 0
+    layers = [[] for _ in range(layers_count)]
+    for (vertex, layer) in enumerate(layer_of_vertex):
+        layers[layer].append(vertex)
+    predecessors = [[] for _ in layer_of_vertex]
+    successors = [[] for _ in layer_of_vertex]
+
+    chains = []
+    for (source, target, flow_attributes, is_reversed) in edges:
+        chain = [source]
+        for layer in range(layer_of_vertex[source] + 1, layer_of_vertex[target]):
+            dummy = len(layer_of_vertex)
+            layer_of_vertex.append(layer)
+            layers[layer].append(dummy)
+            predecessors.append([])
+            successors.append([])
+            chain.append(dummy)
+        chain.append(target)
+        for index in range(len(chain) - 1):
+            successors[chain[index]].append(chain[index + 1])
+            predecessors[chain[index + 1]].append(chain[index])
+        chains.append((flow_attributes, chain, is_reversed))
+    return layers, predecessors, successors, layer_of_vertex, chains
+
+
+def order_layers(layers, predecessors, successors, bands=None):
+    """
+    Orders vertices in layers to reduce edge crossings. Layers are sorted by median position of neighbours in
+    previous layer (sweeps from left to right) and next layer (sweeps from right to left). Vertices without
+    neighbours keep their positions. Order with the lowest number of crossings is kept, layers are modified in place.
+
+    :param layers: list of layers (lists of vertices),
+    :param predecessors: list of predecessors, indexed by vertex,
+    :param successors: list of successors, indexed by vertex,
+    :param bands: list of band numbers, indexed by vertex, or None. If given, vertices are kept grouped by bands,
+        in order of band numbers.
+    """
+    positions = [0] * len(predecessors)
+    for layer in layers:
+        for (position, vertex) in enumerate(layer):
+            positions[vertex] = position
+
+    best_layers = [list(layer) for layer in layers]
+    best_crossings = count_crossings(layers, successors, positions)
+    for sweep in range(ordering_sweeps):
+        if best_crossings == 0:
+            break
+        if sweep % 2 == 0:
+            for index in range(1, len(layers)):
+                sort_layer_by_median(layers[index], predecessors, positions, bands)
+        else:
+            for index in range(len(layers) - 2, -1, -1):
+                sort_layer_by_median(layers[index], successors, positions, bands)
+        crossings = count_crossings(layers, successors, positions)
+        if crossings < best_crossings:
+            best_crossings = crossings
+            best_layers = [list(layer) for layer in layers]
+    layers[:] = best_layers
+
+
+def sort_layer_by_median(layer, neighbours, positions, bands=None):
+    """
+    Sorts layer by median position of neighbours and updates positions of its vertices.
+
+    :param layer: list of vertices,
+    :param neighbours: list of neighbours in adjacent layer, indexed by vertex,
+    :param positions: list of positions of vertices in their layers, indexed by vertex,
+    :param bands: list of band numbers, indexed by vertex, or None. If given, layer is sorted by band first.
+    """
+    keys = {}
+    for vertex in layer:
+        vertex_neighbours = neighbours[vertex]
+        if vertex_neighbours:
+            neighbours_positions = sorted(positions[neighbour] for neighbour in vertex_neighbours)
+            middle = len(neighbours_positions) // 2
+            if len(neighbours_positions) % 2 == 1:
+                keys[vertex] = neighbours_positions[middle]
+            else:
+                keys[vertex] = (neighbours_positions[middle - 1] + neighbours_positions[middle]) / 2.0
+        else:
+            keys[vertex] = positions[vertex]
+    if bands is None:
+        layer.sort(key=keys.get)
+    else:
+        layer.sort(key=lambda vertex: (bands[vertex], keys[vertex]))
+    for (position, vertex) in enumerate(layer):
+        positions[vertex] = position
+
+
+def count_crossings(layers, successors, positions):
+    """
+    Counts crossings of edges between adjacent layers. Edges are sorted by position of source and crossings are
+    counted as inversions of target positions, with a binary indexed tree.
+
+    :param layers: list of layers (lists of vertices),
+    :param successors: list of successors, indexed by vertex,
+    :param positions: list of positions of vertices in their layers, indexed by vertex.
+    :return: number of crossings.
+    """
+    crossings = 0
+    for index in range(len(layers) - 1):
+        size = len(layers[index + 1])
+        tree = [0] * (size + 1)
+        inserted = 0
+        for vertex in layers[index]:
+            targets = sorted(positions[successor] for successor in successors[vertex])
+            for target in targets:
+                # number of inserted targets with position greater than target
+                position = target + 1
+                not_greater = 0
+                while position > 0:
+                    not_greater += tree[position]
+                    position -= position & -position
+                crossings += inserted - not_greater
+            for target in targets:
+                position = target + 1
+                while position <= size:
+                    tree[position] += 1
+                    position += position & -position
+            inserted += len(targets)
+    return crossings
+
+
+def assign_vertical_coordinates(layers, predecessors, successors, heights, vertices_count):
+    """
+    Assigns vertical coordinates of vertex centers. Each layer is placed as close as possible (in the least squares
+    sense) to centers of neighbours, keeping order of vertices and minimal separation between them. Edges between
+    dummy vertices have greater weights, so long flows are kept straight.
+
+    :param layers: list of ordered layers (lists of vertices),
+    :param predecessors: list of predecessors, indexed by vertex,
+    :param successors: list of successors, indexed by vertex,
+    :param heights: list of heights, indexed by vertex,
+    :param vertices_count: number of vertices, that are not dummy vertices.
+    :return: list of vertical coordinates of centers, indexed by vertex.
+    """
+    centers = [0.0] * len(heights)
+    separations = []
+    for layer in layers:
+        layer_separations = []
+        for index in range(len(layer) - 1):
+            gap = node_gap if layer[index] < vertices_count and layer[index + 1] < vertices_count else dummy_gap
+            layer_separations.append((heights[layer[index]] + heights[layer[index + 1]]) / 2.0 + gap)
+        separations.append(layer_separations)
+        positions = place_in_order([0.0] * len(layer), [1.0] * len(layer), layer_separations)
+        for (vertex, center) in zip(layer, positions):
+            centers[vertex] = center
+
+    neighbours = [predecessors[vertex] + successors[vertex] for vertex in range(len(heights))]
+    passes = [(range(1, len(layers)), predecessors), (range(len(layers) - 2, -1, -1), successors)] * alignment_sweeps
+    passes.append((range(len(layers)), neighbours))
+    for (layers_indexes, layer_neighbours) in passes:
+        for index in layers_indexes:
+            layer = layers[index]
+            desired = []
+            weights = []
+            for vertex in layer:
+                weighted_sum = 0.0
+                weights_sum = 0.0
+                for neighbour in layer_neighbours[vertex]:
+                    weight = edge_weights[(vertex >= vertices_count) + (neighbour >= vertices_count)]
+                    weighted_sum += weight * centers[neighbour]
+                    weights_sum += weight
+                if weights_sum:
+                    desired.append(weighted_sum / weights_sum)
+                    weights.append(weights_sum)
+                else:
+                    desired.append(centers[vertex])
+                    weights.append(0.5)
+            for (vertex, center) in zip(layer, place_in_order(desired, weights, separations[index])):
+                centers[vertex] = center
+    return centers
+
+
+def place_in_order(desired, weights, separations):
+    """
+    Computes positions, that minimize weighted sum of squared distances to desired positions, subject to minimal
+    separations between consecutive positions. Problem is reduced to isotonic regression, solved with pool adjacent
+    violators algorithm in linear time.
+
+    :param desired: list of desired positions,
+    :param weights: list of positive weights,
+    :param separations: list of minimal distances between consecutive positions (one shorter than desired).
+    :return: list of positions.
+    """
+    offsets = [0.0]
+    for separation in separations:
+        offsets.append(offsets[-1] + separation)
+
+    # blocks of pooled values: [weighted sum, weights sum, count]
+    blocks = []
+    for index in range(len(desired)):
+        block = [weights[index] * (desired[index] - offsets[index]), weights[index], 1]
+        while blocks and blocks[-1][0] * block[1] >= block[0] * blocks[-1][1]:
+            previous = blocks.pop()
+            block = [previous[0] + block[0], previous[1] + block[1], previous[2] + block[2]]
+        blocks.append(block)
+
+    positions = []
+    for block in blocks:
+        value = block[0] / block[1]
+        for _ in range(block[2]):
+            positions.append(value + offsets[len(positions)])
+    return positions
+
+
+def get_chain_waypoints(chain, centers_x, centers_y, widths, bends_x, predecessors, successors):
+    """
+    Computes orthogonal waypoints of flow, that goes through given chain of vertices (from left to right). Flow
+    leaves vertex from the middle of its right side and enters vertex in the middle of its left side, it is bent
+    in the middle of the gap between layers. Straight flows leaving a split or entering a join also have waypoint
+    in the middle of the gap, so flows sharing a side of vertex meet only in common waypoints.
+
+    :param chain: list of vertices,
+    :param centers_x: list of horizontal coordinates of centers, indexed by vertex,
+    :param centers_y: list of vertical coordinates of centers, indexed by vertex,
+    :param widths: list of widths, indexed by vertex,
+    :param bends_x: list of horizontal coordinates of bends after vertex, indexed by vertex,
+    :param predecessors: list of predecessors, indexed by vertex,
+    :param successors: list of successors, indexed by vertex.
+    :return: list of waypoints.
+    """
+    waypoints = []
+    for index in range(len(chain) - 1):
+        source = chain[index]
+        target = chain[index + 1]
+        exit_point = (centers_x[source] + widths[source] / 2.0, centers_y[source])
+        entry_point = (centers_x[target] - widths[target] / 2.0, centers_y[target])
+        if not waypoints or waypoints[-1] != exit_point:
+            waypoints.append(exit_point)
+        if exit_point[1] != entry_point[1]:
+            waypoints.append((bends_x[source], exit_point[1]))
+            waypoints.append((bends_x[source], entry_point[1]))
+        elif len(successors[source]) > 1 or len(predecessors[target]) > 1:
+            waypoints.append((bends_x[source], exit_point[1]))
+        waypoints.append(entry_point)
+    return waypoints
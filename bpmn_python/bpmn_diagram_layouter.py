@@ -2,137 +2,191 @@
 """
 Package with BPMNDiagramGraph - graph representation of BPMN diagram
 """
-import copy
 
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_lanes_layouter as lanes_layouter
+import bpmn_python.bpmn_diagram_layered_layouter as layered_layouter
+import bpmn_python.bpmn_diagram_router as router
 import bpmn_python.bpmn_python_consts as consts
-import bpmn_python.grid_cell_class as cell_class
+import bpmn_python.grid_class as grid_class
 
+grid_engine = "grid"
+layered_engine = "layered"
+lanes_engine = "lanes"
 
-def generate_layout(bpmn_graph):
+
+def generate_layout(bpmn_graph, engine=grid_engine):
+    """
+    Generates layout of diagram with selected engine. Grid engine places nodes in grid cells with simple heuristics,
+    layered engine uses layered (Sugiyama style) algorithm from bpmn_diagram_layered_layouter module. Lanes engine
+    (bpmn_diagram_lanes_layouter module) lays out pools separately with layered algorithm, placing nodes in bands
+    of their lanes, and computes bounds of lanes and participants.
+
+    :param bpmn_graph: an instance of BPMNDiagramGraph class,
+    :param engine: name of layout engine, "grid" (default), "layered" or "lanes".
+    """
+    if engine == layered_engine:
+        layered_layouter.generate_layout(bpmn_graph)
+    elif engine == lanes_engine:
+        lanes_layouter.generate_layout(bpmn_graph)
+    elif engine == grid_engine:
+        generate_grid_layout(bpmn_graph)
+    else:
+        raise bpmn_exception.BpmnPythonError("Unknown layout engine: " + str(engine))
+
+
+def generate_grid_layout(bpmn_graph):
     """
     :param bpmn_graph: an instance of BPMNDiagramGraph class.
+    :return: an instance of Grid class with placement of nodes, it can be passed to update_grid_layout.
     """
     classification = generate_elements_clasification(bpmn_graph)
     (sorted_nodes_with_classification, backward_flows) = topological_sort(bpmn_graph, classification[0])
     grid = grid_layout(bpmn_graph, sorted_nodes_with_classification)
     set_coordinates_for_nodes(bpmn_graph, grid)
-    set_flows_waypoints(bpmn_graph)
+    grid.obstacles = set_flows_waypoints(bpmn_graph)
+    return grid
+
+
+def update_grid_layout(bpmn_graph, grid, added_nodes=None, removed_nodes=None, added_flows=None, removed_flows=None):
+    """
+    Updates layout generated by grid engine after small changes of diagram, without computing it from scratch.
+    Added nodes, and nodes that had no incoming flows before the change and get new ones, are placed with the same
+    rules as in grid_layout, in the nearest free cell of column, so rows are not moved. Cells of removed nodes
+    become free. Only flows of placed nodes, added flows and flows sharing source or target with them are rerouted.
+    Bounds of placed and removed nodes are updated in obstacles index kept by grid, instead of indexing all nodes
+    again. Result may differ from layout generated from scratch.
+
+    :param bpmn_graph: an instance of BPMNDiagramGraph class, already containing the changes,
+    :param grid: an instance of Grid class, returned by generate_grid_layout or previous update, updated in place,
+    :param added_nodes: list of IDs of added nodes,
+    :param removed_nodes: list of IDs of removed nodes,
+    :param added_flows: list of IDs of added flows,
+    :param removed_flows: list of removed flows, tuples (source ID, target ID, flow attributes), as returned by
+        get_flow_by_id before removal.
+    :return: list of IDs of nodes, that were placed or moved.
+    """
+    added_nodes = list(added_nodes or [])
+    added_flows_ids = set(added_flows or [])
+    for node_id in removed_nodes or []:
+        grid.remove(node_id)
+        if grid.obstacles is not None:
+            grid.obstacles.remove_node_bounds(node_id)
+
+    placed_nodes_ids = set(added_nodes)
+    for flow_id in added_flows_ids:
+        target_id = bpmn_graph.get_flow_by_id(flow_id)[2][consts.Consts.target_ref]
+        target_node = bpmn_graph.get_node_by_id(target_id)[1]
+        if all(incoming_flow_id in added_flows_ids for incoming_flow_id in target_node[consts.Consts.incoming_flow]):
+            placed_nodes_ids.add(target_id)
+    nodes_order = added_nodes + sorted(placed_nodes_ids.difference(added_nodes))
+    sorted_nodes_ids = sort_nodes_subset(bpmn_graph, nodes_order)
+
+    for node_id in sorted_nodes_ids:
+        grid.remove(node_id)
+    for node_id in sorted_nodes_ids:
+        (row, col) = get_free_grid_position(bpmn_graph, grid, node_id)
+        grid.insert(row, col, node_id)
+    set_coordinates_for_nodes(bpmn_graph, grid, sorted_nodes_ids)
+    if grid.obstacles is not None:
+        for node_id in sorted_nodes_ids:
+            grid.obstacles.set_node_bounds(node_id, router.get_node_bounds(bpmn_graph.get_node_by_id(node_id)[1]))
+
+    touched_nodes_ids = set(sorted_nodes_ids)
+    for (source_id, target_id, _) in removed_flows or []:
+        touched_nodes_ids.update([source_id, target_id])
+    touched_nodes_ids.difference_update(removed_nodes or [])
+    touched_flows_ids = set(added_flows_ids)
+    for node_id in touched_nodes_ids:
+        node = bpmn_graph.get_node_by_id(node_id)[1]
+        touched_flows_ids.update(node[consts.Consts.incoming_flow])
+        touched_flows_ids.update(node[consts.Consts.outgoing_flow])
+    # flows sharing source or target share channels with rerouted flows
+    flows_ids = set(touched_flows_ids)
+    for flow_id in touched_flows_ids:
+        flow = bpmn_graph.get_flow_by_id(flow_id)
+        flows_ids.update(bpmn_graph.get_node_by_id(flow[0])[1][consts.Consts.outgoing_flow])
+        flows_ids.update(bpmn_graph.get_node_by_id(flow[1])[1][consts.Consts.incoming_flow])
+    grid.obstacles = router.route_flows(bpmn_graph, [bpmn_graph.get_flow_by_id(flow_id)
+                                                     for flow_id in sorted(flows_ids)], grid.obstacles)
+    return sorted_nodes_ids
+
+
+def sort_nodes_subset(bpmn_graph, nodes_ids):
+    """
+    Sorts given nodes, so that every node is preceded by its predecessors among given nodes. Nodes on cycles
+    are kept in given order.
+
+    :param bpmn_graph: an instance of BPMNDiagramGraph class,
+    :param nodes_ids: list of IDs of nodes.
+    :return: sorted list of IDs of nodes.
+    """
+    nodes_set = set(nodes_ids)
+    in_degree = dict((node_id, 0) for node_id in nodes_ids)
+    successors = dict((node_id, []) for node_id in nodes_ids)
+    for node_id in nodes_ids:
+        for flow_id in bpmn_graph.get_node_by_id(node_id)[1][consts.Consts.incoming_flow]:
+            source_id = bpmn_graph.get_flow_by_id(flow_id)[0]
+            if source_id in nodes_set and source_id != node_id:
+                in_degree[node_id] += 1
+                successors[source_id].append(node_id)
+    sorted_nodes_ids = []
+    sorted_nodes_set = set()
+    while len(sorted_nodes_ids) < len(nodes_ids):
+        ready_nodes_ids = [node_id for node_id in nodes_ids if node_id not in sorted_nodes_set
+                           and in_degree[node_id] == 0]
+        if not ready_nodes_ids:
+            # cycle, the first remaining node is taken
+            ready_nodes_ids = [next(node_id for node_id in nodes_ids if node_id not in sorted_nodes_set)]
+        for node_id in ready_nodes_ids:
+            sorted_nodes_ids.append(node_id)
+            sorted_nodes_set.add(node_id)
+            for successor_id in successors[node_id]:
+                in_degree[successor_id] -= 1
+    return sorted_nodes_ids
+
+
+def get_free_grid_position(bpmn_graph, grid, node_id):
+    """
+    Computes position of node with rules of place_node_in_grid - node without placed predecessors is put in a new row,
+    other nodes right from their rightmost predecessor. If cell is occupied, the nearest free cell in the same column
+    is returned.
+
+    :param bpmn_graph: an instance of BPMNDiagramGraph class,
+    :param grid: an instance of Grid class,
+    :param node_id: ID of node.
+    :return: a tuple (row, column).
+    """
+    predecessors_cells = []
+    for flow_id in bpmn_graph.get_node_by_id(node_id)[1][consts.Consts.incoming_flow]:
+        grid_cell = grid.get_cell(bpmn_graph.get_flow_by_id(flow_id)[0])
+        if grid_cell is not None:
+            predecessors_cells.append(grid_cell)
+    if not predecessors_cells:
+        last_row = grid.get_last_row()
+        row = consts.Consts.grid_column_width if last_row is None else last_row + consts.Consts.grid_column_width
+        return row, 1
+    col = max(grid_cell.col for grid_cell in predecessors_cells) + 1
+    row = sum(grid_cell.row for grid_cell in predecessors_cells) // len(predecessors_cells)
+    # row numbers of cells are multiples of grid_column_width
+    row -= row % consts.Consts.grid_column_width
+    return grid.find_free_row(row, col), col
 
 
 def generate_elements_clasification(bpmn_graph):
     """
-    :param bpmn_graph:
-    :return:
+    Classifies diagram elements. Node labels are taken from classification cached by diagram
+    (see BpmnDiagramGraph.get_classified_nodes), all flows are classified as "Flow".
+
+    :param bpmn_graph: an instance of BPMNDiagramGraph class.
+    :return: a tuple of two lists - nodes with classification and flows with classification.
     """
-    nodes_classification = []
     node_param_name = "node"
     flow_param_name = "flow"
     classification_param_name = "classification"
 
-    classification_element = "Element"
-    classification_join = "Join"
-    classification_split = "Split"
-    classification_start_event = "Start Event"
-    classification_end_event = "End Event"
-
-    task_list = bpmn_graph.get_nodes(consts.Consts.task)
-    for element in task_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    subprocess_list = bpmn_graph.get_nodes(consts.Consts.subprocess)
-    for element in subprocess_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    complex_gateway_list = bpmn_graph.get_nodes(consts.Consts.complex_gateway)
-    for element in complex_gateway_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    event_based_gateway_list = bpmn_graph.get_nodes(consts.Consts.event_based_gateway)
-    for element in event_based_gateway_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    inclusive_gateway_list = bpmn_graph.get_nodes(consts.Consts.inclusive_gateway)
-    for element in inclusive_gateway_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    exclusive_gateway_list = bpmn_graph.get_nodes(consts.Consts.exclusive_gateway)
-    for element in exclusive_gateway_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    parallel_gateway_list = bpmn_graph.get_nodes(consts.Consts.parallel_gateway)
-    for element in parallel_gateway_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    start_event_list = bpmn_graph.get_nodes(consts.Consts.start_event)
-    for element in start_event_list:
-        tmp = [classification_element, classification_start_event]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    intermediate_catch_event_list = bpmn_graph.get_nodes(consts.Consts.intermediate_catch_event)
-    for element in intermediate_catch_event_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    end_event_list = bpmn_graph.get_nodes(consts.Consts.end_event)
-    for element in end_event_list:
-        tmp = [classification_element, classification_end_event]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
-
-    intermediate_throw_event_list = bpmn_graph.get_nodes(consts.Consts.intermediate_throw_event)
-    for element in intermediate_throw_event_list:
-        tmp = [classification_element]
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            tmp.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            tmp.append(classification_split)
-        nodes_classification += [{node_param_name: element, classification_param_name: tmp}]
+    nodes_classification = [{node_param_name: element, classification_param_name: list(classification_labels)}
+                            for (element, classification_labels) in bpmn_graph.get_classified_nodes()]
 
     flows_classification = []
     flows_list = bpmn_graph.get_flows()
@@ -144,110 +198,170 @@ def generate_elements_clasification(bpmn_graph):
 
 def topological_sort(bpmn_graph, nodes_with_classification):
     """
-    :return:
+    Sorts nodes topologically with Kahn's algorithm. Flows closing cycles (back edges found by depth-first search
+    started from nodes without incoming flows) are returned as backward flows and are ignored while sorting.
+    Nodes, that are left without incoming flows in the same round, are taken in reverse order of input list.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param nodes_with_classification: list of nodes with classification returned by generate_elements_clasification.
+    :return: a tuple, where first value is a sorted list of nodes with classification and second value is a list
+        of backward flows.
     """
     node_param_name = "node"
-    classification_param_name = "classification"
 
-    tmp_nodes_with_classification = copy.deepcopy(nodes_with_classification)
+    nodes_ids = [node_with_classification[node_param_name][0] for node_with_classification in nodes_with_classification]
+    node_by_id = dict(zip(nodes_ids, nodes_with_classification))
+    node_positions = dict((node_id, position) for (position, node_id) in enumerate(nodes_ids))
+
+    outgoing_flows = {}
+    for node_id in nodes_ids:
+        outgoing_flows[node_id] = []
+        for flow_id in node_by_id[node_id][node_param_name][1][consts.Consts.outgoing_flow]:
+            flow = bpmn_graph.get_flow_by_id(flow_id)
+            target_id = flow[2][consts.Consts.target_ref]
+            if target_id in node_by_id:
+                outgoing_flows[node_id].append((flow, target_id))
+
+    backward_flows = find_backward_flows(nodes_ids, outgoing_flows)
+    backward_flows_ids = set(flow[2][consts.Consts.id] for flow in backward_flows)
+    in_degree = dict.fromkeys(nodes_ids, 0)
+    for node_id in nodes_ids:
+        for (flow, target_id) in outgoing_flows[node_id]:
+            if flow[2][consts.Consts.id] not in backward_flows_ids:
+                in_degree[target_id] += 1
+
     sorted_nodes_with_classification = []
-    no_incoming_flow_nodes = []
-    backward_flows = []
-
-    while tmp_nodes_with_classification:
-        for node_with_classification in tmp_nodes_with_classification:
-            incoming_list = node_with_classification[node_param_name][1][consts.Consts.incoming_flow]
-            if len(incoming_list) == 0:
-                no_incoming_flow_nodes.append(node_with_classification)
-        if len(no_incoming_flow_nodes) > 0:
-            while len(no_incoming_flow_nodes) > 0:
-                node_with_classification = no_incoming_flow_nodes.pop()
-                tmp_nodes_with_classification.remove(node_with_classification)
-                sorted_nodes_with_classification \
-                    .append(next(tmp_node for tmp_node in nodes_with_classification
-                                 if tmp_node[node_param_name][0] == node_with_classification[node_param_name][0]))
-
-                outgoing_list = list(node_with_classification[node_param_name][1][consts.Consts.outgoing_flow])
-                tmp_outgoing_list = list(outgoing_list)
-
-                for flow_id in tmp_outgoing_list:
-                    '''
-                    - Remove the outgoing flow for source flow node (the one without incoming flows)
-                    - Get the target node
-                    - Remove the incoming flow for target flow node
-                    '''
-                    outgoing_list.remove(flow_id)
-                    node_with_classification[node_param_name][1][consts.Consts.outgoing_flow].remove(flow_id)
-
-                    flow = bpmn_graph.get_flow_by_id(flow_id)
-                    target_id = flow[2][consts.Consts.target_ref]
-                    target = next(tmp_node[node_param_name]
-                                  for tmp_node in tmp_nodes_with_classification
-                                  if tmp_node[node_param_name][0] == target_id)
-                    target[1][consts.Consts.incoming_flow].remove(flow_id)
-        else:
-            for node_with_classification in tmp_nodes_with_classification:
-                if "Join" in node_with_classification[classification_param_name]:
-                    incoming_list = list(node_with_classification[node_param_name][1][consts.Consts.incoming_flow])
-                    tmp_incoming_list = list(incoming_list)
-                    for flow_id in tmp_incoming_list:
-                        incoming_list.remove(flow_id)
-
-                        flow = bpmn_graph.get_flow_by_id(flow_id)
-
-                        source_id = flow[2][consts.Consts.source_ref]
-                        source = next(tmp_node[node_param_name]
-                                      for tmp_node in tmp_nodes_with_classification
-                                      if tmp_node[node_param_name][0] == source_id)
-                        source[1][consts.Consts.outgoing_flow].remove(flow_id)
-
-                        target_id = flow[2][consts.Consts.target_ref]
-                        target = next(tmp_node[node_param_name]
-                                      for tmp_node in tmp_nodes_with_classification
-                                      if tmp_node[node_param_name][0] == target_id)
-                        target[1][consts.Consts.incoming_flow].remove(flow_id)
-                        backward_flows.append(flow)
+    no_incoming_flow_nodes = [node_id for node_id in nodes_ids if in_degree[node_id] == 0]
+    while no_incoming_flow_nodes:
+        next_no_incoming_flow_nodes = []
+        for node_id in reversed(no_incoming_flow_nodes):
+            sorted_nodes_with_classification.append(node_by_id[node_id])
+            for (flow, target_id) in outgoing_flows[node_id]:
+                if flow[2][consts.Consts.id] not in backward_flows_ids:
+                    in_degree[target_id] -= 1
+                    if in_degree[target_id] == 0:
+                        next_no_incoming_flow_nodes.append(target_id)
+        no_incoming_flow_nodes = sorted(next_no_incoming_flow_nodes, key=node_positions.get)
     return sorted_nodes_with_classification, backward_flows
 
 
+def find_backward_flows(nodes_ids, outgoing_flows):
+    """
+    Finds flows closing cycles (back edges) with iterative depth-first search. Search starts from nodes without
+    incoming flows, then from remaining unvisited nodes, in order of nodes_ids list. Outgoing flows are visited in
+    order of outgoing flows lists.
+
+    :param nodes_ids: list of node IDs,
+    :param outgoing_flows: dictionary, that maps node ID to list of pairs (flow, target node ID).
+    :return: list of backward flows.
+    """
+    return layered_layouter.find_back_edges(nodes_ids, outgoing_flows)
+
+
 def grid_layout(bpmn_graph, sorted_nodes_with_classification):
     """
 
     :param sorted_nodes_with_classification:
     :param bpmn_graph:
-    :return:
+    :return: an instance of Grid class.
     """
-    tmp_nodes_with_classification = list(sorted_nodes_with_classification)
+    node_param_name = "node"
+
+    node_positions = dict((node_with_classification[node_param_name][0], position)
+                          for (position, node_with_classification) in enumerate(sorted_nodes_with_classification))
+    placed_nodes = set()
 
     last_row = consts.Consts.grid_column_width
     last_col = 1
-    grid = []
-    while tmp_nodes_with_classification:
-        node_with_classification = tmp_nodes_with_classification.pop(0)
-        (grid, last_row, last_col) = place_element_in_grid(node_with_classification, grid, last_row, last_col,
-                                                           bpmn_graph, tmp_nodes_with_classification)
+    grid = grid_class.Grid()
+    for node_with_classification in sorted_nodes_with_classification:
+        if node_with_classification[node_param_name][0] not in placed_nodes:
+            (grid, last_row, last_col) = place_element_in_grid(node_with_classification, grid, last_row, last_col,
+                                                               bpmn_graph, sorted_nodes_with_classification,
+                                                               node_positions, placed_nodes)
     return grid
 
 
 def place_element_in_grid(node_with_classification, grid, last_row, last_col, bpmn_graph, nodes_with_classification,
-                          enforced_row_num=None):
+                          node_positions, placed_nodes, enforced_row_num=None):
+    """
+    Places node in grid. If node is a split, its successors, that are not placed yet, are placed above and below it
+    (successors of splits among them are processed in the same way). Nodes waiting for placement are kept
+    on explicit stack, so nesting of splits is not limited by recursion depth.
+
+    :param node_with_classification:
+    :param grid: an instance of Grid class,
+    :param last_row:
+    :param last_col:
+    :param bpmn_graph:
+    :param nodes_with_classification: sorted list of nodes with classification,
+    :param node_positions: dictionary, that maps node ID to its position on nodes_with_classification list,
+    :param placed_nodes: set of IDs of nodes already placed in grid, updated with placed nodes,
+    :param enforced_row_num:
+    :return: a tuple of grid, last row number and last column number.
     """
+    node_param_name = "node"
+    classification_param_name = "classification"
+
+    nodes_to_place = [(node_with_classification, enforced_row_num)]
+    while nodes_to_place:
+        (node_with_classification, enforced_row_num) = nodes_to_place.pop()
+        node_id = node_with_classification[node_param_name][0]
+        if node_id in placed_nodes:
+            continue
+        placed_nodes.add(node_id)
+        (last_row, current_element_row) = place_node_in_grid(node_with_classification, grid, last_row, last_col,
+                                                             bpmn_graph, enforced_row_num)
+
+        if "Split" in node_with_classification[classification_param_name]:
+            outgoing_flows = node_with_classification[node_param_name][1][consts.Consts.outgoing_flow]
+            successors_id_set = set()
+            for flow_id in outgoing_flows:
+                flow = bpmn_graph.get_flow_by_id(flow_id)
+                successors_id_set.add(flow[2][consts.Consts.target_ref])
+            successor_node_list = [nodes_with_classification[position] for position in
+                                   sorted(node_positions[successor_id] for successor_id in successors_id_set
+                                          if successor_id in node_positions and successor_id not in placed_nodes)]
+            num_of_successors = len(successor_node_list)
+            centre = (num_of_successors // 2)
+
+            successors_rows = []
+            for index in range(0, centre):
+                # place element above split
+                successors_rows.append(current_element_row + (index + 1) * consts.Consts.grid_column_width)
+            if num_of_successors % 2 != 0:
+                # if number of successors is odd, put the middle one in the same row as split
+                successors_rows.append(current_element_row)
+                for index in range(centre + 1, num_of_successors):
+                    # place element below split
+                    successors_rows.append(current_element_row - (index - centre) * consts.Consts.grid_column_width)
+            else:
+                for index in range(centre, num_of_successors):
+                    # place element below split
+                    successors_rows.append(current_element_row
+                                           - (index - centre + 1) * consts.Consts.grid_column_width)
+            # first successor (with its own successors) is placed first
+            nodes_to_place.extend(reversed(list(zip(successor_node_list, successors_rows))))
+    return grid, last_row, last_col
+
+
+def place_node_in_grid(node_with_classification, grid, last_row, last_col, bpmn_graph, enforced_row_num=None):
+    """
+    Places single node in grid.
 
     :param node_with_classification:
-    :param grid:
+    :param grid: an instance of Grid class,
     :param last_row:
     :param last_col:
     :param bpmn_graph:
-    :param nodes_with_classification:
     :param enforced_row_num:
-    :return:
+    :return: a tuple of last row number and row number computed for node (used to place successors of split).
     """
     node_param_name = "node"
     classification_param_name = "classification"
 
     node_id = node_with_classification[node_param_name][0]
     incoming_flows = node_with_classification[node_param_name][1][consts.Consts.incoming_flow]
-    outgoing_flows = node_with_classification[node_param_name][1][consts.Consts.outgoing_flow]
 
     if len(incoming_flows) == 0:
         # if node has no incoming flow, put it in new row
@@ -263,7 +377,7 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
         flow_id = incoming_flows[0]
         flow = bpmn_graph.get_flow_by_id(flow_id)
         predecessor_id = flow[2][consts.Consts.source_ref]
-        predecessor_cell = next(grid_cell for grid_cell in grid if grid_cell.node_id == predecessor_id)
+        predecessor_cell = grid.get_cell(predecessor_id)
         # insert into cell right from predecessor - no need to insert new column or row
         current_element_col = predecessor_cell.col + 1
         current_element_row = predecessor_cell.row
@@ -283,8 +397,9 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
         max_col_num = 0
         row_num_sum = 0
         # TODO try to implement corresponding split finding
-        for grid_cell in grid:
-            if grid_cell.node_id in predecessors_id_list:
+        for predecessor_id in set(predecessors_id_list):
+            grid_cell = grid.get_cell(predecessor_id)
+            if grid_cell is not None:
                 row_num_sum += grid_cell.row
                 if grid_cell.col > max_col_num:
                     max_col_num = grid_cell.col
@@ -294,134 +409,46 @@ def place_element_in_grid(node_with_classification, grid, last_row, last_col, bp
             insert_into_grid(grid, enforced_row_num, current_element_col, node_id)
         else:
             insert_into_grid(grid, current_element_row, current_element_col, node_id)
-
-    if "Split" in node_with_classification[classification_param_name]:
-        successors_id_list = []
-        for flow_id in outgoing_flows:
-            flow = bpmn_graph.get_flow_by_id(flow_id)
-            successors_id_list.append(flow[2][consts.Consts.target_ref])
-        num_of_successors = len(successors_id_list)
-        successor_node_list = [successor_node for successor_node in nodes_with_classification
-                                      if successor_node[node_param_name][0] in successors_id_list]
-
-        if num_of_successors % 2 != 0:
-            # if number of successors is even, put one half over the split, second half below
-            # proceed with first half
-            centre = (num_of_successors // 2)
-            for index in range(0, centre):
-                # place element above split
-                successor_node = successor_node_list[index]
-                (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row + ((index + 1) * consts.Consts.grid_column_width))
-
-                nodes_with_classification.remove(successor_node)
-
-            successor_node = successor_node_list[centre]
-            (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                               bpmn_graph,nodes_with_classification, current_element_row)
-            nodes_with_classification.remove(successor_node)
-            for index in range(centre + 1, num_of_successors):
-                # place element below split
-                successor_node = successor_node_list[index]
-                (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row - ((index - centre) * consts.Consts.grid_column_width))
-
-                nodes_with_classification.remove(successor_node)
-        else:
-            centre = (num_of_successors // 2)
-            for index in range(0, centre):
-                # place element above split
-                successor_node = successor_node_list[index]
-                (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row + (index + 1) * consts.Consts.grid_column_width)
-
-                nodes_with_classification.remove(successor_node)
-
-
-            for index in range(centre, num_of_successors):
-                # place element below split
-                successor_node = successor_node_list[index]
-                (grid, last_row, last_col) = place_element_in_grid(successor_node, grid, last_row, last_col,
-                                                                   bpmn_graph,nodes_with_classification, current_element_row - ((index - centre + 1) * consts.Consts.grid_column_width))
-
-                nodes_with_classification.remove(successor_node)
-
-
-    return grid, last_row, last_col
+    return last_row, current_element_row
 
 
 def insert_into_grid(grid, row, col, node_id):
     """
 
-    :param grid:
+    :param grid: an instance of Grid class,
     :param row:
     :param col:
     :param node_id:
     """
     # if row <= 0:
     #     row = 1
-    occupied_cell = None
-    try:
-        occupied_cell = next(grid_cell for grid_cell in grid if grid_cell.row == row and grid_cell.col == col)
-    except StopIteration:
-        pass
-    # if cell is already occupied, insert new row
-    if occupied_cell:
-        for grid_cell in grid:
-            if grid_cell.row >= row:
-                grid_cell.row += consts.Consts.width
-    grid.append(cell_class.GridCell(row, col, node_id))
-
-
-def set_coordinates_for_nodes(bpmn_graph, grid):
+    # if cell is already occupied, grid inserts new row
+    grid.insert(row, col, node_id)
+
+
+def set_coordinates_for_nodes(bpmn_graph, grid, nodes_ids=None):
     """
 
     :param bpmn_graph:
-    :param grid:
+    :param grid: an instance of Grid class,
+    :param nodes_ids: list of IDs of nodes, that get coordinates; by default all nodes.
     """
-
-    nodes = bpmn_graph.get_nodes()
+    if nodes_ids is None:
+        nodes = bpmn_graph.get_nodes()
+    else:
+        nodes = [bpmn_graph.get_node_by_id(node_id) for node_id in nodes_ids]
     for node in nodes:
-        cell = next(grid_cell for grid_cell in grid if grid_cell.node_id == node[0])
-        node[1][consts.Consts.x] = str(cell.col * 150 + 50)
-        node[1][consts.Consts.y] = str(cell.row * 100 + 50)
+        cell = grid.get_cell(node[0])
+        node[1][consts.Consts.x] = float(cell.col * 150 + 50)
+        node[1][consts.Consts.y] = float(cell.row * 100 + 50)
 
 
 def set_flows_waypoints(bpmn_graph):
     """
+    Computes orthogonal waypoints of flows, that connect sides of nodes and lead around other nodes
+    (see bpmn_diagram_router module).
 
-    :param bpmn_graph:
+    :param bpmn_graph: an instance of BPMNDiagramGraph class.
+    :return: an instance of ObstaclesIndex class with bounds of nodes.
     """
-    # TODO hardcoded node center, better compute it with x,y coordinates and height/width
-    # TODO get rid of string cast
-    flows = bpmn_graph.get_flows()
-    for flow in flows:
-        source_node = bpmn_graph.get_node_by_id(flow[2][consts.Consts.source_ref])
-        target_node = bpmn_graph.get_node_by_id(flow[2][consts.Consts.target_ref])
-        source_type = source_node[1][consts.Consts.type]
-        target_type = target_node[1][consts.Consts.type]
-        if source_type == consts.Consts.parallel_gateway or source_type == consts.Consts.inclusive_gateway or source_type == consts.Consts.exclusive_gateway:
-            flow[2][consts.Consts.waypoints] = [(str(int(source_node[1][consts.Consts.x]) + 50),
-                                                 str(int(source_node[1][consts.Consts.y]) + 50)),
-                                                (str(int(source_node[1][consts.Consts.x]) + 50),
-                                                 str(int(target_node[1][consts.Consts.y]) + 50)),
-                                                (str(int(target_node[1][consts.Consts.x])),
-                                                 str(int(target_node[1][consts.Consts.y]) + 50))]
-        elif source_node[1][consts.Consts.y] == target_node[1][consts.Consts.y]:
-            flow[2][consts.Consts.waypoints] = [(str(int(source_node[1][consts.Consts.x]) + 50),
-                                                 str(int(source_node[1][consts.Consts.y]) + 50)),
-                                                (str(int(target_node[1][consts.Consts.x])),
-                                                 str(int(target_node[1][consts.Consts.y]) + 50))]
-
-        elif target_type == consts.Consts.parallel_gateway or target_type == consts.Consts.inclusive_gateway or target_type == consts.Consts.exclusive_gateway:
-            flow[2][consts.Consts.waypoints] = [(str(int(source_node[1][consts.Consts.x]) + 50),
-                                                 str(int(source_node[1][consts.Consts.y]) + 50)),
-                                                (str(int(target_node[1][consts.Consts.x]) + 50),
-                                                 str(int(source_node[1][consts.Consts.y]) + 50)),
-                                                (str(int(target_node[1][consts.Consts.x]) + 50),
-                                                 str(int(target_node[1][consts.Consts.y])))]
-        else:
-            flow[2][consts.Consts.waypoints] = [(str(int(source_node[1][consts.Consts.x]) + 50),
-                                                 str(int(source_node[1][consts.Consts.y]) + 50)),
-                                                (str(int(target_node[1][consts.Consts.x])),
-                                                 str(int(target_node[1][consts.Consts.y]) + 50))]
+    return router.route_flows(bpmn_graph)
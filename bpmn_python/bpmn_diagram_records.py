@@ -0,0 +1,144 @@
+# coding=utf-8
+"""
+Package provides compact attribute records for nodes and edges of BPMN diagram graph
+"""
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+import networkx as nx
+
+import bpmn_python.bpmn_python_consts as consts
+
+
+class ElementRecord(MutableMapping):
+    """
+    Class ElementRecord is a base class of attribute records, that can be used instead of dictionaries by NetworkX
+    graph. Attributes listed in 'fields' tuple are kept in __slots__ of record instance, any other attribute is kept
+    in additional dictionary, created when first such attribute is set.
+    Record implements full dictionary interface (it is a MutableMapping), so it can be used by code written
+    for dictionary attributes.
+    """
+    __slots__ = ("_extra",)
+    fields = ()
+    fields_set = frozenset()
+
+    def __init__(self, *args, **kwargs):
+        """
+        Default constructor, accepts the same arguments as dict constructor.
+        """
+        self._extra = None
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        if key in self.fields_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self.fields_set:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self.fields_set:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        else:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+
+    def __contains__(self, key):
+        if key in self.fields_set:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key in self.fields:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        length = sum(1 for key in self.fields if hasattr(self, key))
+        if self._extra is not None:
+            length += len(self._extra)
+        return length
+
+    def get(self, key, default=None):
+        if key in self.fields_set:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def copy(self):
+        """
+        Returns a shallow copy of record.
+        """
+        return type(self)(self)
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state):
+        self._extra = None
+        self.update(state)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class NodeRecord(ElementRecord):
+    """
+    Attribute record of graph node (flow node or participant).
+    """
+    fields = (consts.Consts.id, consts.Consts.type, consts.Consts.node_name, consts.Consts.process,
+              consts.Consts.incoming_flow, consts.Consts.outgoing_flow, consts.Consts.x, consts.Consts.y,
+              consts.Consts.width, consts.Consts.height, consts.Consts.default, consts.Consts.gateway_direction,
+              consts.Consts.instantiate, consts.Consts.event_gateway_type, consts.Consts.parallel_multiple,
+              consts.Consts.is_interrupting, consts.Consts.cancel_activity, consts.Consts.attached_to_ref,
+              consts.Consts.event_definitions, consts.Consts.is_collection, consts.Consts.triggered_by_event,
+              consts.Consts.is_expanded, consts.Consts.node_ids)
+    fields_set = frozenset(fields)
+    __slots__ = fields
+
+
+class FlowRecord(ElementRecord):
+    """
+    Attribute record of graph edge (sequence flow or message flow).
+    """
+    fields = (consts.Consts.id, consts.Consts.name, consts.Consts.process, consts.Consts.source_ref,
+              consts.Consts.target_ref, consts.Consts.waypoints, consts.Consts.condition_expression)
+    fields_set = frozenset(fields)
+    __slots__ = fields
+
+
+class CompactGraph(nx.Graph):
+    """
+    NetworkX graph, that keeps attributes of nodes and edges in NodeRecord and FlowRecord instances.
+    """
+    node_attr_dict_factory = NodeRecord
+    edge_attr_dict_factory = FlowRecord
+
+
+class CompactMultiDiGraph(nx.MultiDiGraph):
+    """
+    NetworkX directed multigraph, that keeps attributes of nodes and edges in NodeRecord and FlowRecord instances.
+    """
+    node_attr_dict_factory = NodeRecord
+    edge_attr_dict_factory = FlowRecord
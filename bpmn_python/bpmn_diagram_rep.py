@@ -3,12 +3,18 @@
 Package with BPMNDiagramGraph - graph representation of BPMN diagram
 """
 import uuid
+from collections import OrderedDict
 
 import networkx as nx
 
 import bpmn_python.bpmn_diagram_exception as bpmn_exception
 import bpmn_python.bpmn_diagram_export as bpmn_export
 import bpmn_python.bpmn_diagram_import as bpmn_import
+import bpmn_python.bpmn_diagram_records as bpmn_records
+import bpmn_python.bpmn_diagram_snapshot as bpmn_snapshot
+import bpmn_python.bpmn_diagram_streaming_export as bpmn_streaming_export
+import bpmn_python.bpmn_diagram_streaming_import as bpmn_streaming_import
+import bpmn_python.bpmn_import_utils as utils
 import bpmn_python.bpmn_process_csv_export as bpmn_csv_export
 import bpmn_python.bpmn_process_csv_import as bpmn_csv_import
 import bpmn_python.bpmn_python_consts as consts
@@ -22,10 +28,16 @@ class BpmnDiagramGraph(object):
     Fields:
 
     * diagram_graph - networkx.Graph object, stores elements of BPMN diagram as nodes. Each edge of graph represents
-        sequenceFlow element. Edges are identified by IDs of nodes connected by edge. IDs are passed as edge parameters,
+        sequenceFlow element. Edges are identified by IDs of nodes connected by edge. IDs are passed as edge parameters.
+        If diagram was created with multigraph flag, diagram_graph is a networkx.MultiDiGraph object. Edges are
+        directed from source to target node and keyed by flow ID, so flows connecting the same pair of nodes
+        are not merged. If diagram was created with compact flag, attributes of nodes and edges are kept in
+        NodeRecord and FlowRecord objects (see bpmn_diagram_records module) instead of dictionaries,
     * sequence_flows - dictionary (associative list) of sequence flows existing in diagram.
         Key attribute is sequenceFlow ID, value is a dictionary consisting three key-value pairs: "name" (sequence flow
-        name), "sourceRef" (ID of node, that is a flow source) and "targetRef" (ID of node, that is a flow target),
+        name), "sourceRef" (ID of node, that is a flow source) and "targetRef" (ID of node, that is a flow target).
+        Together with "messageFlows" it is used as a flow ID index, so every method that adds or removes an edge
+        must update it as well,
     * collaboration - a dictionary that contains two dictionaries:
         * "messageFlows" - dictionary (associative list) of message flows existing in diagram. Key attribute is
             messageFlow ID, value is a dictionary consisting three key-value pairs: "name" (message flow name),
@@ -37,50 +49,167 @@ class BpmnDiagramGraph(object):
 
     * diagram_attributes - dictionary that contains BPMN diagram element attributes,
     * plane_attributes - dictionary that contains BPMN plane element attributes.
+
+    Querying methods use secondary indexes of nodes (by type and by process) and flows (by process). Indexes are
+    updated by diagram creating methods and rebuilt by importers. Code that modifies diagram_graph directly should
+    call rebuild_indexes method afterwards. Classification of nodes (see get_classified_nodes) is cached
+    and invalidated together with indexes.
     """
 
     # String "constants" used in multiple places
     id_prefix = "id"
     bpmndi_namespace = "bpmndi:"
 
-    def __init__(self):
+    def __init__(self, multigraph=False, compact=False):
         """
         Default constructor, initializes object fields with new instances.
+
+        :param multigraph: boolean flag. If set to True, diagram_graph is a directed multigraph (nx.MultiDiGraph)
+            with flow ID as edge key. Default value - False (nx.Graph),
+        :param compact: boolean flag. If set to True, attributes of nodes and edges are kept in records with
+            __slots__, which need less memory than dictionaries. Records support dictionary interface.
+            Default value - False.
         """
-        self.diagram_graph = nx.Graph()
+        if compact:
+            self.diagram_graph = bpmn_records.CompactMultiDiGraph() if multigraph else bpmn_records.CompactGraph()
+        else:
+            self.diagram_graph = nx.MultiDiGraph() if multigraph else nx.Graph()
         self.sequence_flows = {}
         self.process_elements = {}
         self.diagram_attributes = {}
         self.plane_attributes = {}
         self.collaboration = {}
+        self.__node_ids_by_type = {}
+        self.__node_ids_by_process = {}
+        self.__flow_ids_by_process = {}
+        self.__classified_nodes = None
+        self.__nodes_classification = None
+
+    def rebuild_indexes(self):
+        """
+        Rebuilds indexes of nodes and flows used by querying methods. Must be called after diagram_graph was
+        modified without use of diagram creating methods (e.g. by importers).
+        """
+        self.__node_ids_by_type = {}
+        self.__node_ids_by_process = {}
+        self.__flow_ids_by_process = {}
+        self.__invalidate_classification()
+        for node_id, node in self.diagram_graph.nodes(data=True):
+            self.__add_node_to_indexes(node_id, node)
+        for _, _, flow in self.diagram_graph.edges(data=True):
+            self.__add_flow_to_indexes(flow)
+
+    def __invalidate_classification(self):
+        self.__classified_nodes = None
+        self.__nodes_classification = None
+
+    @staticmethod
+    def __add_to_index(index, key, element_id):
+        # IDs are kept in insertion ordered dictionaries, so adding and removing them takes constant time
+        ids = index.get(key)
+        if ids is None:
+            ids = index[key] = OrderedDict()
+        else:
+            ids.pop(element_id, None)
+        ids[element_id] = None
+
+    def __add_node_to_indexes(self, node_id, node):
+        self.__invalidate_classification()
+        BpmnDiagramGraph.__add_to_index(self.__node_ids_by_type, node.get(consts.Consts.type), node_id)
+        BpmnDiagramGraph.__add_to_index(self.__node_ids_by_process, node.get(consts.Consts.process), node_id)
 
-    def load_diagram_from_xml_file(self, filepath):
+    def __remove_node_from_indexes(self, node_id, node):
+        self.__invalidate_classification()
+        for index, key in ((self.__node_ids_by_type, node.get(consts.Consts.type)),
+                           (self.__node_ids_by_process, node.get(consts.Consts.process))):
+            if key in index:
+                index[key].pop(node_id, None)
+
+    def __add_flow_to_indexes(self, flow):
+        self.__invalidate_classification()
+        if consts.Consts.process in flow:
+            BpmnDiagramGraph.__add_to_index(self.__flow_ids_by_process, flow[consts.Consts.process],
+                                            flow[consts.Consts.id])
+
+    def load_diagram_from_xml_file(self, filepath, streaming=False, cache=None):
         """
         Reads an XML file from given filepath and maps it into inner representation of BPMN diagram.
         Returns an instance of BPMNDiagramGraph class.
 
-        :param filepath: string with output filepath.
-        """
-
-        bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml(filepath, self)
+        :param filepath: string with output filepath,
+        :param streaming: boolean flag. If set to True, file is read in a single pass with ElementTree iterparse
+            (BpmnDiagramGraphStreamingImport), which keeps memory usage low for large documents. Default value - False
+            (minidom based BpmnDiagramGraphImport),
+        :param cache: an instance of BpmnDiagramImportCache class or None. If cache is given, diagram imported
+            from a file with the same content is loaded from cached snapshot. Default value - None.
+        """
+        if cache is not None:
+            cache.load_diagram_from_xml_file(filepath, self, streaming)
+        elif streaming:
+            bpmn_streaming_import.BpmnDiagramGraphStreamingImport.load_diagram_from_xml(filepath, self)
+        else:
+            bpmn_import.BpmnDiagramGraphImport.load_diagram_from_xml(filepath, self)
 
-    def export_xml_file(self, directory, filename):
+    def export_xml_file(self, directory, filename, streaming=False):
         """
         Exports diagram inner graph to BPMN 2.0 XML file (with Diagram Interchange data).
 
         :param directory: strings representing output directory,
-        :param filename: string representing output file name.
+        :param filename: string representing output file name,
+        :param streaming: boolean flag. If set to True, file is written in a single pass with XmlStreamWriter
+            (BpmnDiagramGraphStreamingExport), without building ElementTree of the whole document. Default value - False
+            (ElementTree based BpmnDiagramGraphExport).
         """
-        bpmn_export.BpmnDiagramGraphExport.export_xml_file(directory, filename, self)
+        if streaming:
+            bpmn_streaming_export.BpmnDiagramGraphStreamingExport.export_xml_file(directory, filename, self)
+        else:
+            bpmn_export.BpmnDiagramGraphExport.export_xml_file(directory, filename, self)
 
-    def export_xml_file_no_di(self, directory, filename):
+    def export_xml_file_no_di(self, directory, filename, streaming=False):
         """
         Exports diagram inner graph to BPMN 2.0 XML file (without Diagram Interchange data).
 
         :param directory: strings representing output directory,
-        :param filename: string representing output file name.
+        :param filename: string representing output file name,
+        :param streaming: boolean flag. If set to True, file is written in a single pass with XmlStreamWriter
+            (BpmnDiagramGraphStreamingExport). Default value - False (ElementTree based BpmnDiagramGraphExport).
+        """
+        if streaming:
+            bpmn_streaming_export.BpmnDiagramGraphStreamingExport.export_xml_file(directory, filename, self,
+                                                                                  with_di=False)
+        else:
+            bpmn_export.BpmnDiagramGraphExport.export_xml_file_no_di(directory, filename, self)
+
+    def write_xml(self, output_file, with_di=True, indent="  "):
+        """
+        Writes diagram inner graph as BPMN 2.0 XML document to file object, in a single pass with XmlStreamWriter
+        (BpmnDiagramGraphStreamingExport).
+
+        :param output_file: file object opened for writing (binary or text),
+        :param with_di: boolean flag. If set to False, Diagram Interchange data is not written. Default value - True,
+        :param indent: string used for one level of indentation or None, if output should not be indented.
         """
-        bpmn_export.BpmnDiagramGraphExport.export_xml_file_no_di(directory, filename, self)
+        bpmn_streaming_export.BpmnDiagramGraphStreamingExport.write_xml(output_file, self, with_di, indent)
+
+    def save_snapshot(self, filepath):
+        """
+        Saves diagram inner graph to binary snapshot file (see BpmnDiagramGraphSnapshot), which can be loaded back
+        without XML parsing.
+
+        :param filepath: string with output file path.
+        """
+        bpmn_snapshot.BpmnDiagramGraphSnapshot.save_snapshot(filepath, self)
+
+    def load_snapshot(self, filepath, use_mmap=True):
+        """
+        Loads diagram from binary snapshot file, saved with save_snapshot method, into inner representation of BPMN
+        diagram.
+
+        :param filepath: string with snapshot file path,
+        :param use_mmap: boolean flag. If set to True, snapshot file is memory-mapped, otherwise it is read into memory.
+            Default value - True.
+        """
+        bpmn_snapshot.BpmnDiagramGraphSnapshot.load_snapshot(filepath, self, use_mmap)
 
     def load_diagram_from_csv_file(self, filepath):
         """
@@ -109,15 +238,10 @@ class BpmnDiagramGraph(object):
 
         :param node_type: string with valid BPMN XML tag name (e.g. 'task', 'sequenceFlow').
         """
-        tmp_nodes = self.diagram_graph.nodes(True)
         if node_type == "":
-            return tmp_nodes
-        else:
-            nodes = []
-            for node in tmp_nodes:
-                if node[1][consts.Consts.type] == node_type:
-                    nodes.append(node)
-            return nodes
+            return self.diagram_graph.nodes(True)
+        return self.__get_indexed_nodes(self.__node_ids_by_type.get(node_type, OrderedDict()), consts.Consts.type,
+                                        node_type)
 
     def get_nodes_list_by_process_id(self, process_id):
         """
@@ -126,24 +250,34 @@ class BpmnDiagramGraph(object):
 
         :param process_id: string object, representing an ID of parent process element.
         """
-        tmp_nodes = self.diagram_graph.nodes(True)
+        return self.__get_indexed_nodes(self.__node_ids_by_process.get(process_id, OrderedDict()),
+                                        consts.Consts.process, process_id)
+
+    def __get_indexed_nodes(self, node_ids, attribute, value):
+        graph_nodes = self.diagram_graph.node
         nodes = []
-        for node in tmp_nodes:
-            if node[1][consts.Consts.process] == process_id:
-                nodes.append(node)
+        outdated_ids = []
+        for node_id in node_ids:
+            if node_id in graph_nodes and graph_nodes[node_id].get(attribute) == value:
+                nodes.append((node_id, graph_nodes[node_id]))
+            else:
+                outdated_ids.append(node_id)
+        # drop index entries that became outdated after diagram_graph was modified directly
+        for node_id in outdated_ids:
+            del node_ids[node_id]
         return nodes
 
     def get_node_by_id(self, node_id):
         """
         Gets a node with requested ID.
         Returns a tuple, where first value is node ID, second - a dictionary of all node attributes.
+        If there is no node with requested ID, None is returned.
 
         :param node_id: string with ID of node.
         """
-        tmp_nodes = self.diagram_graph.nodes(data=True)
-        for node in tmp_nodes:
-            if node[0] == node_id:
-                return node
+        if self.diagram_graph.has_node(node_id):
+            return node_id, self.diagram_graph.node[node_id]
+        return None
 
     def get_nodes_id_list_by_type(self, node_type):
         """
@@ -152,12 +286,30 @@ class BpmnDiagramGraph(object):
 
         :param node_type: string with valid BPMN XML tag name (e.g. 'task', 'sequenceFlow').
         """
-        tmp_nodes = self.diagram_graph.nodes(data=True)
-        id_list = []
-        for node in tmp_nodes:
-            if node[1][consts.Consts.type] == node_type:
-                id_list.append(node[0])
-        return id_list
+        return [node[0] for node in self.get_nodes(node_type)]
+
+    def get_classified_nodes(self):
+        """
+        Gets nodes with classification labels ("Element", "Start Event", "End Event", "Join", "Split"), computed
+        by BpmnImportUtils.classify_nodes. Result is cached until diagram is modified.
+
+        :return: a list of pairs (node, list of labels). Lists must not be modified.
+        """
+        if self.__classified_nodes is None:
+            self.__classified_nodes = utils.BpmnImportUtils.classify_nodes(self)
+        return self.__classified_nodes
+
+    def get_nodes_classification(self):
+        """
+        Gets classification labels of nodes (see get_classified_nodes). Result is cached until diagram is modified.
+
+        :return: a dictionary of classification labels. Key - node ID. Value - a list of labels. Dictionary and lists
+            must not be modified.
+        """
+        if self.__nodes_classification is None:
+            self.__nodes_classification = dict((element[0], classification_labels)
+                                               for (element, classification_labels) in self.get_classified_nodes())
+        return self.__nodes_classification
 
     def get_flows(self):
         """
@@ -170,27 +322,82 @@ class BpmnDiagramGraph(object):
     def get_flow_by_id(self, flow_id):
         """
         Gets an edge (flow) with requested ID.
-        Returns a tuple, where first value is node ID, second - a dictionary of all node attributes.
+        Returns a tuple, where first value is source node ID, second - target node ID and third - a dictionary of all
+        edge attributes. If there is no flow with requested ID, None is returned.
+
+        Flow is located using 'sequence_flows' and collaboration 'messageFlows' dictionaries, which map flow ID to its
+        sourceRef and targetRef, so lookup time doesn't depend on diagram size.
 
         :param flow_id: string with edge ID.
         """
-        tmp_flows = self.diagram_graph.edges(data=True)
-        for flow in tmp_flows:
-            if flow[2][consts.Consts.id] == flow_id:
-                return flow
+        flow_refs = self.sequence_flows.get(flow_id)
+        if flow_refs is None:
+            flow_refs = self.collaboration.get(consts.Consts.message_flows, {}).get(flow_id)
+        if flow_refs is None:
+            return None
+
+        source_ref = flow_refs[consts.Consts.source_ref]
+        target_ref = flow_refs[consts.Consts.target_ref]
+        flow = utils.BpmnImportUtils.get_flow_edge(self.diagram_graph, flow_id, source_ref, target_ref)
+        if flow is None:
+            return None
+        if flow.get(consts.Consts.id) != flow_id:
+            # two flows connecting the same pair of nodes share one edge, which keeps the last imported flow
+            return None
+        return source_ref, target_ref, flow
+
+    def get_successors(self, node_id):
+        """
+        Gets IDs of nodes that are targets of flows outgoing from node with requested ID. Each ID is returned once.
+        For multigraph it is an adjacency lookup, otherwise targets of flows from node 'outgoing' list are returned.
+
+        :param node_id: string with ID of node.
+        """
+        if self.diagram_graph.is_multigraph():
+            return list(self.diagram_graph.successors(node_id))
+        return self.__get_flows_ends(self.diagram_graph.node[node_id].get(consts.Consts.outgoing_flow, []),
+                                     consts.Consts.target_ref)
+
+    def get_predecessors(self, node_id):
+        """
+        Gets IDs of nodes that are sources of flows incoming to node with requested ID. Each ID is returned once.
+        For multigraph it is an adjacency lookup, otherwise sources of flows from node 'incoming' list are returned.
+
+        :param node_id: string with ID of node.
+        """
+        if self.diagram_graph.is_multigraph():
+            return list(self.diagram_graph.predecessors(node_id))
+        return self.__get_flows_ends(self.diagram_graph.node[node_id].get(consts.Consts.incoming_flow, []),
+                                     consts.Consts.source_ref)
+
+    def __get_flows_ends(self, flow_ids, ref_name):
+        node_ids = []
+        for flow_id in flow_ids:
+            flow = self.get_flow_by_id(flow_id)
+            if flow is not None and flow[2][ref_name] not in node_ids:
+                node_ids.append(flow[2][ref_name])
+        return node_ids
 
     def get_flows_list_by_process_id(self, process_id):
         """
-        Gets an edge (flow) with requested ID.
-        Returns a tuple, where first value is node ID, second - a dictionary of all node attributes.
+        Gets all edges (flows) that belong to process with requested ID.
+        Returns a list of tuples, where first value is source node ID, second - target node ID and third - a dictionary
+        of all edge attributes.
 
         :param process_id: string object, representing an ID of parent process element.
         """
-        tmp_flows = self.diagram_graph.edges(data=True)
         flows = []
-        for flow in tmp_flows:
-            if consts.Consts.process in flow[2] and flow[2][consts.Consts.process] == process_id:
+        flow_ids = self.__flow_ids_by_process.get(process_id, OrderedDict())
+        outdated_ids = []
+        for flow_id in flow_ids:
+            flow = self.get_flow_by_id(flow_id)
+            if flow is not None and flow[2].get(consts.Consts.process) == process_id:
                 flows.append(flow)
+            else:
+                outdated_ids.append(flow_id)
+        # drop index entries that became outdated after diagram_graph was modified directly
+        for flow_id in outdated_ids:
+            del flow_ids[flow_id]
         return flows
 
     # Diagram creating methods
@@ -205,7 +412,9 @@ class BpmnDiagramGraph(object):
         :param diagram_name: string type. Represents a user-defined value of 'BPMNDiagram' element
             attribute 'name'. Default value - empty string.
         """
+        graph_class = type(self.diagram_graph)
         self.__init__()
+        self.diagram_graph = graph_class()
         diagram_id = BpmnDiagramGraph.id_prefix + str(uuid.uuid4())
 
         self.diagram_attributes[consts.Consts.id] = diagram_id
@@ -255,6 +464,8 @@ class BpmnDiagramGraph(object):
         """
         if node_id is None:
             node_id = BpmnDiagramGraph.id_prefix + str(uuid.uuid4())
+        elif self.diagram_graph.has_node(node_id):
+            self.__remove_node_from_indexes(node_id, self.diagram_graph.node[node_id])
         self.diagram_graph.add_node(node_id)
         self.diagram_graph.node[node_id][consts.Consts.id] = node_id
         self.diagram_graph.node[node_id][consts.Consts.type] = node_type
@@ -264,10 +475,11 @@ class BpmnDiagramGraph(object):
         self.diagram_graph.node[node_id][consts.Consts.process] = process_id
 
         # Adding some dummy constant values
-        self.diagram_graph.node[node_id][consts.Consts.width] = "100"
-        self.diagram_graph.node[node_id][consts.Consts.height] = "100"
-        self.diagram_graph.node[node_id][consts.Consts.x] = "100"
-        self.diagram_graph.node[node_id][consts.Consts.y] = "100"
+        self.diagram_graph.node[node_id][consts.Consts.width] = 100.0
+        self.diagram_graph.node[node_id][consts.Consts.height] = 100.0
+        self.diagram_graph.node[node_id][consts.Consts.x] = 100.0
+        self.diagram_graph.node[node_id][consts.Consts.y] = 100.0
+        self.__add_node_to_indexes(node_id, self.diagram_graph.node[node_id])
         return node_id, self.diagram_graph.node[node_id]
 
     def add_task_to_diagram(self, process_id, task_name="", node_id=None):
@@ -516,8 +728,7 @@ class BpmnDiagramGraph(object):
         self.sequence_flows[sequence_flow_id] = {consts.Consts.name: sequence_flow_name,
                                                  consts.Consts.source_ref: source_ref_id,
                                                  consts.Consts.target_ref: target_ref_id}
-        self.diagram_graph.add_edge(source_ref_id, target_ref_id)
-        flow = self.diagram_graph[source_ref_id][target_ref_id]
+        flow = utils.BpmnImportUtils.add_flow_edge(self.diagram_graph, sequence_flow_id, source_ref_id, target_ref_id)
         flow[consts.Consts.id] = sequence_flow_id
         flow[consts.Consts.name] = sequence_flow_name
         flow[consts.Consts.process] = process_id
@@ -534,6 +745,7 @@ class BpmnDiagramGraph(object):
 
         # add source node (source_ref_id) as incoming node to target node (target_ref_id)
         target_node[consts.Consts.incoming_flow].append(sequence_flow_id)
+        self.__add_flow_to_indexes(flow)
         return sequence_flow_id, flow
 
     def get_nodes_positions(self):
@@ -545,5 +757,5 @@ class BpmnDiagramGraph(object):
         nodes = self.get_nodes()
         output = {}
         for node in nodes:
-            output[node[0]] = (float(node[1][consts.Consts.x]), float(node[1][consts.Consts.y]))
+            output[node[0]] = (node[1][consts.Consts.x], node[1][consts.Consts.y])
         return output
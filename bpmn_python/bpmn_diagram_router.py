@@ -0,0 +1,340 @@
+# coding=utf-8
+"""
+Orthogonal router of diagram flows. Bounds of nodes are kept in a spatial index (uniform grid of square cells), so
+testing whether a segment of flow crosses a node visits only nodes in cells covered by segment. For every flow a short
+list of candidate routes (straight line, Z shapes and L shapes between node sides) is tested against the index, if all
+of them cross some node, flow is led around obstacles above or below them. Flows leaving the same side of a node
+(or entering the same side of a node) are bent in the same vertical channel.
+"""
+import math
+
+import bpmn_python.bpmn_python_consts as consts
+
+channel_gap = 25.0
+default_cell_size = 100.0
+# size of node, that has no width or height (e.g. imported node without BPMNShape)
+default_node_size = 100.0
+detour_attempts = 8
+
+
+class ObstaclesIndex(object):
+    """
+    Spatial index of node bounds. Bounds are tuples (left, top, right, bottom), each of them is bucketed into all cells
+    of uniform grid it overlaps. Default cell size is twice the median of node sizes, so a node occupies a few cells
+    and a short segment is tested only against nodes in its neighbourhood. Bounds added with node ID can be replaced
+    or removed, when node is moved or removed, so index can be kept between layout updates.
+    """
+
+    def __init__(self, bounds_list, cell_size=None, node_ids=None):
+        """
+        :param bounds_list: list of node bounds, tuples (left, top, right, bottom),
+        :param cell_size: size of grid cell, computed from sizes of nodes by default,
+        :param node_ids: list of IDs of nodes in the same order as bounds_list, or None, if bounds are not updated.
+        """
+        self.bounds_list = []
+        self.cells = {}
+        # node ID -> index of node bounds in bounds_list
+        self.node_indexes = {}
+        if cell_size is None:
+            sizes = sorted(max(right - left, bottom - top) for (left, top, right, bottom) in bounds_list)
+            cell_size = 2.0 * sizes[len(sizes) // 2] if sizes else default_cell_size
+        self.cell_size = float(cell_size) if cell_size > 0 else default_cell_size
+        if node_ids is None:
+            for bounds in bounds_list:
+                self.add_bounds(bounds)
+        else:
+            for (node_id, bounds) in zip(node_ids, bounds_list):
+                self.set_node_bounds(node_id, bounds)
+
+    def add_bounds(self, bounds):
+        """
+        Adds node bounds to index.
+
+        :param bounds: tuple (left, top, right, bottom).
+        :return: index of added bounds in bounds_list.
+        """
+        bounds_index = len(self.bounds_list)
+        self.bounds_list.append(bounds)
+        for cell in self.get_cells(bounds):
+            self.cells.setdefault(cell, []).append(bounds_index)
+        return bounds_index
+
+    def set_node_bounds(self, node_id, bounds):
+        """
+        Adds bounds of node to index, replacing previous bounds of the same node.
+
+        :param node_id: ID of node,
+        :param bounds: tuple (left, top, right, bottom).
+        """
+        self.remove_node_bounds(node_id)
+        self.node_indexes[node_id] = self.add_bounds(bounds)
+
+    def remove_node_bounds(self, node_id):
+        """
+        Removes bounds of node from index. Position of removed bounds in bounds_list is kept empty (None).
+
+        :param node_id: ID of node.
+        """
+        bounds_index = self.node_indexes.pop(node_id, None)
+        if bounds_index is None:
+            return
+        for cell in self.get_cells(self.bounds_list[bounds_index]):
+            cell_indexes = self.cells[cell]
+            cell_indexes.remove(bounds_index)
+            if not cell_indexes:
+                del self.cells[cell]
+        self.bounds_list[bounds_index] = None
+
+    def get_cells(self, bounds):
+        """
+        :param bounds: tuple (left, top, right, bottom).
+        :return: list of coordinates (column, row) of cells, that are overlapped by given bounds.
+        """
+        (left, top, right, bottom) = bounds
+        first_col = int(math.floor(left / self.cell_size))
+        last_col = int(math.floor(right / self.cell_size))
+        first_row = int(math.floor(top / self.cell_size))
+        last_row = int(math.floor(bottom / self.cell_size))
+        return [(col, row) for col in range(first_col, last_col + 1) for row in range(first_row, last_row + 1)]
+
+    def find_obstacles(self, left, top, right, bottom):
+        """
+        Finds nodes, that have interior intersecting given box. Box can be degenerated to horizontal or vertical
+        segment, touching a node side is not an intersection.
+
+        :param left: first coordinate of upper left corner of box,
+        :param top: second coordinate of upper left corner of box,
+        :param right: first coordinate of lower right corner of box,
+        :param bottom: second coordinate of lower right corner of box.
+        :return: list of bounds of found nodes.
+        """
+        found_indexes = set()
+        obstacles = []
+        for cell in self.get_cells((left, top, right, bottom)):
+            for bounds_index in self.cells.get(cell, []):
+                if bounds_index in found_indexes:
+                    continue
+                found_indexes.add(bounds_index)
+                (node_left, node_top, node_right, node_bottom) = self.bounds_list[bounds_index]
+                if node_left < right and left < node_right and node_top < bottom and top < node_bottom:
+                    obstacles.append(self.bounds_list[bounds_index])
+        return obstacles
+
+    def find_segment_obstacles(self, start, end):
+        """
+        :param start: first point of horizontal or vertical segment,
+        :param end: second point of segment.
+        :return: list of bounds of nodes crossed by segment.
+        """
+        return self.find_obstacles(min(start[0], end[0]), min(start[1], end[1]),
+                                   max(start[0], end[0]), max(start[1], end[1]))
+
+
+def route_flows(bpmn_graph, flows=None, obstacles=None):
+    """
+    Computes orthogonal waypoints of flows, avoiding nodes of diagram. Node coordinates and sizes must be set.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class,
+    :param flows: list of flows to be routed, as returned by get_flows, by default all flows of diagram,
+    :param obstacles: an instance of ObstaclesIndex class with bounds of all nodes of diagram, created if not given.
+    :return: an instance of ObstaclesIndex class, that was used for routing.
+    """
+    if obstacles is None:
+        nodes = bpmn_graph.get_nodes()
+        obstacles = ObstaclesIndex([get_node_bounds(node) for (_, node) in nodes],
+                                   node_ids=[node_id for (node_id, _) in nodes])
+    if flows is None:
+        flows = bpmn_graph.get_flows()
+    flows_by_source = {}
+    flows_by_target = {}
+    for flow in flows:
+        source_id = flow[2][consts.Consts.source_ref]
+        target_id = flow[2][consts.Consts.target_ref]
+        source_node = bpmn_graph.get_node_by_id(source_id)[1]
+        target_node = bpmn_graph.get_node_by_id(target_id)[1]
+        if source_id == target_id:
+            flow[2][consts.Consts.waypoints] = get_self_loop_waypoints(get_node_bounds(source_node))
+            continue
+        flow[2][consts.Consts.waypoints] = get_flow_waypoints(get_node_bounds(source_node),
+                                                              get_node_bounds(target_node), obstacles)
+        flows_by_source.setdefault(source_id, []).append(flow[2])
+        flows_by_target.setdefault(target_id, []).append(flow[2])
+    for siblings in list(flows_by_source.values()) + list(flows_by_target.values()):
+        if len(siblings) > 1:
+            add_junction_points(siblings)
+    return obstacles
+
+
+def get_node_bounds(node):
+    """
+    :param node: dictionary of node attributes.
+    :return: tuple (left, top, right, bottom) with node bounds. Missing width or height is replaced with
+        default_node_size.
+    """
+    (x, y) = (node[consts.Consts.x], node[consts.Consts.y])
+    return (x, y, x + node.get(consts.Consts.width, default_node_size),
+            y + node.get(consts.Consts.height, default_node_size))
+
+
+def get_flow_waypoints(source_bounds, target_bounds, obstacles):
+    """
+    Chooses the first candidate route, that does not cross any node. If every candidate crosses some nodes, the one
+    with the least crossings is chosen.
+
+    :param source_bounds: tuple (left, top, right, bottom) with bounds of source node,
+    :param target_bounds: tuple (left, top, right, bottom) with bounds of target node,
+    :param obstacles: an instance of ObstaclesIndex class.
+    :return: list of waypoints.
+    """
+    best_route = None
+    best_collisions = None
+    for route in get_candidate_routes(source_bounds, target_bounds, obstacles):
+        collisions = count_route_collisions(route, obstacles)
+        if collisions == 0:
+            return route
+        if best_collisions is None or collisions < best_collisions:
+            best_route = route
+            best_collisions = collisions
+    return best_route
+
+
+def get_candidate_routes(source_bounds, target_bounds, obstacles):
+    """
+    Generates candidate routes of flow in order of preference. Routes leading around obstacles are generated last,
+    since they need additional queries of index.
+
+    :param source_bounds: tuple (left, top, right, bottom) with bounds of source node,
+    :param target_bounds: tuple (left, top, right, bottom) with bounds of target node,
+    :param obstacles: an instance of ObstaclesIndex class.
+    :return: generator of routes (lists of waypoints).
+    """
+    (source_left, source_top, source_right, source_bottom) = source_bounds
+    (target_left, target_top, target_right, target_bottom) = target_bounds
+    source_center_x = (source_left + source_right) / 2.0
+    source_center_y = (source_top + source_bottom) / 2.0
+    target_center_x = (target_left + target_right) / 2.0
+    target_center_y = (target_top + target_bottom) / 2.0
+
+    if target_left >= source_right:
+        if target_top <= source_center_y <= target_bottom:
+            yield [(source_right, source_center_y), (target_left, source_center_y)]
+        if source_top <= target_center_y <= source_bottom:
+            yield [(source_right, target_center_y), (target_left, target_center_y)]
+        offset = min(channel_gap, (target_left - source_right) / 2.0)
+        for channel_x in [source_right + offset, target_left - offset]:
+            yield simplify_route([(source_right, source_center_y), (channel_x, source_center_y),
+                                  (channel_x, target_center_y), (target_left, target_center_y)])
+    if target_top >= source_bottom or target_bottom <= source_top:
+        below = target_top >= source_bottom
+        (source_y, target_y) = (source_bottom, target_top) if below else (source_top, target_bottom)
+        if target_left <= source_center_x <= target_right:
+            yield [(source_center_x, source_y), (source_center_x, target_y)]
+        if target_center_x >= source_right:
+            yield [(source_right, source_center_y), (target_center_x, source_center_y), (target_center_x, target_y)]
+        if target_left >= source_center_x:
+            yield [(source_center_x, source_y), (source_center_x, target_center_y), (target_left, target_center_y)]
+        channel_y = (source_y + target_y) / 2.0
+        yield simplify_route([(source_center_x, source_y), (source_center_x, channel_y),
+                              (target_center_x, channel_y), (target_center_x, target_y)])
+
+    detours = [get_detour_route(source_bounds, target_bounds, obstacles, above) for above in [True, False]]
+    detours.sort(key=lambda route: abs(route[2][1] - source_center_y) + abs(route[2][1] - target_center_y))
+    for route in detours:
+        yield route
+
+
+def get_detour_route(source_bounds, target_bounds, obstacles, above):
+    """
+    Computes route leaving right side of source node and entering left side of target node, that leads above
+    (or below) nodes blocking the horizontal part of route.
+
+    :param source_bounds: tuple (left, top, right, bottom) with bounds of source node,
+    :param target_bounds: tuple (left, top, right, bottom) with bounds of target node,
+    :param obstacles: an instance of ObstaclesIndex class,
+    :param above: boolean, True if route leads above obstacles, False if below.
+    :return: list of waypoints.
+    """
+    source_center_y = (source_bounds[1] + source_bounds[3]) / 2.0
+    target_center_y = (target_bounds[1] + target_bounds[3]) / 2.0
+    source_channel_x = source_bounds[2] + channel_gap
+    target_channel_x = target_bounds[0] - channel_gap
+    if above:
+        channel_y = min(source_bounds[1], target_bounds[1]) - channel_gap
+    else:
+        channel_y = max(source_bounds[3], target_bounds[3]) + channel_gap
+    for _ in range(detour_attempts):
+        blocking = obstacles.find_segment_obstacles((source_channel_x, channel_y), (target_channel_x, channel_y))
+        if not blocking:
+            break
+        if above:
+            channel_y = min(bounds[1] for bounds in blocking) - channel_gap
+        else:
+            channel_y = max(bounds[3] for bounds in blocking) + channel_gap
+    return [(source_bounds[2], source_center_y), (source_channel_x, source_center_y), (source_channel_x, channel_y),
+            (target_channel_x, channel_y), (target_channel_x, target_center_y), (target_bounds[0], target_center_y)]
+
+
+def get_self_loop_waypoints(bounds):
+    """
+    :param bounds: tuple (left, top, right, bottom) with node bounds.
+    :return: list of waypoints of flow, that leaves right side of node and enters its top.
+    """
+    (left, top, right, bottom) = bounds
+    center_x = (left + right) / 2.0
+    loop_x = right + channel_gap
+    loop_y = top - channel_gap
+    return [(right, (top + bottom) / 2.0), (loop_x, (top + bottom) / 2.0), (loop_x, loop_y), (center_x, loop_y),
+            (center_x, top)]
+
+
+def count_route_collisions(route, obstacles):
+    """
+    :param route: list of waypoints,
+    :param obstacles: an instance of ObstaclesIndex class.
+    :return: number of pairs (segment, node), such that segment of route crosses node.
+    """
+    return sum(len(obstacles.find_segment_obstacles(route[index], route[index + 1]))
+               for index in range(len(route) - 1))
+
+
+def add_junction_points(flows):
+    """
+    Flows leaving (or entering) the same node share channels, so a flow can branch off in the middle of segment
+    of another flow. Such points are added to waypoints of the other flow, so flows meet at common waypoints.
+
+    :param flows: list of dictionaries of attributes of flows, that have the same source (or target) node.
+    """
+    points = set(point for flow in flows for point in flow[consts.Consts.waypoints])
+    for flow in flows:
+        waypoints = flow[consts.Consts.waypoints]
+        junction_waypoints = [waypoints[0]]
+        for (start, end) in zip(waypoints, waypoints[1:]):
+            if start[0] == end[0]:
+                (low, high) = (min(start[1], end[1]), max(start[1], end[1]))
+                inner_points = [point for point in points if point[0] == start[0] and low < point[1] < high]
+            else:
+                (low, high) = (min(start[0], end[0]), max(start[0], end[0]))
+                inner_points = [point for point in points if point[1] == start[1] and low < point[0] < high]
+            inner_points.sort(key=lambda point: abs(point[0] - start[0]) + abs(point[1] - start[1]))
+            junction_waypoints.extend(inner_points)
+            junction_waypoints.append(end)
+        flow[consts.Consts.waypoints] = junction_waypoints
+
+
+def simplify_route(route):
+    """
+    Removes repeated waypoints and waypoints lying in the middle of straight segment.
+
+    :param route: list of waypoints.
+    :return: list of waypoints.
+    """
+    simplified = []
+    for point in route:
+        if simplified and point == simplified[-1]:
+            continue
+        if len(simplified) >= 2 and (simplified[-2][0] == simplified[-1][0] == point[0]
+                                     or simplified[-2][1] == simplified[-1][1] == point[1]):
+            simplified[-1] = point
+        else:
+            simplified.append(point)
+    return simplified
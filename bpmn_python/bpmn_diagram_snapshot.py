@@ -0,0 +1,448 @@
+# coding=utf-8
+"""
+Package provides functionality for saving graph representation of BPMN diagram to binary snapshot file and loading it
+back without XML parsing
+"""
+import json
+import mmap
+import struct
+
+import numpy as np
+import six
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_import_utils as utils
+import bpmn_python.bpmn_python_consts as consts
+
+
+class StringTable(object):
+    """
+    Helper class, that assigns indexes to distinct strings of snapshot. Index 0 is reserved for missing value.
+    """
+
+    def __init__(self):
+        self.strings = [None]
+        self.indexes = {}
+
+    def add(self, value):
+        """
+        :param value: string object.
+        :return: index of string in table.
+        """
+        index = self.indexes.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.indexes[value] = index
+            self.strings.append(value)
+        return index
+
+
+class BpmnDiagramGraphSnapshot(object):
+    """
+    Class BpmnDiagramGraphSnapshot provides methods for saving BPMNDiagramGraph to binary snapshot file and loading it
+    back. As a utility class, it only contains static methods. This class is meant to be used from BPMNDiagramGraph
+    class.
+
+    Snapshot file starts with a header (magic string, format version and number of sections), followed by a directory
+    of sections (tag, offset and length of each section). Sections are aligned to 8 bytes, numbers are little-endian:
+
+    * "STRO", "STRB" - string table, byte offsets of strings (uint32) and UTF-8 encoded strings. All strings
+        of nodes and flows are referenced by index, index 0 means missing attribute,
+    * "NODE" - for each node, indexes of node ID (graph key) and of node_string_fields attributes (uint32),
+    * "NBND" - for each node, values of node_float_fields attributes (float64), NaN means missing attribute,
+    * "NLSL", "NLST" - for each node, lengths of node_list_fields lists (uint32, missing_length means missing
+        attribute) and indexes of their items (uint32),
+    * "FLOW" - for each flow, indexes of IDs of connected nodes and of flow_string_fields attributes (uint32),
+    * "FWPL", "FWPT" - for each flow, number of waypoints (uint32, missing_length means missing attribute) and
+        coordinates of waypoints (float64),
+    * "SEQF" - for each sequence flow, indexes of ID and of sequence_flow_fields (uint32),
+    * "EXTR" - JSON document with attributes, that are not kept in arrays, process elements, collaboration,
+        diagram and plane attributes.
+
+    Snapshot can be memory-mapped, arrays are read directly from mapping, and node bounds can be shared by many
+    processes as a read-only array (see map_node_bounds).
+    """
+
+    def __init__(self):
+        pass
+
+    magic = b"BPMNSNAP"
+    version = 1
+    section_tags = (b"STRO", b"STRB", b"NODE", b"NBND", b"NLSL", b"NLST", b"FLOW", b"FWPL", b"FWPT", b"SEQF", b"EXTR")
+    header_format = "<8sII"
+    section_format = "<4sQQ"
+    alignment = 8
+    missing_length = 0xFFFFFFFF
+
+    node_string_fields = (consts.Consts.id, consts.Consts.type, consts.Consts.process, consts.Consts.node_name)
+    node_float_fields = (consts.Consts.x, consts.Consts.y, consts.Consts.width, consts.Consts.height)
+    node_list_fields = (consts.Consts.incoming_flow, consts.Consts.outgoing_flow)
+    flow_string_fields = (consts.Consts.id, consts.Consts.name, consts.Consts.process, consts.Consts.source_ref,
+                          consts.Consts.target_ref)
+    sequence_flow_fields = (consts.Consts.name, consts.Consts.source_ref, consts.Consts.target_ref)
+
+    @staticmethod
+    def save_snapshot(filepath, bpmn_diagram):
+        """
+        Saves diagram inner graph to binary snapshot file.
+
+        :param filepath: string with output file path,
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        """
+        with open(filepath, "wb") as output_file:
+            BpmnDiagramGraphSnapshot.write_snapshot(output_file, bpmn_diagram)
+
+    @staticmethod
+    def write_snapshot(output_file, bpmn_diagram):
+        """
+        Writes diagram inner graph as binary snapshot to file object. Attributes, that are not kept in arrays
+        of snapshot, must be serializable to JSON, otherwise BpmnPythonError is raised before anything is written.
+
+        :param output_file: binary file object opened for writing,
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        """
+        snapshot = BpmnDiagramGraphSnapshot
+        strings = StringTable()
+        extra_nodes = {}
+        node_rows = []
+        node_bounds = []
+        list_lengths = []
+        list_items = []
+        node_fields = set(snapshot.node_string_fields + snapshot.node_float_fields + snapshot.node_list_fields)
+        for (row, (node_id, node)) in enumerate(bpmn_diagram.diagram_graph.nodes(data=True)):
+            if not isinstance(node_id, six.string_types):
+                raise bpmn_exception.BpmnPythonError("Snapshot supports only string node IDs, got " + repr(node_id))
+            extra = dict((key, value) for (key, value) in node.items() if key not in node_fields)
+            node_rows.append(strings.add(node_id))
+            node_rows.extend(snapshot.pack_string(node, key, strings, extra) for key in snapshot.node_string_fields)
+            node_bounds.extend(snapshot.pack_float(node, key, extra) for key in snapshot.node_float_fields)
+            for key in snapshot.node_list_fields:
+                items = node.get(key)
+                if key not in node:
+                    list_lengths.append(snapshot.missing_length)
+                elif isinstance(items, list) and all(isinstance(item, six.string_types) for item in items):
+                    list_lengths.append(len(items))
+                    list_items.extend(strings.add(item) for item in items)
+                else:
+                    list_lengths.append(snapshot.missing_length)
+                    extra[key] = items
+            if extra:
+                extra_nodes[str(row)] = extra
+
+        extra_flows = {}
+        flow_rows = []
+        waypoints_lengths = []
+        waypoints_coordinates = []
+        flow_fields = set(snapshot.flow_string_fields + (consts.Consts.waypoints,))
+        for (row, (source_id, target_id, flow)) in enumerate(bpmn_diagram.diagram_graph.edges(data=True)):
+            extra = dict((key, value) for (key, value) in flow.items() if key not in flow_fields)
+            flow_rows.extend([strings.add(source_id), strings.add(target_id)])
+            flow_rows.extend(snapshot.pack_string(flow, key, strings, extra) for key in snapshot.flow_string_fields)
+            waypoints = flow.get(consts.Consts.waypoints)
+            if consts.Consts.waypoints not in flow:
+                waypoints_lengths.append(snapshot.missing_length)
+            elif isinstance(waypoints, list) and all(isinstance(point, tuple) and len(point) == 2
+                                                     and isinstance(point[0], float) and isinstance(point[1], float)
+                                                     for point in waypoints):
+                waypoints_lengths.append(len(waypoints))
+                for point in waypoints:
+                    waypoints_coordinates.extend(point)
+            else:
+                waypoints_lengths.append(snapshot.missing_length)
+                extra[consts.Consts.waypoints] = waypoints
+            if extra:
+                extra_flows[str(row)] = extra
+
+        extra_sequence_flows = {}
+        sequence_flow_rows = []
+        for (flow_id, flow_refs) in bpmn_diagram.sequence_flows.items():
+            if sorted(flow_refs) == sorted(snapshot.sequence_flow_fields) \
+                    and all(isinstance(flow_refs[key], six.string_types) for key in flow_refs):
+                sequence_flow_rows.append(strings.add(flow_id))
+                sequence_flow_rows.extend(strings.add(flow_refs[key]) for key in snapshot.sequence_flow_fields)
+            else:
+                extra_sequence_flows[flow_id] = flow_refs
+
+        extra_document = {"nodes": extra_nodes, "flows": extra_flows, "sequence_flows": extra_sequence_flows,
+                          "process_elements": bpmn_diagram.process_elements,
+                          "collaboration": bpmn_diagram.collaboration,
+                          "diagram_attributes": bpmn_diagram.diagram_attributes,
+                          "plane_attributes": bpmn_diagram.plane_attributes}
+        encoded_strings = [value.encode("utf-8") for value in strings.strings[1:]]
+        string_offsets = np.zeros(len(strings.strings), dtype="<u4")
+        np.cumsum([len(value) for value in encoded_strings], out=string_offsets[1:])
+        sections = [(b"STRO", string_offsets.tobytes()),
+                    (b"STRB", b"".join(encoded_strings)),
+                    (b"NODE", np.array(node_rows, dtype="<u4").tobytes()),
+                    (b"NBND", np.array(node_bounds, dtype="<f8").tobytes()),
+                    (b"NLSL", np.array(list_lengths, dtype="<u4").tobytes()),
+                    (b"NLST", np.array(list_items, dtype="<u4").tobytes()),
+                    (b"FLOW", np.array(flow_rows, dtype="<u4").tobytes()),
+                    (b"FWPL", np.array(waypoints_lengths, dtype="<u4").tobytes()),
+                    (b"FWPT", np.array(waypoints_coordinates, dtype="<f8").tobytes()),
+                    (b"SEQF", np.array(sequence_flow_rows, dtype="<u4").tobytes()),
+                    (b"EXTR", snapshot.dump_extra_document(extra_document))]
+
+        offset = struct.calcsize(snapshot.header_format) + len(sections) * struct.calcsize(snapshot.section_format)
+        directory = []
+        for (tag, data) in sections:
+            offset = snapshot.get_aligned(offset)
+            directory.append(struct.pack(snapshot.section_format, tag, offset, len(data)))
+            offset += len(data)
+        output_file.write(struct.pack(snapshot.header_format, snapshot.magic, snapshot.version, len(sections)))
+        output_file.write(b"".join(directory))
+        position = struct.calcsize(snapshot.header_format) + len(directory) * struct.calcsize(snapshot.section_format)
+        for (_, data) in sections:
+            output_file.write(b"\0" * (snapshot.get_aligned(position) - position))
+            output_file.write(data)
+            position = snapshot.get_aligned(position) + len(data)
+
+    @staticmethod
+    def load_snapshot(filepath, bpmn_diagram, use_mmap=True):
+        """
+        Loads diagram from binary snapshot file into inner representation of BPMN diagram.
+
+        :param filepath: string with snapshot file path,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class,
+        :param use_mmap: boolean flag. If set to True, file is memory-mapped and arrays are read directly from mapping,
+            otherwise the whole file is read into memory first.
+        """
+        with open(filepath, "rb") as input_file:
+            if not use_mmap:
+                BpmnDiagramGraphSnapshot.read_snapshot(input_file.read(), bpmn_diagram)
+                return
+            try:
+                buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise bpmn_exception.BpmnPythonError("File " + str(filepath) + " is not a diagram snapshot")
+        try:
+            BpmnDiagramGraphSnapshot.read_snapshot(buffer, bpmn_diagram)
+        finally:
+            try:
+                buffer.close()
+            except BufferError:
+                # arrays created from mapping are still referenced by traceback of an exception
+                pass
+
+    @staticmethod
+    def read_snapshot(buffer, bpmn_diagram):
+        """
+        Reads diagram from snapshot data.
+
+        :param buffer: bytes or mmap object with content of snapshot file,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class.
+        """
+        snapshot = BpmnDiagramGraphSnapshot
+        sections = snapshot.read_sections(buffer)
+        try:
+            strings = snapshot.read_strings(buffer, sections)
+            extra_document = json.loads(snapshot.read_bytes(buffer, sections, b"EXTR").decode("utf-8"))
+        except ValueError:
+            raise bpmn_exception.BpmnPythonError("Snapshot data is corrupted")
+        diagram_graph = bpmn_diagram.diagram_graph
+
+        extra_nodes = extra_document["nodes"]
+        node_rows = snapshot.read_array(buffer, sections, b"NODE", "<u4").reshape(
+            -1, len(snapshot.node_string_fields) + 1).tolist()
+        node_bounds = snapshot.read_array(buffer, sections, b"NBND", "<f8").reshape(
+            -1, len(snapshot.node_float_fields)).tolist()
+        list_lengths = snapshot.read_array(buffer, sections, b"NLSL", "<u4").reshape(
+            -1, len(snapshot.node_list_fields)).tolist()
+        list_items = [strings[index] for index in snapshot.read_array(buffer, sections, b"NLST", "<u4").tolist()]
+        position = 0
+        nodes = []
+        for (row, node_row) in enumerate(node_rows):
+            node = {}
+            for (key, index) in zip(snapshot.node_string_fields, node_row[1:]):
+                if index:
+                    node[key] = strings[index]
+            for (key, value) in zip(snapshot.node_float_fields, node_bounds[row]):
+                if value == value:
+                    node[key] = value
+            for (key, length) in zip(snapshot.node_list_fields, list_lengths[row]):
+                if length != snapshot.missing_length:
+                    node[key] = list_items[position:position + length]
+                    position += length
+            node.update(extra_nodes.get(str(row), {}))
+            nodes.append((strings[node_row[0]], node))
+        diagram_graph.add_nodes_from(nodes)
+
+        extra_flows = extra_document["flows"]
+        flow_rows = snapshot.read_array(buffer, sections, b"FLOW", "<u4").reshape(
+            -1, len(snapshot.flow_string_fields) + 2).tolist()
+        waypoints_lengths = snapshot.read_array(buffer, sections, b"FWPL", "<u4").tolist()
+        waypoints_coordinates = snapshot.read_array(buffer, sections, b"FWPT", "<f8").tolist()
+        position = 0
+        for (row, flow_row) in enumerate(flow_rows):
+            flow = {}
+            for (key, index) in zip(snapshot.flow_string_fields, flow_row[2:]):
+                if index:
+                    flow[key] = strings[index]
+            length = waypoints_lengths[row]
+            if length != snapshot.missing_length:
+                coordinates = waypoints_coordinates[position:position + 2 * length]
+                flow[consts.Consts.waypoints] = list(zip(coordinates[0::2], coordinates[1::2]))
+                position += 2 * length
+            flow.update(extra_flows.get(str(row), {}))
+            utils.BpmnImportUtils.add_flow_edge(diagram_graph, flow.get(consts.Consts.id), strings[flow_row[0]],
+                                                strings[flow_row[1]]).update(flow)
+
+        sequence_flow_rows = snapshot.read_array(buffer, sections, b"SEQF", "<u4").reshape(
+            -1, len(snapshot.sequence_flow_fields) + 1).tolist()
+        for sequence_flow_row in sequence_flow_rows:
+            bpmn_diagram.sequence_flows[strings[sequence_flow_row[0]]] = dict(
+                (key, strings[index]) for (key, index) in zip(snapshot.sequence_flow_fields, sequence_flow_row[1:]))
+        bpmn_diagram.sequence_flows.update(extra_document["sequence_flows"])
+        bpmn_diagram.process_elements.update(extra_document["process_elements"])
+        bpmn_diagram.collaboration.update(extra_document["collaboration"])
+        bpmn_diagram.diagram_attributes.update(extra_document["diagram_attributes"])
+        bpmn_diagram.plane_attributes.update(extra_document["plane_attributes"])
+        bpmn_diagram.rebuild_indexes()
+
+    @staticmethod
+    def map_node_bounds(filepath):
+        """
+        Maps bounds of nodes from snapshot file into read-only array, without loading the whole diagram. Pages of
+        mapped file are shared by all processes mapping it.
+
+        :param filepath: string with snapshot file path.
+        :return: a tuple of list of node IDs and read-only numpy array of shape (number of nodes, 4) with x, y, width
+            and height of nodes (NaN for missing values), in the same order.
+        """
+        snapshot = BpmnDiagramGraphSnapshot
+        with open(filepath, "rb") as input_file:
+            buffer = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            sections = snapshot.read_sections(buffer)
+            strings = snapshot.read_strings(buffer, sections)
+            node_ids = [strings[index] for index in snapshot.read_array(buffer, sections, b"NODE", "<u4").reshape(
+                -1, len(snapshot.node_string_fields) + 1)[:, 0].tolist()]
+        finally:
+            buffer.close()
+        (offset, length) = sections[b"NBND"]
+        if not length:
+            return node_ids, np.zeros((0, len(snapshot.node_float_fields)))
+        bounds = np.memmap(filepath, dtype="<f8", mode="r", offset=offset,
+                           shape=(len(node_ids), len(snapshot.node_float_fields)))
+        return node_ids, bounds
+
+    # Helper methods
+    @staticmethod
+    def get_aligned(offset):
+        alignment = BpmnDiagramGraphSnapshot.alignment
+        return (offset + alignment - 1) // alignment * alignment
+
+    @staticmethod
+    def pack_string(attributes, key, strings, extra):
+        """
+        Returns string table index of string attribute. Attribute, that is not a string, is moved to extra attributes.
+
+        :param attributes: dictionary of node or flow attributes,
+        :param key: name of attribute,
+        :param strings: an instance of StringTable class,
+        :param extra: dictionary of extra attributes.
+        :return: index of attribute value in string table, 0 if attribute is missing or is not a string.
+        """
+        if key not in attributes:
+            return 0
+        value = attributes[key]
+        if isinstance(value, six.string_types):
+            return strings.add(value)
+        extra[key] = value
+        return 0
+
+    @staticmethod
+    def pack_float(attributes, key, extra):
+        """
+        Returns value of float attribute. Attribute, that is not a float, is moved to extra attributes.
+
+        :param attributes: dictionary of node or flow attributes,
+        :param key: name of attribute,
+        :param extra: dictionary of extra attributes.
+        :return: attribute value, NaN if attribute is missing or is not a float.
+        """
+        value = attributes.get(key)
+        if isinstance(value, float) and value == value:
+            return value
+        if key in attributes:
+            extra[key] = value
+        return float("nan")
+
+    @staticmethod
+    def read_sections(buffer):
+        """
+        Reads header and directory of sections of snapshot.
+
+        :param buffer: bytes or mmap object with content of snapshot file.
+        :return: a dictionary, that maps section tag to a tuple of offset and length of section.
+        """
+        snapshot = BpmnDiagramGraphSnapshot
+        header_size = struct.calcsize(snapshot.header_format)
+        if len(buffer) < header_size:
+            raise bpmn_exception.BpmnPythonError("Data is not a diagram snapshot")
+        (magic, version, sections_count) = struct.unpack(snapshot.header_format, buffer[:header_size])
+        if magic != snapshot.magic:
+            raise bpmn_exception.BpmnPythonError("Data is not a diagram snapshot")
+        if version != snapshot.version:
+            raise bpmn_exception.BpmnPythonError("Unsupported snapshot version " + str(version) + ", expected "
+                                                 + str(snapshot.version))
+        section_size = struct.calcsize(snapshot.section_format)
+        sections = {}
+        for index in range(sections_count):
+            start = header_size + index * section_size
+            (tag, offset, length) = struct.unpack(snapshot.section_format, buffer[start:start + section_size])
+            sections[tag] = (offset, length)
+        if header_size + sections_count * section_size > len(buffer) \
+                or any(offset + length > len(buffer) for (offset, length) in sections.values()):
+            raise bpmn_exception.BpmnPythonError("Snapshot data is truncated")
+        if any(tag not in sections for tag in snapshot.section_tags):
+            raise bpmn_exception.BpmnPythonError("Snapshot data is missing sections")
+        return sections
+
+    @staticmethod
+    def dump_extra_document(extra_document):
+        """
+        :param extra_document: dictionary with attributes, that are not kept in arrays of snapshot.
+        :return: bytes of UTF-8 encoded JSON document.
+        """
+        try:
+            return json.dumps(extra_document, ensure_ascii=False).encode("utf-8")
+        except (TypeError, ValueError) as exception:
+            raise bpmn_exception.BpmnPythonError("Diagram attributes cannot be saved in snapshot: " + str(exception))
+
+    @staticmethod
+    def read_bytes(buffer, sections, tag):
+        (offset, length) = sections[tag]
+        return bytes(buffer[offset:offset + length])
+
+    @staticmethod
+    def read_array(buffer, sections, tag, dtype):
+        """
+        Returns array of section data. Array is created without copying data.
+
+        :param buffer: bytes or mmap object with content of snapshot file,
+        :param sections: dictionary returned by read_sections,
+        :param tag: tag of section,
+        :param dtype: numpy data type of array items.
+        :return: numpy array.
+        """
+        (offset, length) = sections[tag]
+        if not length:
+            return np.zeros(0, dtype=dtype)
+        item_size = np.dtype(dtype).itemsize
+        return np.frombuffer(buffer, dtype=dtype, count=length // item_size, offset=offset)
+
+    @staticmethod
+    def read_strings(buffer, sections):
+        """
+        Reads string table of snapshot.
+
+        :param buffer: bytes or mmap object with content of snapshot file,
+        :param sections: dictionary returned by read_sections.
+        :return: list of strings, the first item (missing value) is None.
+        """
+        offsets = BpmnDiagramGraphSnapshot.read_array(buffer, sections, b"STRO", "<u4").tolist()
+        data = BpmnDiagramGraphSnapshot.read_bytes(buffer, sections, b"STRB")
+        strings = [None]
+        strings.extend(data[offsets[index]:offsets[index + 1]].decode("utf-8") for index in range(len(offsets) - 1))
+        return strings
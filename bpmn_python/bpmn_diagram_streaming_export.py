@@ -0,0 +1,262 @@
+# coding=utf-8
+"""
+Package provides functionality for exporting graph representation to BPMN 2.0 XML in a single streaming pass,
+without building an ElementTree of the whole document
+"""
+import errno
+import io
+import os
+import xml.etree.cElementTree as eTree
+
+import bpmn_python.bpmn_diagram_export as bpmn_export
+import bpmn_python.bpmn_python_consts as consts
+
+
+def escape_text(text):
+    """
+    Escapes special characters of XML text content.
+
+    :param text: string object.
+    :return: escaped string.
+    """
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value):
+    """
+    Escapes special characters of XML attribute value, so it can be enclosed in double quotes.
+
+    :param value: string object.
+    :return: escaped string.
+    """
+    value = escape_text(value)
+    if "\"" in value:
+        value = value.replace("\"", "&quot;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+class XmlStreamWriter(object):
+    """
+    Helper class, that writes XML elements to file object. Elements are indented while they are written, so
+    no indentation pass over the document is needed. Each element written with write_element is serialized
+    to a single string, so file object gets one write call per element.
+    """
+
+    def __init__(self, output_file, indent="  "):
+        """
+        :param output_file: file object opened for writing (binary or text),
+        :param indent: string used for one level of indentation or None, if output should not be indented.
+        """
+        if isinstance(output_file, io.TextIOBase):
+            self.write = output_file.write
+        else:
+            self.write = lambda text: output_file.write(text if isinstance(text, bytes) else text.encode("utf-8"))
+        self.indent = indent
+        # for each open element - flag, if it has child elements
+        self.open_elements = []
+
+    def start_document(self):
+        self.write(u'<?xml version="1.0" encoding="utf-8"?>\n')
+
+    def end_document(self):
+        if self.indent is not None:
+            self.write(u"\n")
+
+    def start(self, tag, attributes=None):
+        """
+        Writes start tag of element.
+
+        :param tag: tag name of element,
+        :param attributes: dictionary of element attributes.
+        """
+        parts = [self.get_new_line()]
+        XmlStreamWriter.append_start_tag(parts, tag, attributes or {})
+        parts.append(u">")
+        self.write(u"".join(parts))
+        self.open_elements.append(False)
+
+    def end(self, tag):
+        """
+        Writes end tag of element.
+
+        :param tag: tag name of element.
+        """
+        new_line = self.get_new_line() if self.open_elements.pop() else u""
+        self.write(new_line + u"</" + tag + u">")
+
+    def write_element(self, element):
+        """
+        Writes ElementTree element with its subelements.
+
+        :param element: object of Element class.
+        """
+        parts = [self.get_new_line()]
+        self.append_element(parts, element, len(self.open_elements))
+        self.write(u"".join(parts))
+
+    def append_element(self, parts, element, level):
+        """
+        Serializes element with its subelements, appending strings to given list.
+
+        :param parts: list of strings,
+        :param element: object of Element class,
+        :param level: level of indentation of element.
+        """
+        XmlStreamWriter.append_start_tag(parts, element.tag, element.attrib)
+        if not len(element) and not element.text:
+            parts.append(u"/>")
+            return
+        parts.append(u">")
+        if element.text:
+            parts.append(escape_text(element.text))
+        if len(element):
+            child_new_line = u"" if self.indent is None else u"\n" + (level + 1) * self.indent
+            for child in element:
+                parts.append(child_new_line)
+                self.append_element(parts, child, level + 1)
+            if self.indent is not None:
+                parts.append(u"\n" + level * self.indent)
+        parts.append(u"</" + element.tag + u">")
+
+    @staticmethod
+    def append_start_tag(parts, tag, attributes):
+        parts.append(u"<" + tag)
+        for (name, value) in attributes.items():
+            parts.append(u" " + name + u'="' + escape_attribute(value) + u'"')
+
+    def get_new_line(self):
+        """
+        Marks current element as having child elements and returns indentation for its next child.
+
+        :return: string with new line and indentation, empty if output is not indented or no element is open.
+        """
+        if not self.open_elements:
+            return u""
+        self.open_elements[-1] = True
+        if self.indent is None:
+            return u""
+        return u"\n" + len(self.open_elements) * self.indent
+
+
+class BpmnDiagramGraphStreamingExport(object):
+    """
+    Class BpmnDiagramGraphStreamingExport provides methods for exporting BPMNDiagramGraph into BPMN 2.0 XML with
+    XmlStreamWriter. Elements of nodes and flows are created one by one with BpmnDiagramGraphExport methods and written
+    immediately, so whole document is never kept in memory. Diagram Interchange data is written after processes.
+    As a utility class, it only contains static methods. This class is meant to be used from BPMNDiagramGraph class.
+    """
+
+    def __init__(self):
+        pass
+
+    plane_tag = bpmn_export.BpmnDiagramGraphExport.bpmndi_namespace + "BPMNPlane"
+
+    @staticmethod
+    def export_xml_file(directory, filename, bpmn_diagram, with_di=True):
+        """
+        Exports diagram inner graph to BPMN 2.0 XML file.
+
+        :param directory: string representing output directory,
+        :param filename: string representing output file name,
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram,
+        :param with_di: boolean flag, if set to False, Diagram Interchange data and collaboration are not exported
+            (as in BpmnDiagramGraphExport.export_xml_file_no_di).
+        """
+        try:
+            os.makedirs(directory)
+        except OSError as exception:
+            if exception.errno != errno.EEXIST:
+                raise
+        with open(directory + filename, "wb") as output_file:
+            BpmnDiagramGraphStreamingExport.write_xml(output_file, bpmn_diagram, with_di)
+
+    @staticmethod
+    def write_xml(output_file, bpmn_diagram, with_di=True, indent="  "):
+        """
+        Writes diagram inner graph as BPMN 2.0 XML document to file object.
+
+        :param output_file: file object opened for writing (binary or text),
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram,
+        :param with_di: boolean flag, if set to False, Diagram Interchange data and collaboration are not exported,
+        :param indent: string used for one level of indentation or None, if output should not be indented.
+        """
+        writer = XmlStreamWriter(output_file, indent)
+        writer.start_document()
+        definitions = bpmn_export.BpmnDiagramGraphExport.export_definitions_element()
+        writer.start(definitions.tag, definitions.attrib)
+
+        # DI elements of participants, message flows and lanes are created together with their process elements
+        plane_elements = eTree.Element(BpmnDiagramGraphStreamingExport.plane_tag)
+        (nodes_by_process, flows_by_process, message_flows_params) = \
+            bpmn_export.BpmnDiagramGraphExport.partition_diagram(bpmn_diagram)
+        collaboration = bpmn_diagram.collaboration
+        if with_di and collaboration is not None and len(collaboration) > 0:
+            parent = eTree.Element(consts.Consts.definitions)
+            bpmn_export.BpmnDiagramGraphExport.export_collaboration(parent, plane_elements, bpmn_diagram,
+                                                                    message_flows_params)
+            writer.write_element(parent[0])
+
+        for (process_id, process_element_attr) in bpmn_diagram.process_elements.items():
+            parent = eTree.Element(consts.Consts.definitions)
+            process = bpmn_export.BpmnDiagramGraphExport.export_process_element(parent, process_id,
+                                                                                process_element_attr)
+            writer.start(process.tag, process.attrib)
+            if consts.Consts.lane_set in process_element_attr:
+                parent = eTree.Element(consts.Consts.process)
+                bpmn_export.BpmnDiagramGraphExport.export_lane_set(parent, process_element_attr[consts.Consts.lane_set],
+                                                                   plane_elements)
+                writer.write_element(parent[0])
+            for (node_id, params) in nodes_by_process.get(process_id, []):
+                parent = eTree.Element(consts.Consts.process)
+                bpmn_export.BpmnDiagramGraphExport.export_node_data(bpmn_diagram, node_id, params, parent)
+                writer.write_element(parent[0])
+            for flow in flows_by_process.get(process_id, []):
+                parent = eTree.Element(consts.Consts.process)
+                bpmn_export.BpmnDiagramGraphExport.export_flow_process_data(flow[2], parent)
+                writer.write_element(parent[0])
+            writer.end(process.tag)
+
+        if with_di:
+            BpmnDiagramGraphStreamingExport.write_di_data(writer, bpmn_diagram, plane_elements)
+        writer.end(definitions.tag)
+        writer.end_document()
+
+    @staticmethod
+    def write_di_data(writer, bpmn_diagram, plane_elements):
+        """
+        Writes 'BPMNDiagram' element with Diagram Interchange data of all elements of diagram.
+
+        :param writer: an instance of XmlStreamWriter class,
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram,
+        :param plane_elements: object of Element class, that holds already created DI elements of participants,
+            message flows and lanes.
+        """
+        parent = eTree.Element(consts.Consts.definitions)
+        (diagram, plane) = bpmn_export.BpmnDiagramGraphExport.export_diagram_plane_elements(
+            parent, bpmn_diagram.diagram_attributes, bpmn_diagram.plane_attributes)
+        writer.start(diagram.tag, diagram.attrib)
+        writer.start(plane.tag, plane.attrib)
+        for element in plane_elements:
+            writer.write_element(element)
+        for (node_id, params) in bpmn_diagram.get_nodes():
+            parent = eTree.Element(BpmnDiagramGraphStreamingExport.plane_tag)
+            bpmn_export.BpmnDiagramGraphExport.export_node_di_data(node_id, params, parent)
+            writer.write_element(parent[0])
+        for flow in bpmn_diagram.get_flows():
+            parent = eTree.Element(BpmnDiagramGraphStreamingExport.plane_tag)
+            bpmn_export.BpmnDiagramGraphExport.export_flow_di_data(flow[2], parent)
+            writer.write_element(parent[0])
+        writer.end(plane.tag)
+        writer.end(diagram.tag)
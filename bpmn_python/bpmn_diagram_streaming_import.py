@@ -0,0 +1,388 @@
+# coding=utf-8
+"""
+Package provides functionality for importing from BPMN 2.0 XML to graph representation in a single streaming pass,
+without building a DOM tree of the whole document
+"""
+from xml.etree import cElementTree as eTree
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_import as bpmn_import
+import bpmn_python.bpmn_python_consts as consts
+
+
+class BpmnDiagramGraphStreamingImport(object):
+    """
+    Class BpmnDiagramGraphStreamingImport provides methods for importing BPMN 2.0 XML file with ElementTree iterparse.
+    It fills the same structures as BpmnDiagramGraphImport, but each XML element is discarded as soon as it is
+    consumed, so memory usage doesn't grow with the size of XML document.
+    As a utility class, it only contains static methods. This class is meant to be used from BPMNDiagramGraph class.
+    """
+
+    # Additional attributes of imported flow nodes with their default values, used when attribute is missing
+    flow_node_attributes = {
+        consts.Consts.task: ((consts.Consts.default, None),),
+        consts.Consts.user_task: ((consts.Consts.default, None),),
+        consts.Consts.service_task: ((consts.Consts.default, None),),
+        consts.Consts.manual_task: ((consts.Consts.default, None),),
+        consts.Consts.subprocess: ((consts.Consts.default, None), (consts.Consts.triggered_by_event, "false")),
+        consts.Consts.data_object: ((consts.Consts.is_collection, "false"),),
+        consts.Consts.inclusive_gateway: ((consts.Consts.gateway_direction, "Unspecified"),
+                                          (consts.Consts.default, None)),
+        consts.Consts.exclusive_gateway: ((consts.Consts.gateway_direction, "Unspecified"),
+                                          (consts.Consts.default, None)),
+        consts.Consts.parallel_gateway: ((consts.Consts.gateway_direction, "Unspecified"),),
+        consts.Consts.event_based_gateway: ((consts.Consts.gateway_direction, "Unspecified"),
+                                            (consts.Consts.instantiate, "false"),
+                                            (consts.Consts.event_gateway_type, "Exclusive")),
+        consts.Consts.complex_gateway: ((consts.Consts.gateway_direction, "Unspecified"),
+                                        (consts.Consts.default, None)),
+        consts.Consts.start_event: ((consts.Consts.parallel_multiple, "false"),
+                                    (consts.Consts.is_interrupting, "true")),
+        consts.Consts.intermediate_catch_event: ((consts.Consts.parallel_multiple, "false"),),
+        consts.Consts.end_event: (),
+        consts.Consts.intermediate_throw_event: (),
+        consts.Consts.boundary_event: ((consts.Consts.parallel_multiple, "false"),
+                                       (consts.Consts.cancel_activity, "true"),
+                                       (consts.Consts.attached_to_ref, "")),
+    }
+
+    # Event definitions imported for each type of event
+    event_definitions = {
+        consts.Consts.start_event: bpmn_import.BpmnDiagramGraphImport.start_event_definitions,
+        consts.Consts.intermediate_catch_event: bpmn_import.BpmnDiagramGraphImport.intermediate_catch_event_definitions,
+        consts.Consts.end_event: bpmn_import.BpmnDiagramGraphImport.end_event_definitions,
+        consts.Consts.intermediate_throw_event: bpmn_import.BpmnDiagramGraphImport.intermediate_throw_event_definitions,
+        consts.Consts.boundary_event: bpmn_import.BpmnDiagramGraphImport.boundary_event_definitions,
+    }
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def load_diagram_from_xml(filepath, bpmn_diagram):
+        """
+        Reads an XML file from given filepath and maps it into inner representation of BPMN diagram.
+
+        Flow nodes are added to graph when their start tag is read, sequence flows are added when their parent process
+        (or subprocess) is closed. Collaboration and Diagram Interchange data are kept as small records and applied at
+        the end of document, so the result is the same as the one of BpmnDiagramGraphImport. Element handlers
+        registered in BpmnDiagramGraphImport are not supported, BpmnPythonError is raised, if there are any
+        non-default handlers.
+
+        :param filepath: string with output filepath, or a file object,
+        :param bpmn_diagram: an instance of BpmnDiagramGraph class.
+        """
+        if not bpmn_import.BpmnDiagramGraphImport.has_default_element_handlers():
+            raise bpmn_exception.BpmnPythonError("Streaming import doesn't support element handlers registered in "
+                                                 "BpmnDiagramGraphImport, use default importer")
+        diagram_graph = bpmn_diagram.diagram_graph
+        sequence_flows = bpmn_diagram.sequence_flows
+        process_elements_dict = bpmn_diagram.process_elements
+        collaboration = bpmn_diagram.collaboration
+
+        # stack of currently open XML elements
+        parents = []
+        # stack of currently open process and subprocess elements, each entry is a tuple of XML element, process ID,
+        # process (or subprocess node) attributes dictionary and a list of sequence flows waiting to be added to graph
+        containers = []
+        diagram_element = None
+        plane_element = None
+        collaboration_element = None
+        collaboration_records = []
+        lanes = []
+        shapes = []
+        edges = []
+
+        for event, element in eTree.iterparse(filepath, events=("start", "end")):
+            tag_name = BpmnDiagramGraphStreamingImport.get_local_name(element.tag)
+            if event == "start":
+                parent = parents[-1] if parents else None
+                parents.append(element)
+                if tag_name == consts.Consts.process:
+                    process_id = BpmnDiagramGraphStreamingImport.import_process_element(process_elements_dict,
+                                                                                        element)
+                    containers.append((element, process_id, process_elements_dict[process_id], []))
+                elif containers and parent is containers[-1][0] \
+                        and tag_name in BpmnDiagramGraphStreamingImport.flow_node_attributes:
+                    _, process_id, process_attributes, _ = containers[-1]
+                    node = BpmnDiagramGraphStreamingImport.import_flow_node_to_graph(
+                        diagram_graph, process_id, process_attributes, element, tag_name)
+                    if tag_name == consts.Consts.subprocess:
+                        node[consts.Consts.node_ids] = []
+                        containers.append((element, element.get(consts.Consts.id), node, []))
+                elif tag_name == "BPMNDiagram" and diagram_element is None:
+                    diagram_element = element
+                elif tag_name == "BPMNPlane" and plane_element is None and parent is diagram_element:
+                    plane_element = element
+                    BpmnDiagramGraphStreamingImport.import_diagram_and_plane_attributes(
+                        bpmn_diagram.diagram_attributes, bpmn_diagram.plane_attributes, diagram_element,
+                        plane_element)
+                elif tag_name == consts.Consts.collaboration and collaboration_element is None:
+                    collaboration_element = element
+                    collaboration[consts.Consts.id] = element.get(consts.Consts.id, "")
+                    collaboration[consts.Consts.participants] = {}
+                    collaboration[consts.Consts.message_flows] = {}
+                continue
+
+            parents.pop()
+            parent = parents[-1] if parents else None
+            consumed = True
+            if containers and element is containers[-1][0]:
+                _, process_id, _, flows = containers.pop()
+                for flow in flows:
+                    bpmn_import.BpmnDiagramGraphImport.add_sequence_flow_to_graph(diagram_graph, sequence_flows,
+                                                                                  process_id, *flow)
+            elif containers and parent is containers[-1][0]:
+                _, process_id, process_attributes, flows = containers[-1]
+                if tag_name in BpmnDiagramGraphStreamingImport.flow_node_attributes:
+                    BpmnDiagramGraphStreamingImport.import_flow_node_children(diagram_graph, element, tag_name)
+                elif tag_name == consts.Consts.sequence_flow:
+                    flows.append(BpmnDiagramGraphStreamingImport.read_sequence_flow(element))
+                elif tag_name in (consts.Consts.incoming_flow, consts.Consts.outgoing_flow) and len(containers) > 1:
+                    # incoming and outgoing flows of subprocess
+                    process_attributes[tag_name].append(element.text)
+                elif tag_name == consts.Consts.lane_set and len(containers) == 1 \
+                        and consts.Consts.lane_set not in process_attributes:
+                    process_attributes[consts.Consts.lane_set] = \
+                        BpmnDiagramGraphStreamingImport.import_lane_set_element(element, lanes)
+            elif parent is not None and parent is plane_element:
+                if tag_name == consts.Consts.bpmn_shape:
+                    shapes.append((element.get(consts.Consts.bpmn_element, ""),
+                                   BpmnDiagramGraphStreamingImport.read_shape_attributes(element)))
+                elif tag_name == consts.Consts.bpmn_edge:
+                    edges.append((element.get(consts.Consts.bpmn_element, ""),
+                                  [(float(waypoint.get(consts.Consts.x)), float(waypoint.get(consts.Consts.y)))
+                                   for waypoint in element.iter()
+                                   if BpmnDiagramGraphStreamingImport.get_local_name(waypoint.tag) ==
+                                   consts.Consts.waypoint]))
+            elif parent is not None and parent is collaboration_element:
+                if tag_name in (consts.Consts.participant, consts.Consts.message_flow):
+                    collaboration_records.append((tag_name, element.get(consts.Consts.id, ""),
+                                                  element.get(consts.Consts.name, ""),
+                                                  element.get(consts.Consts.process_ref, ""),
+                                                  element.get(consts.Consts.source_ref, ""),
+                                                  element.get(consts.Consts.target_ref, "")))
+            else:
+                # element is a part of its parent (e.g. 'incoming' element of flow node), parent will consume it
+                consumed = parent is diagram_element or len(parents) == 1
+            if consumed and parent is not None:
+                element.clear()
+                del parent[-1]
+
+        BpmnDiagramGraphStreamingImport.import_collaboration_records(diagram_graph, collaboration,
+                                                                     collaboration_records)
+        BpmnDiagramGraphStreamingImport.import_di_records(diagram_graph, sequence_flows, collaboration, lanes, shapes,
+                                                          edges)
+        bpmn_diagram.rebuild_indexes()
+
+    @staticmethod
+    def get_local_name(tag):
+        """
+        Returns tag name of ElementTree element without namespace.
+
+        :param tag: string object, ElementTree tag in form '{namespace}name'.
+        """
+        return tag.rsplit("}", 1)[-1]
+
+    @staticmethod
+    def import_diagram_and_plane_attributes(diagram_attributes, plane_attributes, diagram_element, plane_element):
+        """
+        Adds attributes of BPMN diagram and plane elements to appropriate fields diagram_attributes and
+        plane_attributes.
+
+        :param diagram_attributes: dictionary that holds attribute values for imported 'BPMNDiagram' element,
+        :param plane_attributes: dictionary that holds attribute values for imported 'BPMNPlane' element,
+        :param diagram_element: ElementTree element representing a BPMN XML 'diagram' element,
+        :param plane_element: ElementTree element representing a BPMN XML 'plane' element.
+        """
+        diagram_attributes[consts.Consts.id] = diagram_element.get(consts.Consts.id, "")
+        diagram_attributes[consts.Consts.name] = diagram_element.get(consts.Consts.name, "")
+        plane_attributes[consts.Consts.id] = plane_element.get(consts.Consts.id, "")
+        plane_attributes[consts.Consts.bpmn_element] = plane_element.get(consts.Consts.bpmn_element, "")
+
+    @staticmethod
+    def import_process_element(process_elements_dict, process_element):
+        """
+        Adds attributes of BPMN process element to process_elements_dict. Returns ID of process.
+
+        :param process_elements_dict: dictionary that holds attribute values for imported 'process' element. Key is
+           process ID, value is a dictionary of attributes,
+        :param process_element: ElementTree element representing a BPMN XML 'process' element.
+        """
+        process_id = process_element.get(consts.Consts.id, "")
+        process_elements_dict[process_id] = {
+            consts.Consts.id: process_id,
+            consts.Consts.name: process_element.get(consts.Consts.name, ""),
+            consts.Consts.is_closed: process_element.get(consts.Consts.is_closed, "false"),
+            consts.Consts.is_executable: process_element.get(consts.Consts.is_executable, "false"),
+            consts.Consts.process_type: process_element.get(consts.Consts.process_type, "None"),
+            consts.Consts.node_ids: []}
+        return process_id
+
+    @staticmethod
+    def import_flow_node_to_graph(diagram_graph, process_id, process_attributes, flow_node_element, node_type):
+        """
+        Adds a new node to graph, using attributes of flow node start tag. Incoming and outgoing flows lists are
+        filled later, when the whole flow node element is read. Returns a dictionary of node attributes.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param process_id: string object, representing an ID of process element,
+        :param process_attributes: dictionary that holds attribute values of 'process' element, which is parent of
+            imported flow node,
+        :param flow_node_element: ElementTree element representing a BPMN XML flow node element,
+        :param node_type: tag name of flow node element without namespace.
+        """
+        element_id = flow_node_element.get(consts.Consts.id, "")
+        diagram_graph.add_node(element_id)
+        node = diagram_graph.node[element_id]
+        node[consts.Consts.id] = element_id
+        node[consts.Consts.type] = node_type
+        node[consts.Consts.node_name] = flow_node_element.get(consts.Consts.name, "")
+        node[consts.Consts.process] = process_id
+        process_attributes[consts.Consts.node_ids].append(element_id)
+        node[consts.Consts.incoming_flow] = []
+        node[consts.Consts.outgoing_flow] = []
+        for attribute, default in BpmnDiagramGraphStreamingImport.flow_node_attributes[node_type]:
+            node[attribute] = flow_node_element.get(attribute, default)
+        return node
+
+    @staticmethod
+    def import_flow_node_children(diagram_graph, flow_node_element, node_type):
+        """
+        Adds information kept in child elements of flow node (incoming and outgoing flows, event definitions) to
+        graph node.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param flow_node_element: ElementTree element representing a BPMN XML flow node element,
+        :param node_type: tag name of flow node element without namespace.
+        """
+        node = diagram_graph.node[flow_node_element.get(consts.Consts.id, "")]
+        for child in flow_node_element:
+            tag_name = BpmnDiagramGraphStreamingImport.get_local_name(child.tag)
+            if tag_name == consts.Consts.incoming_flow:
+                node[consts.Consts.incoming_flow].append(child.text)
+            elif tag_name == consts.Consts.outgoing_flow:
+                node[consts.Consts.outgoing_flow].append(child.text)
+
+        if node_type in BpmnDiagramGraphStreamingImport.event_definitions:
+            event_definitions = BpmnDiagramGraphStreamingImport.event_definitions[node_type]
+            event_def_list = []
+            for child in flow_node_element.iter():
+                tag_name = BpmnDiagramGraphStreamingImport.get_local_name(child.tag)
+                if tag_name in event_definitions:
+                    event_def_list.append({consts.Consts.id: child.get(consts.Consts.id, ""),
+                                           consts.Consts.definition_type: tag_name})
+            node[consts.Consts.event_definitions] = event_def_list
+
+    @staticmethod
+    def read_sequence_flow(flow_element):
+        """
+        Reads attributes of 'sequenceFlow' element. Returns a tuple of flow ID, name, sourceRef, targetRef and
+        condition expression dictionary (None if flow has no condition).
+
+        :param flow_element: ElementTree element representing a BPMN XML 'sequenceFlow' element.
+        """
+        condition_expression = None
+        for child in flow_element:
+            if BpmnDiagramGraphStreamingImport.get_local_name(child.tag) == consts.Consts.condition_expression:
+                condition_expression = {consts.Consts.id: child.get(consts.Consts.id, ""),
+                                        consts.Consts.condition_expression: child.text}
+        return (flow_element.get(consts.Consts.id, ""), flow_element.get(consts.Consts.name, ""),
+                flow_element.get(consts.Consts.source_ref, ""), flow_element.get(consts.Consts.target_ref, ""),
+                condition_expression)
+
+    @staticmethod
+    def import_lane_set_element(lane_set_element, lanes):
+        """
+        Reads 'laneSet' or 'childLaneSet' element. Returns a dictionary of lane set attributes.
+        Diagram Interchange information of lanes is added at the end of import, so dictionaries of all imported lanes
+        are appended to 'lanes' list.
+
+        :param lane_set_element: ElementTree element representing a BPMN XML 'laneSet' or 'childLaneSet' element,
+        :param lanes: list of imported lanes attributes dictionaries.
+        """
+        lanes_attr = {}
+        for lane_element in lane_set_element:
+            if BpmnDiagramGraphStreamingImport.get_local_name(lane_element.tag) != consts.Consts.lane:
+                continue
+            lane_id = lane_element.get(consts.Consts.id, "")
+            child_lane_set_attr = {}
+            flow_node_refs = []
+            for element in lane_element:
+                tag_name = BpmnDiagramGraphStreamingImport.get_local_name(element.tag)
+                if tag_name == consts.Consts.child_lane_set:
+                    child_lane_set_attr = BpmnDiagramGraphStreamingImport.import_lane_set_element(element, lanes)
+                elif tag_name == consts.Consts.flow_node_ref:
+                    flow_node_refs.append(element.text)
+            lane_attr = {consts.Consts.id: lane_id, consts.Consts.name: lane_element.get(consts.Consts.name, ""),
+                         consts.Consts.child_lane_set: child_lane_set_attr,
+                         consts.Consts.flow_node_refs: flow_node_refs}
+            lanes.append(lane_attr)
+            lanes_attr[lane_id] = lane_attr
+        return {consts.Consts.id: lane_set_element.get(consts.Consts.id, ""), consts.Consts.lanes: lanes_attr}
+
+    @staticmethod
+    def read_shape_attributes(shape_element):
+        """
+        Reads attributes of 'BPMNShape' element and its 'Bounds' child element, in the format used by
+        BpmnDiagramGraphImport.add_shape_di_to_graph method.
+
+        :param shape_element: ElementTree element representing a BPMN XML 'BPMNShape' element.
+        """
+        bounds = None
+        for element in shape_element.iter():
+            if BpmnDiagramGraphStreamingImport.get_local_name(element.tag) == "Bounds":
+                bounds = element
+                break
+        return {consts.Consts.is_horizontal: shape_element.get(consts.Consts.is_horizontal, ""),
+                consts.Consts.is_expanded: shape_element.get(consts.Consts.is_expanded),
+                consts.Consts.width: float(bounds.get(consts.Consts.width)),
+                consts.Consts.height: float(bounds.get(consts.Consts.height)),
+                consts.Consts.x: float(bounds.get(consts.Consts.x)),
+                consts.Consts.y: float(bounds.get(consts.Consts.y))}
+
+    @staticmethod
+    def import_collaboration_records(diagram_graph, collaboration, collaboration_records):
+        """
+        Adds participants and message flows read from 'collaboration' element to graph and collaboration dictionary.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param collaboration: dictionary with collaboration element attributes,
+        :param collaboration_records: list of tuples (tag name, ID, name, processRef, sourceRef, targetRef).
+        """
+        for tag_name, element_id, name, process_ref, source_ref, target_ref in collaboration_records:
+            if tag_name == consts.Consts.participant:
+                bpmn_import.BpmnDiagramGraphImport.add_participant_to_graph(
+                    diagram_graph, collaboration[consts.Consts.participants], element_id, name, process_ref)
+            else:
+                bpmn_import.BpmnDiagramGraphImport.add_message_flow_to_graph(
+                    diagram_graph, collaboration[consts.Consts.message_flows], element_id, name, source_ref,
+                    target_ref)
+
+    @staticmethod
+    def import_di_records(diagram_graph, sequence_flows, collaboration, lanes, shapes, edges):
+        """
+        Adds Diagram Interchange information read from 'BPMNPlane' element to graph nodes, edges, lanes and
+        participants.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param sequence_flows: dictionary (associative list) of sequence flows existing in diagram,
+        :param collaboration: dictionary with collaboration element attributes,
+        :param lanes: list of imported lanes attributes dictionaries,
+        :param shapes: list of tuples (bpmnElement, shape attributes dictionary),
+        :param edges: list of tuples (bpmnElement, list of waypoints).
+        """
+        shapes_by_element = dict(shapes)
+        for lane_attr in lanes:
+            if lane_attr[consts.Consts.id] in shapes_by_element:
+                bpmn_import.BpmnDiagramGraphImport.add_lane_di(lane_attr,
+                                                               shapes_by_element[lane_attr[consts.Consts.id]])
+
+        participants = collaboration.get(consts.Consts.participants, {})
+        message_flows = collaboration.get(consts.Consts.message_flows, {})
+        for element_id, shape_attributes in shapes:
+            bpmn_import.BpmnDiagramGraphImport.add_shape_di_to_graph(participants, diagram_graph, element_id,
+                                                                     shape_attributes)
+        for flow_id, waypoints in edges:
+            bpmn_import.BpmnDiagramGraphImport.add_flow_di_to_graph(diagram_graph, sequence_flows, message_flows,
+                                                                    flow_id, waypoints)
@@ -10,18 +10,37 @@ class BpmnImportUtils(object):
     """
     Class including utility method used in diagram importing
     """
+    # flow node types, that are classified, with their base classification labels
+    classification_types = [(consts.Consts.task, ["Element"]),
+                            (consts.Consts.subprocess, ["Element"]),
+                            (consts.Consts.complex_gateway, ["Element"]),
+                            (consts.Consts.event_based_gateway, ["Element"]),
+                            (consts.Consts.inclusive_gateway, ["Element"]),
+                            (consts.Consts.exclusive_gateway, ["Element"]),
+                            (consts.Consts.parallel_gateway, ["Element"]),
+                            (consts.Consts.start_event, ["Element", "Start Event"]),
+                            (consts.Consts.intermediate_catch_event, ["Element"]),
+                            (consts.Consts.end_event, ["Element", "End Event"]),
+                            (consts.Consts.intermediate_throw_event, ["Element"])]
 
     def __init__(self):
         pass
 
+    # tag name -> tag name without namespace prefix, documents use only a small set of distinct tag names
+    local_names = {}
+
     @staticmethod
     def remove_namespace_from_tag_name(tag_name):
         """
-        Helper function, removes namespace annotation from tag name.
+        Helper function, removes namespace annotation from tag name. Results are memoized.
 
         :param tag_name: string with tag name.
         """
-        return tag_name.split(':')[-1]
+        local_name = BpmnImportUtils.local_names.get(tag_name)
+        if local_name is None:
+            local_name = tag_name.split(':')[-1]
+            BpmnImportUtils.local_names[tag_name] = local_name
+        return local_name
 
     @staticmethod
     def iterate_elements(parent):
@@ -35,6 +54,54 @@ class BpmnImportUtils(object):
             yield element
             element = element.nextSibling
 
+    @staticmethod
+    def add_flow_edge(diagram_graph, flow_id, source_ref, target_ref):
+        """
+        Helper function, adds an edge representing flow to graph and returns a dictionary of edge attributes.
+        For multigraph (nx.MultiDiGraph) flow ID is used as an edge key, so flows connecting the same pair of nodes
+        are kept as separate edges. For simple graph (nx.Graph) such flows share one edge.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param flow_id: string object, ID of flow,
+        :param source_ref: string object, ID of source node,
+        :param target_ref: string object, ID of target node.
+        """
+        if diagram_graph.is_multigraph():
+            diagram_graph.add_edge(source_ref, target_ref, key=flow_id)
+            return diagram_graph[source_ref][target_ref][flow_id]
+        diagram_graph.add_edge(source_ref, target_ref)
+        return diagram_graph[source_ref][target_ref]
+
+    @staticmethod
+    def get_flow_edge(diagram_graph, flow_id, source_ref, target_ref):
+        """
+        Helper function, returns a dictionary of attributes of edge representing flow, or None if there is no such
+        edge. For simple graph (nx.Graph) the edge connecting source and target node is returned, regardless of
+        flow ID kept in its attributes.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param flow_id: string object, ID of flow,
+        :param source_ref: string object, ID of source node,
+        :param target_ref: string object, ID of target node.
+        """
+        return diagram_graph.get_edge_data(source_ref, target_ref, key=flow_id) if diagram_graph.is_multigraph() \
+            else diagram_graph.get_edge_data(source_ref, target_ref)
+
+    @staticmethod
+    def remove_flow_edge(diagram_graph, flow_id, source_ref, target_ref):
+        """
+        Helper function, removes an edge representing flow from graph.
+
+        :param diagram_graph: NetworkX graph representing a BPMN process diagram,
+        :param flow_id: string object, ID of flow,
+        :param source_ref: string object, ID of source node,
+        :param target_ref: string object, ID of target node.
+        """
+        if diagram_graph.is_multigraph():
+            diagram_graph.remove_edge(source_ref, target_ref, key=flow_id)
+        else:
+            diagram_graph.remove_edge(source_ref, target_ref)
+
     @staticmethod
     def generate_nodes_clasification(bpmn_diagram):
         """
@@ -51,81 +118,37 @@ class BpmnImportUtils(object):
         :return: a dictionary of classification labels. Key - node id. Values - a list of labels.
         """
         nodes_classification = {}
-
-        classification_element = "Element"
-        classification_start_event = "Start Event"
-        classification_end_event = "End Event"
-
-        task_list = bpmn_diagram.get_nodes(consts.Consts.task)
-        for element in task_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        subprocess_list = bpmn_diagram.get_nodes(consts.Consts.subprocess)
-        for element in subprocess_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        complex_gateway_list = bpmn_diagram.get_nodes(consts.Consts.complex_gateway)
-        for element in complex_gateway_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        event_based_gateway_list = bpmn_diagram.get_nodes(consts.Consts.event_based_gateway)
-        for element in event_based_gateway_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        inclusive_gateway_list = bpmn_diagram.get_nodes(consts.Consts.inclusive_gateway)
-        for element in inclusive_gateway_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        exclusive_gateway_list = bpmn_diagram.get_nodes(consts.Consts.exclusive_gateway)
-        for element in exclusive_gateway_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        parallel_gateway_list = bpmn_diagram.get_nodes(consts.Consts.parallel_gateway)
-        for element in parallel_gateway_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        start_event_list = bpmn_diagram.get_nodes(consts.Consts.start_event)
-        for element in start_event_list:
-            classification_labels = [classification_element, classification_start_event]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        intermediate_catch_event_list = bpmn_diagram.get_nodes(consts.Consts.intermediate_catch_event)
-        for element in intermediate_catch_event_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        end_event_list = bpmn_diagram.get_nodes(consts.Consts.end_event)
-        for element in end_event_list:
-            classification_labels = [classification_element, classification_end_event]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
-        intermediate_throw_event_list = bpmn_diagram.get_nodes(consts.Consts.intermediate_throw_event)
-        for element in intermediate_throw_event_list:
-            classification_labels = [classification_element]
-            BpmnImportUtils.split_join_classification(element, classification_labels, nodes_classification)
-
+        for (element, classification_labels) in BpmnImportUtils.classify_nodes(bpmn_diagram):
+            nodes_classification[element[0]] = classification_labels
         return nodes_classification
 
     @staticmethod
-    def split_join_classification(element, classification_labels, nodes_classification):
+    def classify_nodes(bpmn_diagram):
         """
-        Add the "Split", "Join" classification, if the element qualifies for.
+        Assigns classification labels (see generate_nodes_clasification) to diagram elements in a single pass over
+        diagram nodes. Base labels are taken from classification_types table, "Join" and "Split" labels are derived
+        from number of incoming and outgoing flows. Nodes of types missing in the table are not classified.
 
-        :param element: an element from BPMN diagram,
-        :param classification_labels: list of labels attached to the element,
-        :param nodes_classification: dictionary of classification labels. Key - node id. Value - a list of labels.
+        :param bpmn_diagram: BPMNDiagramGraph class instance representing a BPMN process diagram.
+        :return: a list of pairs (node, list of labels), nodes are ordered by type (in order of
+            classification_types table), nodes of the same type keep the order of diagram nodes.
         """
         classification_join = "Join"
         classification_split = "Split"
-        if len(element[1][consts.Consts.incoming_flow]) >= 2:
-            classification_labels.append(classification_join)
-        if len(element[1][consts.Consts.outgoing_flow]) >= 2:
-            classification_labels.append(classification_split)
-        nodes_classification[element[0]] = classification_labels
+
+        classified_nodes_by_type = dict((node_type, []) for (node_type, _) in BpmnImportUtils.classification_types)
+        for element in bpmn_diagram.get_nodes():
+            classified_nodes = classified_nodes_by_type.get(element[1].get(consts.Consts.type))
+            if classified_nodes is not None:
+                classified_nodes.append(element)
+
+        nodes_classification = []
+        for (node_type, labels) in BpmnImportUtils.classification_types:
+            for element in classified_nodes_by_type[node_type]:
+                classification_labels = list(labels)
+                if len(element[1][consts.Consts.incoming_flow]) >= 2:
+                    classification_labels.append(classification_join)
+                if len(element[1][consts.Consts.outgoing_flow]) >= 2:
+                    classification_labels.append(classification_split)
+                nodes_classification.append((element, classification_labels))
+        return nodes_classification
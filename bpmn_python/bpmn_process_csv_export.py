@@ -12,7 +12,6 @@ import string
 
 import bpmn_python.bpmn_python_consts as consts
 import bpmn_python.bpmn_diagram_exception as bpmn_exception
-import bpmn_python.bpmn_import_utils as utils
 
 
 class BpmnDiagramGraphCsvExport(object):
@@ -60,7 +59,7 @@ class BpmnDiagramGraphCsvExport(object):
         if len(start_nodes) != 1:
             raise bpmn_exception.BpmnPythonError("Exporting to CSV format accepts only one start event")
 
-        nodes_classification = utils.BpmnImportUtils.generate_nodes_clasification(bpmn_diagram)
+        nodes_classification = bpmn_diagram.get_nodes_classification()
         start_node = start_nodes.pop()
         BpmnDiagramGraphCsvExport.export_node(bpmn_diagram, export_elements, start_node, nodes_classification)
 
@@ -13,6 +13,7 @@ import six
 
 import bpmn_python.bpmn_python_consts as consts
 import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_import_utils as utils
 
 regex_pa_trailing_number = r'^(.*[a-z|A-Z]|[^0-9]?)([0-9]+)$'
 regex_pa_trailing_letter = r'(.+)([a-z|A-Z])'
@@ -309,15 +310,15 @@ def add_edge(from_node_id, to_node_id, process_dict, bpmn_diagram, sequence_flow
     :param sequence_flows:
     """
     condition = get_connection_condition_if_present(to_node_id, process_dict)
-    bpmn_diagram.diagram_graph.add_edge(from_node_id, to_node_id)
     flow_id = get_flow_id(from_node_id, to_node_id)
-    bpmn_diagram.diagram_graph[from_node_id][to_node_id][consts.Consts.id] = flow_id
-    bpmn_diagram.diagram_graph[from_node_id][to_node_id][consts.Consts.process] = default_process_id
-    bpmn_diagram.diagram_graph[from_node_id][to_node_id][consts.Consts.name] = ""
-    bpmn_diagram.diagram_graph[from_node_id][to_node_id][consts.Consts.source_ref] = from_node_id
-    bpmn_diagram.diagram_graph[from_node_id][to_node_id][consts.Consts.target_ref] = to_node_id
+    flow = utils.BpmnImportUtils.add_flow_edge(bpmn_diagram.diagram_graph, flow_id, from_node_id, to_node_id)
+    flow[consts.Consts.id] = flow_id
+    flow[consts.Consts.process] = default_process_id
+    flow[consts.Consts.name] = ""
+    flow[consts.Consts.source_ref] = from_node_id
+    flow[consts.Consts.target_ref] = to_node_id
     if bool(condition):
-        bpmn_diagram.diagram_graph[from_node_id][to_node_id][consts.Consts.condition_expression] = {
+        flow[consts.Consts.condition_expression] = {
             consts.Consts.id: flow_id + "_cond",
             consts.Consts.condition_expression: condition
         }
@@ -507,7 +508,7 @@ def remove_outgoing_connection(base_node, bpmn_diagram, sequence_flows):
     neighbour_node = sequence_flows[outgoing_flow_id][consts.Consts.target_ref]
     bpmn_diagram.diagram_graph.node[neighbour_node][consts.Consts.incoming_flow].remove(outgoing_flow_id)
     del sequence_flows[outgoing_flow_id]
-    bpmn_diagram.diagram_graph.remove_edge(base_node, neighbour_node)
+    utils.BpmnImportUtils.remove_flow_edge(bpmn_diagram.diagram_graph, outgoing_flow_id, base_node, neighbour_node)
     return neighbour_node
 
 
@@ -523,7 +524,7 @@ def remove_incoming_connection(base_node, bpmn_diagram, sequence_flows):
     neighbour_node = sequence_flows[incoming_flow_id][consts.Consts.source_ref]
     bpmn_diagram.diagram_graph.node[neighbour_node][consts.Consts.outgoing_flow].remove(incoming_flow_id)
     del sequence_flows[incoming_flow_id]
-    bpmn_diagram.diagram_graph.remove_edge(neighbour_node, base_node)
+    utils.BpmnImportUtils.remove_flow_edge(bpmn_diagram.diagram_graph, incoming_flow_id, neighbour_node, base_node)
     return neighbour_node
 
 
@@ -538,6 +539,16 @@ def remove_node(node_id_to_remove, process_dict, bpmn_diagram, sequence_flows):
     """
     new_source_node = remove_incoming_connection(node_id_to_remove, bpmn_diagram, sequence_flows)
     new_target_node = remove_outgoing_connection(node_id_to_remove, bpmn_diagram, sequence_flows)
+    # remaining flows are removed from graph together with the node, so they have to be dropped from flow index too
+    node = bpmn_diagram.diagram_graph.node[node_id_to_remove]
+    for flow_id in node[consts.Consts.incoming_flow][1:]:
+        flow = sequence_flows.pop(flow_id, None)
+        if flow is not None:
+            bpmn_diagram.diagram_graph.node[flow[consts.Consts.source_ref]][consts.Consts.outgoing_flow].remove(flow_id)
+    for flow_id in node[consts.Consts.outgoing_flow][1:]:
+        flow = sequence_flows.pop(flow_id, None)
+        if flow is not None:
+            bpmn_diagram.diagram_graph.node[flow[consts.Consts.target_ref]][consts.Consts.incoming_flow].remove(flow_id)
     bpmn_diagram.diagram_graph.remove_node(node_id_to_remove)
     process_dict.pop(node_id_to_remove, None)
     # add new connection
@@ -601,6 +612,7 @@ class BpmnDiagramGraphCSVImport(object):
 
         BpmnDiagramGraphCSVImport.import_nodes(process_dict, bpmn_diagram, sequence_flows)
         BpmnDiagramGraphCSVImport.representation_adjustment(process_dict, bpmn_diagram, sequence_flows)
+        bpmn_diagram.rebuild_indexes()
 
     @staticmethod
     def import_csv_file_as_dict(filepath):
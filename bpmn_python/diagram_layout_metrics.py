@@ -3,11 +3,72 @@
 Collection of different metrics used to compare diagram layout quality
 """
 import copy
+import math
+
+import networkx as nx
+import numpy as np
+
 import bpmn_python.bpmn_python_consts as consts
 
+# upper limit of candidate segment pairs evaluated at once by vectorized crossing counter
+crossing_pairs_chunk_size = 1 << 20
+
 
 def count_crossing_points(bpmn_graph):
     """
+    Counts crossing points of flow segments. Segments are put into buckets of a uniform grid, covering their
+    bounding boxes, so only pairs of segments sharing a grid cell are tested for intersection.
+    Result is the same as result of count_crossing_points_pairwise.
+
+    :param bpmn_graph:
+    :return:
+    """
+    flows = bpmn_graph.get_flows()
+    segments = get_flows_segments(flows)
+    if len(segments) < 2:
+        return 0
+
+    bounds = [get_segment_bounds(segment) for segment in segments]
+    min_x = min(bound[0] for bound in bounds)
+    min_y = min(bound[1] for bound in bounds)
+    size = max(max(bound[2] for bound in bounds) - min_x, max(bound[3] for bound in bounds) - min_y)
+    # about sqrt(n) x sqrt(n) cells
+    cell_size = float(size) / math.ceil(math.sqrt(len(segments)))
+    if cell_size <= 0:
+        cell_size = 1.0
+
+    grid = {}
+    for index, (left, bottom, right, top) in enumerate(bounds):
+        for column in range(int((left - min_x) // cell_size), int((right - min_x) // cell_size) + 1):
+            for row in range(int((bottom - min_y) // cell_size), int((top - min_y) // cell_size) + 1):
+                grid.setdefault((column, row), []).append(index)
+
+    crossing_point_num = 0
+    for (column, row), cell_segments in grid.items():
+        for position, index_one in enumerate(cell_segments):
+            bound_one = bounds[index_one]
+            for index_two in cell_segments[position + 1:]:
+                bound_two = bounds[index_two]
+                left = max(bound_one[0], bound_two[0])
+                bottom = max(bound_one[1], bound_two[1])
+                if left > min(bound_one[2], bound_two[2]) or bottom > min(bound_one[3], bound_two[3]):
+                    continue
+                # pair of segments is tested only in the cell, that contains corner of bounding boxes intersection
+                if int((left - min_x) // cell_size) != column or int((bottom - min_y) // cell_size) != row:
+                    continue
+                segment_one = segments[index_one]
+                segment_two = segments[index_two]
+                if segments_common_points(segment_one, segment_two) is False \
+                        and do_intersect(segment_one, segment_two):
+                    crossing_point_num += 1
+
+    return crossing_point_num
+
+
+def count_crossing_points_pairwise(bpmn_graph):
+    """
+    Counts crossing points of flow segments, testing every pair of segments. Reference implementation
+    of count_crossing_points.
 
     :param bpmn_graph:
     :return:
@@ -25,6 +86,135 @@ def count_crossing_points(bpmn_graph):
     return crossing_point_num
 
 
+def get_segments_array(bpmn_graph):
+    """
+    Packs flow segments of diagram into NumPy array of shape (n, 4). Each row holds coordinates of segment
+    in order: source x, source y, target x, target y.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: NumPy array of floats.
+    """
+    coordinates = []
+    for flow in bpmn_graph.get_flows():
+        waypoints = flow[2][consts.Consts.waypoints]
+        for source, target in zip(waypoints, waypoints[1:]):
+            coordinates.append((source[0], source[1], target[0], target[1]))
+    return np.array(coordinates, dtype=np.float64).reshape(-1, 4)
+
+
+def count_crossing_points_vectorized(bpmn_graph):
+    """
+    Counts crossing points of flow segments with NumPy array operations. Result is the same as result
+    of count_crossing_points.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: number of crossing points.
+    """
+    return count_crossing_points_batch([bpmn_graph])[0]
+
+
+def count_crossing_points_batch(layouts):
+    """
+    Counts crossing points of flow segments for a batch of diagram layouts. Segments of all layouts are packed into
+    one array, candidate pairs (segments from the same layout with overlapping bounding boxes) are found after sorting
+    segments by x, and intersection tests of candidate pairs are evaluated as array operations.
+    Result for each layout is the same as result of count_crossing_points.
+
+    :param layouts: list of BpmnDiagramGraph instances or NumPy arrays returned by get_segments_array.
+    :return: list of crossing points numbers, one for each layout.
+    """
+    arrays = [layout if isinstance(layout, np.ndarray) else get_segments_array(layout) for layout in layouts]
+    if not arrays:
+        return []
+    segments = np.concatenate(arrays)
+    layout_ids = np.repeat(np.arange(len(arrays)), [len(array) for array in arrays])
+    crossings = np.zeros(len(arrays), dtype=np.int64)
+    if len(segments) < 2:
+        return crossings.tolist()
+
+    left = np.minimum(segments[:, 0], segments[:, 2])
+    right = np.maximum(segments[:, 0], segments[:, 2])
+    bottom = np.minimum(segments[:, 1], segments[:, 3])
+    top = np.maximum(segments[:, 1], segments[:, 3])
+    # layouts are moved apart along x axis, so that their segments are never paired in sweep below. Shifted
+    # coordinates are used only to find candidate pairs, intersection tests use original coordinates
+    stride = float(right.max() - left.min()) + 1.0
+    shift = layout_ids * stride - left.min()
+    order = np.argsort(left + shift, kind="mergesort")
+    sorted_left = (left + shift)[order]
+    sorted_right = (right + shift)[order]
+    # segment at position p of sorted order is paired with segments at positions (p, end[p])
+    end = np.searchsorted(sorted_left, sorted_right, side="right")
+    pairs_counts = end - np.arange(len(order)) - 1
+
+    cumulative_counts = np.cumsum(pairs_counts)
+    first_position = 0
+    while first_position < len(order):
+        processed_pairs = cumulative_counts[first_position - 1] if first_position > 0 else 0
+        last_position = max(first_position + 1, int(np.searchsorted(
+            cumulative_counts, processed_pairs + crossing_pairs_chunk_size, side="right")))
+        positions = np.arange(first_position, last_position)
+        counts = pairs_counts[first_position:last_position]
+        first = np.repeat(positions, counts)
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        second = first + 1 + np.arange(len(first)) - offsets
+        first = order[first]
+        second = order[second]
+        # only pairs from the same layout, with overlapping y ranges, are tested for intersection
+        candidates = (layout_ids[first] == layout_ids[second]) \
+            & (np.maximum(bottom[first], bottom[second]) <= np.minimum(top[first], top[second]))
+        first = first[candidates]
+        second = second[candidates]
+        crossing = crossing_segments_pairs(segments[first], segments[second])
+        crossings += np.bincount(layout_ids[first[crossing]], minlength=len(arrays))
+        first_position = last_position
+    return crossings.tolist()
+
+
+def crossing_segments_pairs(segments_one, segments_two):
+    """
+    Vectorized equivalent of 'segments_common_points(...) is False and do_intersect(...)', evaluated for pairs
+    of segments given as rows of two arrays of shape (n, 4).
+
+    :param segments_one: NumPy array of first segments of pairs,
+    :param segments_two: NumPy array of second segments of pairs.
+    :return: NumPy array of booleans.
+    """
+    (x1, y1, x2, y2) = (segments_one[:, 0], segments_one[:, 1], segments_one[:, 2], segments_one[:, 3])
+    (x3, y3, x4, y4) = (segments_two[:, 0], segments_two[:, 1], segments_two[:, 2], segments_two[:, 3])
+
+    common_points = ((x1 == x3) & (y1 == y3)) | ((x1 == x4) & (y1 == y4)) \
+        | ((x2 == x3) & (y2 == y3)) | ((x2 == x4) & (y2 == y4))
+
+    o1 = orientation_array(x1, y1, x2, y2, x3, y3)
+    o2 = orientation_array(x1, y1, x2, y2, x4, y4)
+    o3 = orientation_array(x3, y3, x4, y4, x1, y1)
+    o4 = orientation_array(x3, y3, x4, y4, x2, y2)
+
+    intersect = ((o1 != o2) & (o3 != o4)) \
+        | ((o1 == 0) & lies_on_segment_array(x1, y1, x2, y2, x3, y3)) \
+        | ((o2 == 0) & lies_on_segment_array(x1, y1, x2, y2, x4, y4)) \
+        | ((o3 == 0) & lies_on_segment_array(x3, y3, x4, y4, x1, y1)) \
+        | ((o4 == 0) & lies_on_segment_array(x3, y3, x4, y4, x2, y2))
+    return ~common_points & intersect
+
+
+def orientation_array(x1, y1, x2, y2, x3, y3):
+    """
+    Vectorized equivalent of orientation function, returns sign of orientation value (0 for collinear points,
+    1 for clockwise and -1 for counterclockwise orientation).
+    """
+    return np.sign((y2 - y1) * (x3 - x2) - (x2 - x1) * (y3 - y2))
+
+
+def lies_on_segment_array(x1, y1, x2, y2, x3, y3):
+    """
+    Vectorized equivalent of lies_on_segment function.
+    """
+    return (np.minimum(x1, x2) <= x3) & (x3 <= np.maximum(x1, x2)) \
+        & (np.minimum(y1, y2) <= y3) & (y3 <= np.maximum(y1, y2))
+
+
 def compute_determinant(p1, p2, p3):
     """
 
@@ -33,8 +223,8 @@ def compute_determinant(p1, p2, p3):
     :param p3:
     :return:
     """
-    det = float(p1[0]) * float(p2[1]) + float(p2[0]) * float(p3[1]) + float(p3[0]) * float(p1[1])
-    det -= float(p1[0]) * float(p3[1]) + float(p2[0]) * float(p1[1]) + float(p3[0]) * float(p2[1])
+    det = p1[0] * p2[1] + p2[0] * p3[1] + p3[0] * p1[1]
+    det -= p1[0] * p3[1] + p2[0] * p1[1] + p3[0] * p2[1]
     return det
 
 
@@ -57,16 +247,28 @@ def get_flows_segments(flows):
 
     segments = []
     for flow in flows:
-        waypoints = copy.deepcopy(flow[2][consts.Consts.waypoints])
-        source = waypoints.pop(0)
-        while len(waypoints) > 0:
-            target = waypoints.pop(0)
-            segments.append({source_param_name: {consts.Consts.x: float(source[0]), consts.Consts.y: float(source[1])},
-                             target_param_name: {consts.Consts.x: float(target[0]), consts.Consts.y: float(target[1])}})
-            source = target
+        waypoints = flow[2][consts.Consts.waypoints]
+        for source, target in zip(waypoints, waypoints[1:]):
+            segments.append({source_param_name: {consts.Consts.x: source[0], consts.Consts.y: source[1]},
+                             target_param_name: {consts.Consts.x: target[0], consts.Consts.y: target[1]}})
     return segments
 
 
+def get_segment_bounds(segment):
+    """
+    Returns bounding box of segment as a tuple (min x, min y, max x, max y).
+
+    :param segment:
+    :return:
+    """
+    source = segment["source"]
+    target = segment["target"]
+    return (min(source[consts.Consts.x], target[consts.Consts.x]),
+            min(source[consts.Consts.y], target[consts.Consts.y]),
+            max(source[consts.Consts.x], target[consts.Consts.x]),
+            max(source[consts.Consts.y], target[consts.Consts.y]))
+
+
 def segments_common_points(segment_one, segment_two):
     """
 
@@ -175,26 +377,148 @@ def count_segments(bpmn_graph):
 
 def compute_longest_path(bpmn_graph):
     """
-
-    :param bpmn_graph:
+    Computes the longest path (measured in number of nodes) from node without incoming flows to node without outgoing
+    flows. Flow graph is condensed into strongly connected components, that are processed in reverse topological
+    order, so path suffixes are computed once for each node entering a component. Only paths inside cycles are
+    searched exhaustively, so time of computation grows exponentially with number of splits on cycles. Result is
+    the same as result of search with find_longest_path.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: a tuple, where first value is a list of nodes (pairs of node ID and node attributes) and second value
+        is its length.
     """
-    incoming_flows_list_param_name = "incoming"
-
-    nodes = copy.deepcopy(bpmn_graph.get_nodes())
-    no_incoming_flow_nodes = []
-    for node in nodes:
-        incoming_list = node[1][incoming_flows_list_param_name]
-        if len(incoming_list) == 0:
-            no_incoming_flow_nodes.append(node)
+    nodes = bpmn_graph.get_nodes()
+    (successors, components, components_entries) = get_flows_condensation(bpmn_graph)
+    suffixes = {}
+    for entries in components_entries:
+        for node_id in entries:
+            suffixes[node_id] = find_longest_path_in_component(node_id, successors, components, suffixes)
 
     longest_path = []
-    for node in no_incoming_flow_nodes:
-        (output_path, output_path_len) = find_longest_path([], node, bpmn_graph)
-        if output_path_len > len(longest_path):
-            longest_path = output_path
+    for (node_id, node) in nodes:
+        if len(node[consts.Consts.incoming_flow]) == 0:
+            suffix = suffixes[node_id]
+            if suffix is not None and len(suffix) > len(longest_path):
+                longest_path = suffix
+    node_by_id = dict(nodes)
+    longest_path = [(node_id, node_by_id[node_id]) for node_id in longest_path]
     return longest_path, len(longest_path)
 
 
+def get_flows_condensation(bpmn_graph):
+    """
+    Builds condensation of directed graph of flows.
+
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: a tuple of three values - dictionary of successors (list of target node IDs of outgoing flows,
+        in order of outgoing flows list) for each node ID, dictionary of component index for each node ID
+        and list of entries of components (node IDs without incoming flows or with incoming flows from other
+        components) in reverse topological order of components.
+    """
+    successors = {}
+    flows_graph = nx.DiGraph()
+    for (node_id, node) in bpmn_graph.get_nodes():
+        flows_graph.add_node(node_id)
+        successors[node_id] = [bpmn_graph.get_flow_by_id(flow_id)[2][consts.Consts.target_ref]
+                               for flow_id in node[consts.Consts.outgoing_flow]]
+        for target_id in successors[node_id]:
+            flows_graph.add_edge(node_id, target_id)
+
+    condensation = nx.condensation(flows_graph)
+    components = condensation.graph["mapping"]
+    components_entries = []
+    for component in reversed(list(nx.topological_sort(condensation))):
+        members = condensation.nodes[component]["members"]
+        if len(members) == 1:
+            components_entries.append(list(members))
+        else:
+            components_entries.append([node_id for node_id in members
+                                       if any(components[source_id] != component
+                                              for source_id in flows_graph.predecessors(node_id))])
+    return successors, components, components_entries
+
+
+def find_longest_path_in_component(node_id, successors, components, suffixes):
+    """
+    Finds the longest path starting at given node, that ends in node without outgoing flows. Search is exhaustive
+    inside strongly connected component of node, paths leaving the component are continued with suffixes computed
+    for entries of other components. Search uses explicit stack and set of nodes on current path instead of
+    recursion, partial results are linked (length, node ID, suffix) tuples, so extending path takes constant time.
+
+    Number of simple paths inside component (and time of search) grows exponentially with number of splits on cycles,
+    e.g. with number of split/join blocks placed inside a loop.
+
+    :param node_id: ID of node,
+    :param successors: dictionary of successors of nodes returned by get_flows_condensation,
+    :param components: dictionary of component indexes returned by get_flows_condensation,
+    :param suffixes: dictionary of the longest paths starting at component entries (lists of node IDs or None,
+        if no such path exists).
+    :return: list of node IDs or None, if path does not exist.
+    """
+    # each frame holds node ID, position of next successor, the longest suffix found so far and flag, if node of
+    # previous frame was added to set of nodes on path, when frame was pushed (it is not in case of self loop)
+    stack = [[node_id, 0, None, False]]
+    previous_nodes = set()
+    while True:
+        frame = stack[-1]
+        (current_id, position, longest_suffix, added_previous) = frame
+        current_successors = successors[current_id]
+        if position < len(current_successors):
+            frame[1] += 1
+            target_id = current_successors[position]
+            if target_id in previous_nodes:
+                continue
+            if components[target_id] == components[current_id]:
+                stack.append([target_id, 0, None, current_id not in previous_nodes])
+                previous_nodes.add(current_id)
+                continue
+            suffix = suffixes[target_id]
+            if suffix is not None and (longest_suffix is None or len(suffix) > get_linked_path_length(longest_suffix)):
+                frame[2] = suffix
+            continue
+
+        stack.pop()
+        if len(current_successors) == 0:
+            path = (1, current_id, None)
+        elif longest_suffix is not None:
+            path = (get_linked_path_length(longest_suffix) + 1, current_id, longest_suffix)
+        else:
+            path = None
+        if len(stack) == 0:
+            return get_path_from_linked_path(path)
+        if added_previous:
+            previous_nodes.discard(stack[-1][0])
+        previous_frame = stack[-1]
+        if path is not None and (previous_frame[2] is None or path[0] > get_linked_path_length(previous_frame[2])):
+            previous_frame[2] = path
+
+
+def get_linked_path_length(path):
+    """
+    :param path: linked path (tuple of path length, node ID and linked suffix) or list of node IDs.
+    :return: number of node IDs on path.
+    """
+    return path[0] if isinstance(path, tuple) else len(path)
+
+
+def get_path_from_linked_path(path):
+    """
+    Converts linked path, built by search of the longest path in component, to list of node IDs.
+
+    :param path: linked path (tuple of path length, node ID and linked suffix), list of node IDs or None.
+    :return: list of node IDs or None, if path is None.
+    """
+    if path is None:
+        return None
+    node_ids = []
+    while isinstance(path, tuple):
+        node_ids.append(path[1])
+        path = path[2]
+    if path is not None:
+        node_ids.extend(path)
+    return node_ids
+
+
 def find_longest_path(previous_nodes, node, bpmn_graph):
     """
 
@@ -226,26 +550,82 @@ def find_longest_path(previous_nodes, node, bpmn_graph):
 
 def compute_longest_path_tasks(bpmn_graph):
     """
+    Computes the path, starting at node without incoming flows, with the biggest number of tasks and subprocesses.
+    Uses condensation of flow graph in the same way as compute_longest_path. Result is the same as result of search
+    with find_longest_path_tasks.
 
-    :param bpmn_graph:
+    :param bpmn_graph: an instance of BpmnDiagramGraph class.
+    :return: a tuple, where first value is a list of tasks and subprocesses (pairs of node ID and node attributes)
+        on the path and second value is its length.
     """
-    incoming_flows_list_param_name = "incoming"
-
-    nodes = copy.deepcopy(bpmn_graph.get_nodes())
-    no_incoming_flow_nodes = []
-    for node in nodes:
-        incoming_list = node[1][incoming_flows_list_param_name]
-        if len(incoming_list) == 0:
-            no_incoming_flow_nodes.append(node)
+    nodes = bpmn_graph.get_nodes()
+    node_by_id = dict(nodes)
+    (successors, components, components_entries) = get_flows_condensation(bpmn_graph)
+    suffixes = {}
+    for entries in components_entries:
+        for node_id in entries:
+            suffixes[node_id] = find_longest_path_tasks_in_component(node_id, node_by_id, successors, components,
+                                                                     suffixes)
 
     longest_path = []
-    for node in no_incoming_flow_nodes:
-        (all_nodes, qualified_nodes) = find_longest_path_tasks([], [], node, bpmn_graph)
-        if len(qualified_nodes) > len(longest_path):
-            longest_path = qualified_nodes
+    for (node_id, node) in nodes:
+        if len(node[consts.Consts.incoming_flow]) == 0 and len(suffixes[node_id]) > len(longest_path):
+            longest_path = suffixes[node_id]
+    longest_path = [(node_id, node_by_id[node_id]) for node_id in longest_path]
     return longest_path, len(longest_path)
 
 
+def find_longest_path_tasks_in_component(node_id, node_by_id, successors, components, suffixes):
+    """
+    Finds tasks and subprocesses on path starting at given node, that has the biggest number of them. Path ends
+    in node without outgoing flows or in node with flow to previous node of path. Search is exhaustive inside strongly
+    connected component of node, paths leaving the component are continued with suffixes computed for entries
+    of other components. Search is iterative, in the same way as in find_longest_path_in_component, and its time
+    also grows exponentially with number of splits on cycles.
+
+    :param node_id: ID of node,
+    :param node_by_id: dictionary of node attributes,
+    :param successors: dictionary of successors of nodes returned by get_flows_condensation,
+    :param components: dictionary of component indexes returned by get_flows_condensation,
+    :param suffixes: dictionary of task lists computed for component entries.
+    :return: list of node IDs.
+    """
+    node_names = {"task", "subProcess"}
+    # frames have the same structure as frames of find_longest_path_in_component
+    stack = [[node_id, 0, None, False]]
+    previous_nodes = set()
+    while True:
+        frame = stack[-1]
+        (current_id, position, longest_suffix, added_previous) = frame
+        current_successors = successors[current_id]
+        if position < len(current_successors):
+            frame[1] += 1
+            target_id = current_successors[position]
+            if target_id in previous_nodes:
+                suffix = []
+            elif components[target_id] == components[current_id]:
+                stack.append([target_id, 0, None, current_id not in previous_nodes])
+                previous_nodes.add(current_id)
+                continue
+            else:
+                suffix = suffixes[target_id]
+            if longest_suffix is None or len(suffix) > get_linked_path_length(longest_suffix):
+                frame[2] = suffix
+            continue
+
+        stack.pop()
+        path = longest_suffix if longest_suffix is not None else []
+        if node_by_id[current_id][consts.Consts.type] in node_names:
+            path = (get_linked_path_length(path) + 1, current_id, path)
+        if len(stack) == 0:
+            return get_path_from_linked_path(path)
+        if added_previous:
+            previous_nodes.discard(stack[-1][0])
+        previous_frame = stack[-1]
+        if previous_frame[2] is None or get_linked_path_length(path) > get_linked_path_length(previous_frame[2]):
+            previous_frame[2] = path
+
+
 def find_longest_path_tasks(path, qualified_nodes, node, bpmn_graph):
     """
 
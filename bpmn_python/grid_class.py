@@ -0,0 +1,145 @@
+# coding=utf-8
+"""
+Grid represents a two-dimensional grid layout, that consists of cells with node elements. It is used in diagram
+layouting process
+"""
+import bisect
+
+import bpmn_python.bpmn_python_consts as consts
+import bpmn_python.grid_cell_class as cell_class
+
+
+class Grid(object):
+    """
+    Helper class used for Grid representation. Cells are indexed by node ID and by coordinates (row and column).
+    Cells do not keep row numbers, they reference a row, so inserting a new row moves only row numbers
+    of the rows below, not the cells in them.
+    """
+
+    def __init__(self):
+        # node ID -> (row ID, column), in order of insertion
+        self.__node_positions = {}
+        self.__nodes_order = []
+        # (row ID, column) -> node ID
+        self.__occupied_positions = {}
+        # row ID -> row number, row number -> row ID and sorted list of used row numbers
+        self.__row_numbers = {}
+        self.__row_ids = {}
+        self.__sorted_row_numbers = []
+        # spatial index of node bounds used by router (bpmn_diagram_router.ObstaclesIndex), kept for layout updates
+        self.obstacles = None
+
+    def insert(self, row, col, node_id):
+        """
+        Inserts node into cell with given coordinates. If cell is already occupied, a new row is inserted - row
+        numbers of given row and all rows below are increased by grid_column_width.
+
+        :param row: row number,
+        :param col: column number,
+        :param node_id: ID of inserted node.
+        """
+        if self.is_occupied(row, col):
+            self.__shift_rows(row, consts.Consts.grid_column_width)
+        row_id = self.__row_ids.get(row)
+        if row_id is None:
+            row_id = len(self.__row_numbers)
+            self.__row_numbers[row_id] = row
+            self.__row_ids[row] = row_id
+            bisect.insort(self.__sorted_row_numbers, row)
+        if node_id not in self.__node_positions:
+            self.__node_positions[node_id] = (row_id, col)
+        self.__nodes_order.append((row_id, col, node_id))
+        self.__occupied_positions[(row_id, col)] = node_id
+
+    def __shift_rows(self, row, shift):
+        """
+        Increases row numbers of given row and all rows below.
+
+        :param row: number of first moved row,
+        :param shift: value added to row numbers.
+        """
+        index = bisect.bisect_left(self.__sorted_row_numbers, row)
+        moved_rows = [(self.__row_ids.pop(row_number), row_number + shift)
+                      for row_number in self.__sorted_row_numbers[index:]]
+        for (row_id, row_number) in moved_rows:
+            self.__row_numbers[row_id] = row_number
+            self.__row_ids[row_number] = row_id
+        self.__sorted_row_numbers[index:] = [row_number for (_, row_number) in moved_rows]
+
+    def remove(self, node_id):
+        """
+        Removes node from grid, cells occupied by node become free. Rows are not renumbered.
+
+        :param node_id: ID of removed node.
+        """
+        if self.__node_positions.pop(node_id, None) is None:
+            return
+        for (row_id, col, cell_node_id) in self.__nodes_order:
+            if cell_node_id == node_id and self.__occupied_positions.get((row_id, col)) == node_id:
+                del self.__occupied_positions[(row_id, col)]
+        self.__nodes_order = [position for position in self.__nodes_order if position[2] != node_id]
+
+    def find_free_row(self, row, col):
+        """
+        Finds the nearest free cell in given column, searching alternately below and above given row, with step
+        of grid_column_width. Unlike insert, it never moves rows.
+
+        :param row: preferred row number,
+        :param col: column number.
+        :return: row number of free cell.
+        """
+        distance = 0
+        while True:
+            for candidate_row in [row + distance, row - distance]:
+                if not self.is_occupied(candidate_row, col):
+                    return candidate_row
+            distance += consts.Consts.grid_column_width
+
+    def get_last_row(self):
+        """
+        :return: the greatest used row number or None, if grid is empty.
+        """
+        if not self.__sorted_row_numbers:
+            return None
+        return self.__sorted_row_numbers[-1]
+
+    def is_occupied(self, row, col):
+        """
+        Checks if cell with given coordinates contains a node.
+
+        :param row: row number,
+        :param col: column number.
+        :return: a boolean value.
+        """
+        row_id = self.__row_ids.get(row)
+        return row_id is not None and (row_id, col) in self.__occupied_positions
+
+    def get_cell(self, node_id):
+        """
+        Returns cell of given node. If node was inserted more than once, the first cell is returned.
+
+        :param node_id: ID of node.
+        :return: an instance of GridCell class or None, if node is not in the grid.
+        """
+        position = self.__node_positions.get(node_id)
+        if position is None:
+            return None
+        return cell_class.GridCell(self.__row_numbers[position[0]], position[1], node_id)
+
+    def get_cells(self):
+        """
+        Returns list of all cells, in order of insertion.
+
+        :return: a list of GridCell objects.
+        """
+        return [cell_class.GridCell(self.__row_numbers[row_id], col, node_id)
+                for (row_id, col, node_id) in self.__nodes_order]
+
+    def __iter__(self):
+        return iter(self.get_cells())
+
+    def __len__(self):
+        return len(self.__nodes_order)
+
+    def __contains__(self, node_id):
+        return node_id in self.__node_positions
@@ -0,0 +1,83 @@
+# coding=utf-8
+"""
+Unit tests for compact attribute records of BpmnDiagramGraph
+"""
+import copy
+import glob
+import os
+import pickle
+import unittest
+
+import bpmn_python.bpmn_diagram_records as records
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+import diagram_test_utils as test_utils
+
+
+class BpmnDiagramRecordsTests(test_utils.DiagramAssertions, unittest.TestCase):
+    """
+    This class contains tests for NodeRecord and FlowRecord classes and diagrams using them.
+    """
+    examples_pattern = "../examples/*/*.bpmn"
+    csv_example_path = "../csv_import/input/pizza-order.csv"
+
+    def test_record_dictionary_interface(self):
+        record = records.NodeRecord({consts.Consts.id: "task1"}, name="not a slot")
+        record[consts.Consts.type] = consts.Consts.task
+        record["custom"] = 1
+
+        self.assertEqual(record, {consts.Consts.id: "task1", consts.Consts.type: consts.Consts.task,
+                                  "name": "not a slot", "custom": 1})
+        self.assertEqual(len(record), 4)
+        self.assertIn(consts.Consts.type, record)
+        self.assertNotIn(consts.Consts.x, record)
+        self.assertEqual(record.get(consts.Consts.x, "0"), "0")
+        self.assertRaises(KeyError, lambda: record[consts.Consts.x])
+
+        del record[consts.Consts.type]
+        del record["custom"]
+        self.assertEqual(sorted(record.keys()), [consts.Consts.id, "name"])
+        with self.assertRaises(KeyError):
+            del record[consts.Consts.type]
+
+        record_copy = record.copy()
+        record_copy[consts.Consts.id] = "task2"
+        self.assertEqual(record[consts.Consts.id], "task1")
+        self.assertEqual(copy.deepcopy(record), record)
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+    def test_compact_imported_diagrams(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = test_utils.load_diagram(example_path)
+            for multigraph in [False, True]:
+                compact_graph = test_utils.load_diagram(example_path, multigraph=multigraph, compact=True)
+                for _, node in compact_graph.get_nodes():
+                    self.assertIsInstance(node, records.NodeRecord)
+                self.assert_same_diagrams(bpmn_graph, compact_graph)
+
+    def test_compact_csv_import(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_csv_file(os.path.abspath(self.csv_example_path))
+        compact_graph = diagram.BpmnDiagramGraph(compact=True)
+        compact_graph.load_diagram_from_csv_file(os.path.abspath(self.csv_example_path))
+        self.assert_same_diagrams(bpmn_graph, compact_graph)
+
+    def test_compact_manually_created_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph(compact=True)
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        self.assertIsInstance(bpmn_graph.diagram_graph, records.CompactGraph)
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [task_id, task] = bpmn_graph.add_task_to_diagram(process_id, task_name="task")
+        [flow_id, flow] = bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, task_id, "flow")
+
+        self.assertIsInstance(task, records.NodeRecord)
+        self.assertIsInstance(flow, records.FlowRecord)
+        self.assertEqual(task[consts.Consts.incoming_flow], [flow_id])
+        self.assertEqual(bpmn_graph.get_flow_by_id(flow_id)[2][consts.Consts.name], "flow")
+        self.assertEqual(bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task), [task_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
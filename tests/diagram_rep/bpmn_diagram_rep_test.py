@@ -0,0 +1,255 @@
+# coding=utf-8
+"""
+Unit tests for querying methods of BpmnDiagramGraph class
+"""
+import glob
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_import_utils as utils
+import bpmn_python.bpmn_python_consts as consts
+
+
+class BpmnDiagramGraphQueriesTests(unittest.TestCase):
+    """
+    This class contains tests for lookup of nodes and flows in inner representation of BPMN diagram.
+    """
+    example_path = "../examples/xml_import_export/camunda_complex_example.bpmn"
+    lanes_example_path = "../examples/xml_import_export/lanes.bpmn"
+    csv_example_path = "../csv_import/input/pizza-order.csv"
+    examples_pattern = "../examples/*/*.bpmn"
+
+    def assert_flows_indexed(self, bpmn_graph):
+        for source_ref, target_ref, flow in bpmn_graph.get_flows():
+            flow_id = flow[consts.Consts.id]
+            self.assertIs(bpmn_graph.get_flow_by_id(flow_id)[2], flow)
+        for flow_id in bpmn_graph.sequence_flows:
+            self.assertIsNotNone(bpmn_graph.get_flow_by_id(flow_id))
+
+    def test_get_node_by_id(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        for node_id, node in bpmn_graph.get_nodes():
+            self.assertEqual(bpmn_graph.get_node_by_id(node_id), (node_id, node))
+        self.assertIsNone(bpmn_graph.get_node_by_id("not_existing_node"))
+
+    def test_get_flow_by_id_imported_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        self.assert_flows_indexed(bpmn_graph)
+        self.assertIsNone(bpmn_graph.get_flow_by_id("not_existing_flow"))
+
+    def test_get_flow_by_id_message_flows(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.lanes_example_path))
+        message_flows = bpmn_graph.collaboration[consts.Consts.message_flows]
+        self.assertTrue(len(message_flows) > 0)
+        for flow_id, flow_refs in message_flows.items():
+            source_ref, target_ref, flow = bpmn_graph.get_flow_by_id(flow_id)
+            self.assertEqual(source_ref, flow_refs[consts.Consts.source_ref])
+            self.assertEqual(target_ref, flow_refs[consts.Consts.target_ref])
+            self.assertEqual(flow[consts.Consts.id], flow_id)
+
+    def test_get_flow_by_id_manually_created_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task")
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end_event")
+        [first_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, task_id, "first")
+        [second_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, end_id, "second")
+
+        self.assertEqual(bpmn_graph.get_flow_by_id(first_flow_id)[:2], (start_id, task_id))
+        self.assertEqual(bpmn_graph.get_flow_by_id(second_flow_id)[2][consts.Consts.name], "second")
+        self.assert_flows_indexed(bpmn_graph)
+
+    def test_get_flow_by_id_csv_import(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_csv_file(os.path.abspath(self.csv_example_path))
+        self.assert_flows_indexed(bpmn_graph)
+        for flow_id, flow_refs in bpmn_graph.sequence_flows.items():
+            self.assertTrue(bpmn_graph.diagram_graph.has_node(flow_refs[consts.Consts.source_ref]))
+            self.assertTrue(bpmn_graph.diagram_graph.has_node(flow_refs[consts.Consts.target_ref]))
+
+    def assert_indexed_queries_match_graph(self, bpmn_graph):
+        nodes = list(bpmn_graph.get_nodes())
+        node_types = set(node[1].get(consts.Consts.type) for node in nodes)
+        for node_type in node_types:
+            expected = [node for node in nodes if node[1].get(consts.Consts.type) == node_type]
+            self.assertEqual(bpmn_graph.get_nodes(node_type), expected)
+            self.assertEqual(bpmn_graph.get_nodes_id_list_by_type(node_type), [node[0] for node in expected])
+        processes = set(node[1].get(consts.Consts.process) for node in nodes)
+        for process_id in processes:
+            expected = [node for node in nodes if node[1].get(consts.Consts.process) == process_id]
+            self.assertEqual(bpmn_graph.get_nodes_list_by_process_id(process_id), expected)
+            expected_flows = set(flow[2][consts.Consts.id] for flow in bpmn_graph.get_flows()
+                                 if flow[2].get(consts.Consts.process) == process_id)
+            flows = bpmn_graph.get_flows_list_by_process_id(process_id)
+            self.assertEqual(len(flows), len(expected_flows))
+            self.assertEqual(set(flow[2][consts.Consts.id] for flow in flows), expected_flows)
+        self.assertEqual(bpmn_graph.get_nodes("not_existing_type"), [])
+        self.assertEqual(bpmn_graph.get_nodes_list_by_process_id("not_existing_process"), [])
+
+    def test_indexed_queries_imported_diagrams(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+            self.assert_indexed_queries_match_graph(bpmn_graph)
+
+    def test_indexed_queries_csv_import(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_csv_file(os.path.abspath(self.csv_example_path))
+        self.assert_indexed_queries_match_graph(bpmn_graph)
+
+    def test_indexed_queries_manually_created_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task")
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end_event")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, task_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, end_id)
+        self.assertEqual(bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task), [task_id])
+        self.assert_indexed_queries_match_graph(bpmn_graph)
+
+        # re-adding node with the same ID replaces it in indexes
+        bpmn_graph.add_exclusive_gateway_to_diagram(process_id, gateway_name="gateway", node_id=task_id)
+        self.assertEqual(bpmn_graph.get_nodes(consts.Consts.task), [])
+        self.assertEqual(bpmn_graph.get_nodes_id_list_by_type(consts.Consts.exclusive_gateway), [task_id])
+        self.assertEqual(sorted(node[0] for node in bpmn_graph.get_nodes_list_by_process_id(process_id)),
+                         sorted([start_id, task_id, end_id]))
+
+    def test_rebuild_indexes_after_direct_graph_modification(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        task_id = bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task)[0]
+        bpmn_graph.diagram_graph.remove_node(task_id)
+        self.assertNotIn(task_id, bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task))
+        bpmn_graph.diagram_graph.add_node("new_task", **{consts.Consts.type: consts.Consts.task,
+                                                         consts.Consts.process: "new_process"})
+        bpmn_graph.rebuild_indexes()
+        self.assertIn("new_task", bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task))
+        self.assert_indexed_queries_match_graph(bpmn_graph)
+
+    def test_indexes_keep_unique_ids(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        task_ids = [bpmn_graph.add_task_to_diagram(process_id, task_name="task" + str(index))[0]
+                    for index in range(5)]
+        [flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, task_ids[0], task_ids[1])
+
+        # node removed without use of BpmnDiagramGraph methods is re-added with the same ID
+        bpmn_graph.diagram_graph.remove_node(task_ids[2])
+        self.assertEqual(bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task),
+                         task_ids[:2] + task_ids[3:])
+        bpmn_graph.add_task_to_diagram(process_id, task_name="task2", node_id=task_ids[2])
+        bpmn_graph.add_task_to_diagram(process_id, task_name="task2", node_id=task_ids[2])
+        expected_ids = task_ids[:2] + task_ids[3:] + [task_ids[2]]
+        self.assertEqual(bpmn_graph.get_nodes_id_list_by_type(consts.Consts.task), expected_ids)
+        self.assertEqual([node[0] for node in bpmn_graph.get_nodes_list_by_process_id(process_id)], expected_ids)
+        self.assert_indexed_queries_match_graph(bpmn_graph)
+
+        # flow removed without use of BpmnDiagramGraph methods is not returned
+        bpmn_graph.diagram_graph.remove_edge(task_ids[0], task_ids[1])
+        del bpmn_graph.sequence_flows[flow_id]
+        self.assertEqual(bpmn_graph.get_flows_list_by_process_id(process_id), [])
+
+    def test_nodes_classification_imported_diagrams(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+            expected = []
+            for (node_type, labels) in utils.BpmnImportUtils.classification_types:
+                for (node_id, node) in bpmn_graph.get_nodes(node_type):
+                    classification_labels = list(labels)
+                    if len(node[consts.Consts.incoming_flow]) >= 2:
+                        classification_labels.append("Join")
+                    if len(node[consts.Consts.outgoing_flow]) >= 2:
+                        classification_labels.append("Split")
+                    expected.append((node_id, classification_labels))
+            classified_nodes = bpmn_graph.get_classified_nodes()
+            self.assertEqual([(node[0], labels) for (node, labels) in classified_nodes], expected)
+            self.assertIs(bpmn_graph.get_classified_nodes(), classified_nodes)
+            self.assertEqual(bpmn_graph.get_nodes_classification(), dict(expected))
+            self.assertEqual(utils.BpmnImportUtils.generate_nodes_clasification(bpmn_graph), dict(expected))
+
+    def test_nodes_classification_invalidated_on_modification(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [gateway_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id, gateway_name="gateway")
+        [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, gateway_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, gateway_id, task_id)
+        self.assertEqual(bpmn_graph.get_nodes_classification(), {start_id: ["Element", "Start Event"],
+                                                                 gateway_id: ["Element"], task_id: ["Element"]})
+
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end_event")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, gateway_id, end_id)
+        self.assertEqual(bpmn_graph.get_nodes_classification()[gateway_id], ["Element", "Split"])
+        self.assertEqual(bpmn_graph.get_nodes_classification()[end_id], ["Element", "End Event"])
+
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, end_id)
+        bpmn_graph.diagram_graph.node[task_id][consts.Consts.type] = consts.Consts.parallel_gateway
+        bpmn_graph.rebuild_indexes()
+        self.assertEqual([node[0] for (node, _) in bpmn_graph.get_classified_nodes()],
+                         [gateway_id, task_id, start_id, end_id])
+        self.assertEqual(bpmn_graph.get_nodes_classification()[end_id], ["Element", "End Event", "Join"])
+
+    @staticmethod
+    def get_flows_by_id(bpmn_graph):
+        return dict((flow[2][consts.Consts.id], flow[2]) for flow in bpmn_graph.get_flows())
+
+    def test_multigraph_imported_diagrams(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+            for streaming in [False, True]:
+                multigraph = diagram.BpmnDiagramGraph(multigraph=True)
+                multigraph.load_diagram_from_xml_file(os.path.abspath(example_path), streaming=streaming)
+                self.assertEqual(list(multigraph.get_nodes()), list(bpmn_graph.get_nodes()))
+                self.assertEqual(self.get_flows_by_id(multigraph), self.get_flows_by_id(bpmn_graph))
+                self.assert_flows_indexed(multigraph)
+                self.assert_indexed_queries_match_graph(multigraph)
+                for node_id in bpmn_graph.diagram_graph.nodes():
+                    self.assertEqual(sorted(multigraph.get_successors(node_id)),
+                                     sorted(bpmn_graph.get_successors(node_id)))
+                    self.assertEqual(sorted(multigraph.get_predecessors(node_id)),
+                                     sorted(bpmn_graph.get_predecessors(node_id)))
+
+    def test_multigraph_csv_import(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_csv_file(os.path.abspath(self.csv_example_path))
+        multigraph = diagram.BpmnDiagramGraph(multigraph=True)
+        multigraph.load_diagram_from_csv_file(os.path.abspath(self.csv_example_path))
+        self.assertEqual(self.get_flows_by_id(multigraph), self.get_flows_by_id(bpmn_graph))
+        self.assert_flows_indexed(multigraph)
+
+    def test_multigraph_keeps_parallel_flows(self):
+        bpmn_graph = diagram.BpmnDiagramGraph(multigraph=True)
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        self.assertTrue(bpmn_graph.diagram_graph.is_multigraph())
+        process_id = bpmn_graph.add_process_to_diagram()
+        [first_task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="first_task")
+        [second_task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="second_task")
+        [first_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, first_task_id, second_task_id, "a")
+        [second_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, first_task_id, second_task_id, "b")
+        [back_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, second_task_id, first_task_id, "c")
+
+        self.assertEqual(len(bpmn_graph.get_flows()), 3)
+        self.assertEqual(bpmn_graph.get_flow_by_id(first_flow_id)[2][consts.Consts.name], "a")
+        self.assertEqual(bpmn_graph.get_flow_by_id(second_flow_id)[2][consts.Consts.name], "b")
+        self.assertEqual(bpmn_graph.get_flow_by_id(back_flow_id)[:2], (second_task_id, first_task_id))
+        self.assertEqual(len(bpmn_graph.get_flows_list_by_process_id(process_id)), 3)
+        self.assertEqual(bpmn_graph.get_successors(first_task_id), [second_task_id])
+        self.assertEqual(bpmn_graph.get_predecessors(first_task_id), [second_task_id])
+        self.assert_flows_indexed(bpmn_graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# coding=utf-8
+"""
+Helpers shared by tests, that compare diagrams loaded in different ways
+"""
+import os
+
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+
+def load_diagram(filepath, multigraph=False, compact=False, streaming=False, cache=None):
+    """
+    Loads diagram from XML file.
+
+    :param filepath: string with XML file path, relative to the current directory or absolute,
+    :param multigraph: boolean flag passed to BpmnDiagramGraph constructor,
+    :param compact: boolean flag passed to BpmnDiagramGraph constructor,
+    :param streaming: boolean flag passed to load_diagram_from_xml_file,
+    :param cache: an instance of BpmnDiagramImportCache class or None.
+    :return: an instance of BpmnDiagramGraph class.
+    """
+    bpmn_graph = diagram.BpmnDiagramGraph(multigraph=multigraph, compact=compact)
+    bpmn_graph.load_diagram_from_xml_file(os.path.abspath(filepath), streaming=streaming, cache=cache)
+    return bpmn_graph
+
+
+class DiagramAssertions(object):
+    """
+    Mixin of unittest.TestCase classes, that compares inner representations of diagrams.
+    """
+
+    @staticmethod
+    def normalize_node(node):
+        # order of event definitions imported by minidom based importer depends on set iteration order
+        node = dict(node)
+        if consts.Consts.event_definitions in node:
+            node[consts.Consts.event_definitions] = sorted(
+                (definition[consts.Consts.definition_type], definition[consts.Consts.id])
+                for definition in node[consts.Consts.event_definitions])
+        return node
+
+    def assert_same_diagrams(self, expected, actual, ordered=False):
+        """
+        :param expected: an instance of BpmnDiagramGraph class,
+        :param actual: an instance of BpmnDiagramGraph class,
+        :param ordered: boolean flag. If set to True, nodes and flows must also be in the same order.
+        """
+        nodes = [[(node_id, self.normalize_node(node)) for (node_id, node) in bpmn_graph.get_nodes()]
+                 for bpmn_graph in [expected, actual]]
+        flows = [[(flow[2][consts.Consts.id], dict(flow[2])) for flow in bpmn_graph.get_flows()]
+                 for bpmn_graph in [expected, actual]]
+        if not ordered:
+            nodes = [sorted(graph_nodes) for graph_nodes in nodes]
+            flows = [sorted(graph_flows) for graph_flows in flows]
+        self.assertEqual(nodes[0], nodes[1])
+        self.assertEqual(flows[0], flows[1])
+        self.assertEqual(expected.sequence_flows, actual.sequence_flows)
+        self.assertEqual(expected.process_elements, actual.process_elements)
+        self.assertEqual(expected.collaboration, actual.collaboration)
+        self.assertEqual(expected.diagram_attributes, actual.diagram_attributes)
+        self.assertEqual(expected.plane_attributes, actual.plane_attributes)
+        for process_id in expected.process_elements:
+            self.assertEqual(expected.get_nodes_list_by_process_id(process_id),
+                             actual.get_nodes_list_by_process_id(process_id))
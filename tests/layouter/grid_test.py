@@ -0,0 +1,68 @@
+# coding=utf-8
+"""
+Unit tests for Grid class used by layouter
+"""
+import unittest
+
+import bpmn_python.bpmn_python_consts as consts
+import bpmn_python.grid_class as grid_class
+
+
+class GridTests(unittest.TestCase):
+    """
+    This class contains tests for inserting nodes into grid and looking up their cells.
+    """
+
+    def test_insert_and_lookup(self):
+        grid = grid_class.Grid()
+        grid.insert(2, 1, "first")
+        grid.insert(2, 2, "second")
+        grid.insert(4, 2, "third")
+
+        self.assertEqual(len(grid), 3)
+        self.assertIn("second", grid)
+        self.assertNotIn("not_existing_node", grid)
+        self.assertIsNone(grid.get_cell("not_existing_node"))
+        cell = grid.get_cell("third")
+        self.assertEqual((cell.row, cell.col, cell.node_id), (4, 2, "third"))
+        self.assertTrue(grid.is_occupied(2, 1))
+        self.assertFalse(grid.is_occupied(4, 1))
+        self.assertEqual([grid_cell.node_id for grid_cell in grid], ["first", "second", "third"])
+
+    def test_insert_into_occupied_cell_moves_rows(self):
+        grid = grid_class.Grid()
+        grid.insert(0, 1, "above")
+        grid.insert(2, 1, "first")
+        grid.insert(2, 2, "second")
+        grid.insert(4, 1, "below")
+        grid.insert(2, 1, "inserted")
+
+        width = consts.Consts.grid_column_width
+        rows = dict((grid_cell.node_id, (grid_cell.row, grid_cell.col)) for grid_cell in grid)
+        self.assertEqual(rows, {"above": (0, 1), "inserted": (2, 1), "first": (2 + width, 1),
+                                "second": (2 + width, 2), "below": (4 + width, 1)})
+        self.assertEqual(grid.get_cell("below").row, 4 + width)
+        self.assertTrue(grid.is_occupied(4 + width, 1))
+        self.assertTrue(grid.is_occupied(2, 1))
+        self.assertFalse(grid.is_occupied(2, 2))
+
+    def test_remove_and_find_free_row(self):
+        grid = grid_class.Grid()
+        grid.insert(2, 1, "first")
+        grid.insert(4, 1, "second")
+        grid.insert(6, 1, "third")
+
+        width = consts.Consts.grid_column_width
+        self.assertEqual(grid.get_last_row(), 6)
+        self.assertEqual(grid.find_free_row(4, 1), 4 + 2 * width)
+        self.assertEqual(grid.find_free_row(4, 2), 4)
+        grid.remove("second")
+        self.assertNotIn("second", grid)
+        self.assertFalse(grid.is_occupied(4, 1))
+        self.assertEqual(grid.find_free_row(4, 1), 4)
+        self.assertEqual([grid_cell.node_id for grid_cell in grid], ["first", "third"])
+        self.assertEqual(grid.get_cell("third").row, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
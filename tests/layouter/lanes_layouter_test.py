@@ -0,0 +1,154 @@
+# coding=utf-8
+"""
+Unit tests for lane and pool aware layout engine
+"""
+import collections
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_lanes_layouter as lanes_layouter
+import bpmn_python.bpmn_diagram_layered_layouter as layered_layouter
+import bpmn_python.bpmn_diagram_layouter as layouter
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+
+class LanesLayouterTests(unittest.TestCase):
+    """
+    This class contains tests for generating layout of diagram with pools and nested lanes.
+    """
+    lanes_example_path = "../examples/xml_import_export/lanes.bpmn"
+    output_directory = "./output/layouter/"
+
+    @staticmethod
+    def load_example_diagram():
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(LanesLayouterTests.lanes_example_path))
+        return bpmn_graph
+
+    @staticmethod
+    def get_bounds(element_attr):
+        return (element_attr[consts.Consts.x], element_attr[consts.Consts.y],
+                element_attr[consts.Consts.x] + element_attr[consts.Consts.width],
+                element_attr[consts.Consts.y] + element_attr[consts.Consts.height])
+
+    def assert_contains(self, outer_attr, inner_attr):
+        (left, top, right, bottom) = LanesLayouterTests.get_bounds(outer_attr)
+        (inner_left, inner_top, inner_right, inner_bottom) = LanesLayouterTests.get_bounds(inner_attr)
+        self.assertTrue(left <= inner_left and inner_right <= right and top <= inner_top and inner_bottom <= bottom)
+
+    @staticmethod
+    def get_lanes(bpmn_graph, process_id):
+        lanes = []
+        lane_set = bpmn_graph.process_elements[process_id].get(consts.Consts.lane_set)
+        if lane_set is not None:
+            lanes_layouter.collect_lanes(lane_set[consts.Consts.lanes], 1, 0, lanes, {})
+        return lanes
+
+    def test_lanes_layout(self):
+        bpmn_graph = LanesLayouterTests.load_example_diagram()
+        layouter.generate_layout(bpmn_graph, engine=layouter.lanes_engine)
+
+        participants = bpmn_graph.collaboration[consts.Consts.participants]
+        pools_bounds = sorted(LanesLayouterTests.get_bounds(participant_attr)
+                              for participant_attr in participants.values())
+        for index in range(len(pools_bounds) - 1):
+            self.assertLessEqual(pools_bounds[index][3], pools_bounds[index + 1][1])
+
+        for participant_attr in participants.values():
+            process_id = participant_attr[consts.Consts.process_ref]
+            for (_, node) in bpmn_graph.get_nodes_list_by_process_id(process_id):
+                self.assert_contains(participant_attr, node)
+            lanes = LanesLayouterTests.get_lanes(bpmn_graph, process_id)
+            for (_, lane_attr, _, first_band, last_band) in lanes:
+                self.assert_contains(participant_attr, lane_attr)
+                if first_band == last_band:
+                    for node_id in lane_attr[consts.Consts.flow_node_refs]:
+                        self.assert_contains(lane_attr, bpmn_graph.get_node_by_id(node_id)[1])
+                child_lane_set = lane_attr[consts.Consts.child_lane_set]
+                for child_lane_attr in child_lane_set.get(consts.Consts.lanes, {}).values():
+                    self.assert_contains(lane_attr, child_lane_attr)
+
+        output_file = "lanes_layouter_lanes.xml"
+        bpmn_graph.export_xml_file(self.output_directory, output_file)
+        exported_graph = diagram.BpmnDiagramGraph()
+        exported_graph.load_diagram_from_xml_file(os.path.abspath(os.path.join(self.output_directory, output_file)))
+        for (participant_id, participant_attr) in participants.items():
+            self.assertEqual(LanesLayouterTests.get_bounds(participant_attr), LanesLayouterTests.get_bounds(
+                exported_graph.collaboration[consts.Consts.participants][participant_id]))
+
+    def test_lanes_layout_node_without_shape(self):
+        bpmn_graph = LanesLayouterTests.load_example_diagram()
+        # node imported without BPMNShape has no bounds, it is the source of message flow
+        node_id = "sid-D919E95A-594C-42BB-8E62-A94F24B60DC4"
+        node = bpmn_graph.get_node_by_id(node_id)[1]
+        for key in [consts.Consts.x, consts.Consts.y, consts.Consts.width, consts.Consts.height]:
+            del node[key]
+        layouter.generate_layout(bpmn_graph, engine=layouter.lanes_engine)
+
+        message_flow = bpmn_graph.get_flow_by_id("sid-004CA4F6-8C0A-4919-B930-2A1B67DD5DD1")[2]
+        self.assertEqual(message_flow[consts.Consts.waypoints][0][0],
+                         node[consts.Consts.x] + layered_layouter.default_node_size / 2.0)
+        self.assertNotIn(consts.Consts.width, node)
+
+    def test_lanes_layout_created_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [task1_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task1")
+        [task2_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task2")
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end_event")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, task1_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task1_id, task2_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task2_id, end_id)
+        lanes_attr = collections.OrderedDict()
+        for (lane_id, flow_node_refs) in [("lane1", [start_id, task2_id]), ("lane2", [task1_id, end_id])]:
+            lanes_attr[lane_id] = {consts.Consts.id: lane_id, consts.Consts.name: lane_id,
+                                   consts.Consts.child_lane_set: {}, consts.Consts.flow_node_refs: flow_node_refs}
+        bpmn_graph.process_elements[process_id][consts.Consts.lane_set] = {consts.Consts.id: "lane_set",
+                                                                           consts.Consts.lanes: lanes_attr}
+
+        layouter.generate_layout(bpmn_graph, engine=layouter.lanes_engine)
+        for lane_attr in lanes_attr.values():
+            for node_id in lane_attr[consts.Consts.flow_node_refs]:
+                self.assert_contains(lane_attr, bpmn_graph.get_node_by_id(node_id)[1])
+        self.assertEqual(lanes_attr["lane1"][consts.Consts.y] + lanes_attr["lane1"][consts.Consts.height],
+                         lanes_attr["lane2"][consts.Consts.y])
+        bpmn_graph.export_xml_file(self.output_directory, "lanes_layouter_created_diagram.xml")
+
+    def test_lanes_layout_in_worker_processes(self):
+        bpmn_graph = LanesLayouterTests.load_example_diagram()
+        lanes_layouter.generate_layout(bpmn_graph, workers=1)
+        parallel_graph = LanesLayouterTests.load_example_diagram()
+        lanes_layouter.generate_layout(parallel_graph, workers=2)
+
+        self.assertEqual(sorted((node_id, LanesLayouterTests.get_bounds(node))
+                                for (node_id, node) in bpmn_graph.get_nodes()),
+                         sorted((node_id, LanesLayouterTests.get_bounds(node))
+                                for (node_id, node) in parallel_graph.get_nodes()))
+        for process_id in bpmn_graph.process_elements:
+            self.assertEqual([LanesLayouterTests.get_bounds(lane[1])
+                              for lane in LanesLayouterTests.get_lanes(bpmn_graph, process_id)],
+                             [LanesLayouterTests.get_bounds(lane[1])
+                              for lane in LanesLayouterTests.get_lanes(parallel_graph, process_id)])
+
+    def test_collect_lanes(self):
+        child_lanes_attr = collections.OrderedDict()
+        child_lanes_attr["lane1a"] = {consts.Consts.flow_node_refs: ["node1"], consts.Consts.child_lane_set: {}}
+        child_lanes_attr["lane1b"] = {consts.Consts.flow_node_refs: [], consts.Consts.child_lane_set: {}}
+        lanes_attr = collections.OrderedDict()
+        lanes_attr["lane1"] = {consts.Consts.flow_node_refs: ["node1", "node2"],
+                               consts.Consts.child_lane_set: {consts.Consts.lanes: child_lanes_attr}}
+        lanes_attr["lane2"] = {consts.Consts.flow_node_refs: ["node3"], consts.Consts.child_lane_set: {}}
+        lanes = []
+        band_of_node = {}
+        bands_count = lanes_layouter.collect_lanes(lanes_attr, 1, 0, lanes, band_of_node)
+        self.assertEqual(bands_count, 3)
+        self.assertEqual(sorted((lane[0], lane[2], lane[3], lane[4]) for lane in lanes),
+                         [("lane1", 1, 0, 1), ("lane1a", 2, 0, 0), ("lane1b", 2, 1, 1), ("lane2", 1, 2, 2)])
+        self.assertEqual(band_of_node, {"node1": 0, "node2": 0, "node3": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# coding=utf-8
+"""
+Unit tests for layered layout engine
+"""
+import glob
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_layered_layouter as layered_layouter
+import bpmn_python.bpmn_diagram_layouter as layouter
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+import bpmn_python.diagram_layout_metrics as metrics
+
+
+class LayeredLayouterTests(unittest.TestCase):
+    """
+    This class contains tests for generating layout with layered engine.
+    """
+    examples_pattern = "../examples/*/*.bpmn"
+    output_directory = "./output/layouter/"
+
+    @staticmethod
+    def get_bounds(node):
+        return (node[consts.Consts.x], node[consts.Consts.y],
+                node[consts.Consts.x] + node[consts.Consts.width], node[consts.Consts.y] + node[consts.Consts.height])
+
+    def assert_valid_layout(self, bpmn_graph, message=None):
+        bounds = [LayeredLayouterTests.get_bounds(node) for (_, node) in bpmn_graph.get_nodes()]
+        for (index, (left, top, right, bottom)) in enumerate(bounds):
+            for (other_left, other_top, other_right, other_bottom) in bounds[index + 1:]:
+                overlap = left < other_right and other_left < right and top < other_bottom and other_top < bottom
+                self.assertFalse(overlap, message)
+        for (_, _, flow) in bpmn_graph.get_flows():
+            waypoints = flow[consts.Consts.waypoints]
+            for (point, node_id) in [(waypoints[0], flow[consts.Consts.source_ref]),
+                                     (waypoints[-1], flow[consts.Consts.target_ref])]:
+                (left, top, right, bottom) = LayeredLayouterTests.get_bounds(bpmn_graph.get_node_by_id(node_id)[1])
+                self.assertTrue(left <= point[0] <= right and top <= point[1] <= bottom, message)
+            for index in range(len(waypoints) - 1):
+                # segments are horizontal or vertical
+                self.assertTrue(waypoints[index][0] == waypoints[index + 1][0]
+                                or waypoints[index][1] == waypoints[index + 1][1], message)
+
+    def test_layered_layout_examples(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+            layouter.generate_layout(bpmn_graph, engine=layouter.layered_engine)
+            self.assert_valid_layout(bpmn_graph, example_path)
+
+    def test_layered_layout_split_join_cycle(self):
+        output_file = "layered_layouter_cycle_case.xml"
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [join_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id, gateway_name="join")
+        [split_id, _] = bpmn_graph.add_parallel_gateway_to_diagram(process_id, gateway_name="split")
+        [task1_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task1")
+        [task2_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task2")
+        [parallel_join_id, _] = bpmn_graph.add_parallel_gateway_to_diagram(process_id, gateway_name="parallel_join")
+        [decision_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id, gateway_name="decision")
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end_event")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, join_id, split_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, task1_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, task2_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task1_id, parallel_join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task2_id, parallel_join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, parallel_join_id, decision_id)
+        [loop_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, decision_id, join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, decision_id, end_id)
+        bpmn_graph.get_node_by_id(task2_id)[1][consts.Consts.height] = 200.0
+
+        layouter.generate_layout(bpmn_graph, engine=layouter.layered_engine)
+        self.assert_valid_layout(bpmn_graph)
+        self.assertEqual(metrics.count_crossing_points(bpmn_graph), 0)
+        node_x = dict((node_id, node[consts.Consts.x]) for (node_id, node) in bpmn_graph.get_nodes())
+        self.assertLess(node_x[start_id], node_x[join_id])
+        self.assertLess(node_x[join_id], node_x[split_id])
+        self.assertEqual(node_x[task1_id], node_x[task2_id])
+        self.assertLess(node_x[task1_id], node_x[parallel_join_id])
+        self.assertLess(node_x[decision_id], node_x[end_id])
+        # flow closing cycle leaves decision from its left side
+        loop_flow = bpmn_graph.get_flow_by_id(loop_flow_id)[2]
+        self.assertEqual(loop_flow[consts.Consts.waypoints][0][0], node_x[decision_id])
+        bpmn_graph.export_xml_file(self.output_directory, output_file)
+
+    def test_layered_layout_reorders_crossing_flows(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        sources = [bpmn_graph.add_task_to_diagram(process_id, task_name="source" + str(index))[0]
+                   for index in range(4)]
+        targets = [bpmn_graph.add_task_to_diagram(process_id, task_name="target" + str(index))[0]
+                   for index in range(4)]
+        # in order of creation every pair of flows crosses
+        for (source_id, target_id) in zip(sources, reversed(targets)):
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, source_id, target_id)
+
+        layouter.generate_layout(bpmn_graph, engine=layouter.layered_engine)
+        self.assert_valid_layout(bpmn_graph)
+        self.assertEqual(metrics.count_crossing_points(bpmn_graph), 0)
+
+    def test_unknown_layout_engine(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            layouter.generate_layout(bpmn_graph, engine="not_existing_engine")
+
+    def test_split_long_edges(self):
+        # vertices 0 -> 1 -> 2 and 0 -> 2
+        edges = [(0, 1, "first", False), (1, 2, "second", False), (0, 2, "third", True)]
+        layer_of_vertex = layered_layouter.assign_layers(3, edges)
+        self.assertEqual(layer_of_vertex, [0, 1, 2])
+        (layers, predecessors, successors, layer_of_vertex, chains) = \
+            layered_layouter.split_long_edges(layer_of_vertex, edges)
+        self.assertEqual(layers, [[0], [1, 3], [2]])
+        self.assertEqual(layer_of_vertex, [0, 1, 2, 1])
+        self.assertEqual(chains[2], ("third", [0, 3, 2], True))
+        self.assertEqual(sorted(successors[0]), [1, 3])
+        self.assertEqual(sorted(predecessors[2]), [1, 3])
+
+    def test_count_crossings(self):
+        layers = [[0, 1, 2], [3, 4, 5]]
+        successors = [[5], [4], [3], [], [], []]
+        positions = [0, 1, 2, 0, 1, 2]
+        self.assertEqual(layered_layouter.count_crossings(layers, successors, positions), 3)
+        layered_layouter.order_layers(layers, [[], [], [], [2], [1], [0]], successors)
+        self.assertEqual(layers, [[0, 1, 2], [5, 4, 3]])
+
+    def test_place_in_order(self):
+        self.assertEqual(layered_layouter.place_in_order([0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [10.0, 10.0]),
+                         [-10.0, 0.0, 10.0])
+        self.assertEqual(layered_layouter.place_in_order([0.0, 50.0, 0.0], [1.0, 1.0, 1.0], [10.0, 10.0]),
+                         [0.0, 20.0, 30.0])
+        self.assertEqual(layered_layouter.place_in_order([0.0, 100.0], [3.0, 1.0], [10.0]), [0.0, 100.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
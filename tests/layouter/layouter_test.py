@@ -2,10 +2,12 @@
 """
 Test unit, using simple graph made in BPMNEditor editor for import/export operation
 """
+import sys
 import unittest
 
 import bpmn_python.bpmn_diagram_layouter as layouter
 import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
 
 class BPMNEditorTests(unittest.TestCase):
     """
@@ -102,6 +104,69 @@ class BPMNEditorTests(unittest.TestCase):
         layouter.generate_layout(bpmn_graph)
         bpmn_graph.export_xml_file(self.output_directory, output_file)
 
+    def test_layouter_deeply_nested_splits(self):
+        """
+        Test for generating layout for diagram with chain of splits nested deeper than recursion limit
+        """
+        depth = 2 * sys.getrecursionlimit()
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [last_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        for index in range(depth):
+            [split_id, _] = bpmn_graph.add_parallel_gateway_to_diagram(process_id, gateway_name="split" + str(index))
+            [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task" + str(index))
+            [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end" + str(index))
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, split_id)
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, task_id)
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, end_id)
+            last_id = split_id
+        [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="last_task")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, task_id)
+
+        layouter.generate_layout(bpmn_graph)
+        positions = set()
+        for (_, node) in bpmn_graph.get_nodes():
+            positions.add((node[consts.Consts.x], node[consts.Consts.y]))
+        self.assertEqual(len(positions), bpmn_graph.diagram_graph.number_of_nodes())
+
+    def test_topological_sort_backward_flows(self):
+        """
+        Test for sorting nodes of diagram with cycles, flows closing cycles should be returned as backward flows
+        """
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [join_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id, gateway_name="join")
+        [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task")
+        [split_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id, gateway_name="split")
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id, end_event_name="end_event")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, join_id, task_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, split_id)
+        [loop_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, end_id)
+        # cycle, that is not reachable from start event
+        [first_task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="first_task")
+        [second_task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="second_task")
+        [third_task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="third_task")
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, first_task_id, second_task_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, second_task_id, third_task_id)
+        [unreachable_loop_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, third_task_id,
+                                                                                first_task_id)
+
+        classification = layouter.generate_elements_clasification(bpmn_graph)
+        (sorted_nodes, backward_flows) = layouter.topological_sort(bpmn_graph, classification[0])
+        sorted_ids = [node_with_classification["node"][0] for node_with_classification in sorted_nodes]
+        self.assertEqual(sorted(flow[2][consts.Consts.id] for flow in backward_flows),
+                         sorted([loop_flow_id, unreachable_loop_flow_id]))
+        self.assertEqual(sorted(sorted_ids), sorted(bpmn_graph.diagram_graph.nodes()))
+        backward_flows_ids = set(flow[2][consts.Consts.id] for flow in backward_flows)
+        for (source_id, target_id, flow) in bpmn_graph.get_flows():
+            if flow[consts.Consts.id] not in backward_flows_ids:
+                self.assertLess(sorted_ids.index(source_id), sorted_ids.index(target_id))
+
 
 if __name__ == '__main__':
     unittest.main()
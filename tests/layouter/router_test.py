@@ -0,0 +1,129 @@
+# coding=utf-8
+"""
+Unit tests for orthogonal router of flows
+"""
+import glob
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_layouter as layouter
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_diagram_router as router
+import bpmn_python.bpmn_python_consts as consts
+
+
+class RouterTests(unittest.TestCase):
+    """
+    This class contains tests for routing flows around nodes of diagram.
+    """
+    examples_pattern = "../examples/*/*.bpmn"
+    example_path = "../examples/xml_import_export/camunda_simple_example.bpmn"
+
+    def assert_orthogonal(self, waypoints, message=None):
+        for index in range(len(waypoints) - 1):
+            self.assertTrue(waypoints[index][0] == waypoints[index + 1][0]
+                            or waypoints[index][1] == waypoints[index + 1][1], message)
+
+    def test_router_grid_layout_examples(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+            layouter.generate_layout(bpmn_graph)
+            for (_, _, flow) in bpmn_graph.get_flows():
+                waypoints = flow[consts.Consts.waypoints]
+                self.assert_orthogonal(waypoints, example_path)
+                for (point, node_id) in [(waypoints[0], flow[consts.Consts.source_ref]),
+                                         (waypoints[-1], flow[consts.Consts.target_ref])]:
+                    (left, top, right, bottom) = router.get_node_bounds(bpmn_graph.get_node_by_id(node_id)[1])
+                    self.assertTrue(left <= point[0] <= right and top <= point[1] <= bottom, example_path)
+
+    def test_router_node_without_shape(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        # node imported without BPMNShape has no bounds
+        (node_id, node) = bpmn_graph.get_nodes(consts.Consts.task)[0]
+        for key in [consts.Consts.x, consts.Consts.y, consts.Consts.width, consts.Consts.height]:
+            del node[key]
+        layouter.generate_layout(bpmn_graph)
+        (x, y) = (node[consts.Consts.x], node[consts.Consts.y])
+        self.assertEqual(router.get_node_bounds(node),
+                         (x, y, x + router.default_node_size, y + router.default_node_size))
+        for (_, _, flow) in bpmn_graph.get_flows():
+            self.assert_orthogonal(flow[consts.Consts.waypoints])
+
+    def test_router_straight_flow(self):
+        obstacles = router.ObstaclesIndex([(0.0, 0.0, 100.0, 80.0), (150.0, 20.0, 186.0, 56.0)])
+        waypoints = router.get_flow_waypoints((0.0, 0.0, 100.0, 80.0), (150.0, 20.0, 186.0, 56.0), obstacles)
+        self.assertEqual(waypoints, [(100.0, 40.0), (150.0, 40.0)])
+
+    def test_router_avoids_obstacle(self):
+        source = (0.0, 0.0, 100.0, 100.0)
+        obstacle = (150.0, 0.0, 250.0, 100.0)
+        target = (300.0, 0.0, 400.0, 100.0)
+        obstacles = router.ObstaclesIndex([source, obstacle, target])
+        waypoints = router.get_flow_waypoints(source, target, obstacles)
+        self.assert_orthogonal(waypoints)
+        self.assertEqual(waypoints[0], (100.0, 50.0))
+        self.assertEqual(waypoints[-1], (300.0, 50.0))
+        self.assertEqual(router.count_route_collisions(waypoints, obstacles), 0)
+
+        # obstacle above the direct route blocks the first detour, route goes around both nodes
+        upper_obstacle = (150.0, -80.0, 250.0, 0.0)
+        obstacles.add_bounds(upper_obstacle)
+        waypoints = router.get_flow_waypoints(source, target, obstacles)
+        self.assertEqual(router.count_route_collisions(waypoints, obstacles), 0)
+
+    def test_router_shares_channel_of_split(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [split_id, _] = bpmn_graph.add_parallel_gateway_to_diagram(process_id, gateway_name="split")
+        tasks_ids = [bpmn_graph.add_task_to_diagram(process_id, task_name="task" + str(index))[0]
+                     for index in range(3)]
+        for task_id in tasks_ids:
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, task_id)
+        for (index, node_id) in enumerate([split_id] + tasks_ids):
+            node = bpmn_graph.get_node_by_id(node_id)[1]
+            node[consts.Consts.x] = 50.0 if node_id == split_id else 200.0
+            node[consts.Consts.y] = 50.0 + 100.0 * max(index - 1, 0)
+
+        router.route_flows(bpmn_graph)
+        flows = [flow[2] for flow in bpmn_graph.get_flows()]
+        channels = set(flow[consts.Consts.waypoints][1][0] for flow in flows
+                       if len(flow[consts.Consts.waypoints]) > 2)
+        self.assertEqual(channels, set([175.0]))
+        # flows branch off the longest flow in its waypoints, not in the middle of its segments
+        longest_flow = max(flows, key=lambda flow: flow[consts.Consts.waypoints][-1][1])
+        for flow in flows:
+            for point in flow[consts.Consts.waypoints]:
+                if point[0] == 175.0:
+                    self.assertIn(point, longest_flow[consts.Consts.waypoints])
+
+    def test_obstacles_index(self):
+        obstacles = router.ObstaclesIndex([(0.0, 0.0, 100.0, 100.0), (500.0, 0.0, 600.0, 100.0)], cell_size=100.0)
+        self.assertEqual(obstacles.find_segment_obstacles((-50.0, 50.0), (550.0, 50.0)),
+                         [(0.0, 0.0, 100.0, 100.0), (500.0, 0.0, 600.0, 100.0)])
+        # touching node side is not a crossing
+        self.assertEqual(obstacles.find_segment_obstacles((100.0, 0.0), (100.0, 100.0)), [])
+        self.assertEqual(obstacles.find_segment_obstacles((200.0, 50.0), (400.0, 50.0)), [])
+
+    def test_obstacles_index_node_bounds(self):
+        obstacles = router.ObstaclesIndex([(0.0, 0.0, 100.0, 100.0), (500.0, 0.0, 600.0, 100.0)], cell_size=100.0,
+                                          node_ids=["node1", "node2"])
+        # moved node is found only at its new position
+        obstacles.set_node_bounds("node1", (250.0, 0.0, 350.0, 100.0))
+        self.assertEqual(obstacles.find_segment_obstacles((-50.0, 50.0), (550.0, 50.0)),
+                         [(250.0, 0.0, 350.0, 100.0), (500.0, 0.0, 600.0, 100.0)])
+        obstacles.remove_node_bounds("node2")
+        obstacles.remove_node_bounds("missing")
+        self.assertEqual(obstacles.find_segment_obstacles((-50.0, 50.0), (550.0, 50.0)),
+                         [(250.0, 0.0, 350.0, 100.0)])
+        self.assertEqual(sorted(obstacles.node_indexes), ["node1"])
+
+    def test_simplify_route(self):
+        self.assertEqual(router.simplify_route([(0.0, 0.0), (10.0, 0.0), (10.0, 0.0), (20.0, 0.0), (20.0, 5.0)]),
+                         [(0.0, 0.0), (20.0, 0.0), (20.0, 5.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
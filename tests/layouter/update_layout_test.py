@@ -0,0 +1,106 @@
+# coding=utf-8
+"""
+Unit tests for incremental update of layout generated by grid engine
+"""
+import unittest
+
+import bpmn_python.bpmn_diagram_layouter as layouter
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_diagram_router as router
+import bpmn_python.bpmn_import_utils as utils
+import bpmn_python.bpmn_python_consts as consts
+
+
+class UpdateLayoutTests(unittest.TestCase):
+    """
+    This class contains tests for updating grid layout after adding and removing nodes and flows.
+    """
+    output_directory = "./output/layouter/"
+
+    @staticmethod
+    def create_diagram():
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id, start_event_name="start_event")
+        [task1_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task1")
+        [task2_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task2")
+        [start_flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, task1_id)
+        [flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, task1_id, task2_id)
+        return bpmn_graph, process_id, [start_id, task1_id, task2_id], [start_flow_id, flow_id]
+
+    @staticmethod
+    def get_positions(bpmn_graph):
+        return dict((node_id, (node[consts.Consts.x], node[consts.Consts.y])) for (node_id, node)
+                    in bpmn_graph.get_nodes())
+
+    def assert_obstacles_match_nodes(self, bpmn_graph, grid):
+        # obstacles index kept by grid is updated, not created again
+        nodes = bpmn_graph.get_nodes()
+        self.assertEqual(sorted(grid.obstacles.node_indexes), sorted(node_id for (node_id, _) in nodes))
+        self.assertEqual(sorted(bounds for bounds in grid.obstacles.bounds_list if bounds is not None),
+                         sorted(router.get_node_bounds(node) for (_, node) in nodes))
+
+    def test_update_layout_added_node_and_flow(self):
+        (bpmn_graph, process_id, [start_id, task1_id, task2_id], [start_flow_id, _]) = \
+            UpdateLayoutTests.create_diagram()
+        grid = layouter.generate_grid_layout(bpmn_graph)
+        positions = UpdateLayoutTests.get_positions(bpmn_graph)
+        waypoints = bpmn_graph.get_flow_by_id(start_flow_id)[2][consts.Consts.waypoints]
+
+        # node is added first, without flows, then connected, as in editor
+        [task3_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task3")
+        obstacles = grid.obstacles
+        self.assertEqual(layouter.update_grid_layout(bpmn_graph, grid, added_nodes=[task3_id]), [task3_id])
+        self.assertIs(grid.obstacles, obstacles)
+        self.assertEqual(grid.get_cell(task3_id).col, 1)
+        self.assertGreater(grid.get_cell(task3_id).row, grid.get_cell(start_id).row)
+
+        [flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, task1_id, task3_id)
+        self.assertEqual(layouter.update_grid_layout(bpmn_graph, grid, added_flows=[flow_id]), [task3_id])
+        task2_cell = grid.get_cell(task2_id)
+        task3_cell = grid.get_cell(task3_id)
+        self.assertEqual(task3_cell.col, task2_cell.col)
+        self.assertNotEqual(task3_cell.row, task2_cell.row)
+
+        # other nodes and flows, that do not touch changed nodes, are not moved
+        new_positions = UpdateLayoutTests.get_positions(bpmn_graph)
+        for node_id in [start_id, task1_id, task2_id]:
+            self.assertEqual(new_positions[node_id], positions[node_id])
+        self.assertEqual(bpmn_graph.get_flow_by_id(start_flow_id)[2][consts.Consts.waypoints], waypoints)
+        self.assert_obstacles_match_nodes(bpmn_graph, grid)
+        three_waypoints = bpmn_graph.get_flow_by_id(flow_id)[2][consts.Consts.waypoints]
+        self.assertEqual(three_waypoints[-1], (new_positions[task3_id][0], new_positions[task3_id][1] + 50.0))
+        bpmn_graph.export_xml_file(self.output_directory, "update_layout_added.xml")
+
+    def test_update_layout_removed_node(self):
+        (bpmn_graph, process_id, [start_id, task1_id, task2_id], [_, flow_id]) = UpdateLayoutTests.create_diagram()
+        grid = layouter.generate_grid_layout(bpmn_graph)
+        task2_cell = grid.get_cell(task2_id)
+
+        removed_flow = bpmn_graph.get_flow_by_id(flow_id)
+        utils.BpmnImportUtils.remove_flow_edge(bpmn_graph.diagram_graph, flow_id, task1_id, task2_id)
+        del bpmn_graph.sequence_flows[flow_id]
+        bpmn_graph.get_node_by_id(task1_id)[1][consts.Consts.outgoing_flow].remove(flow_id)
+        bpmn_graph.diagram_graph.remove_node(task2_id)
+        bpmn_graph.rebuild_indexes()
+        self.assertEqual(layouter.update_grid_layout(bpmn_graph, grid, removed_nodes=[task2_id],
+                                                     removed_flows=[removed_flow]), [])
+        self.assertNotIn(task2_id, grid)
+        self.assert_obstacles_match_nodes(bpmn_graph, grid)
+
+        [task3_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task3")
+        [flow_id, _] = bpmn_graph.add_sequence_flow_to_diagram(process_id, task1_id, task3_id)
+        layouter.update_grid_layout(bpmn_graph, grid, added_nodes=[task3_id], added_flows=[flow_id])
+        task3_cell = grid.get_cell(task3_id)
+        self.assertEqual((task3_cell.row, task3_cell.col), (task2_cell.row, task2_cell.col))
+        self.assert_obstacles_match_nodes(bpmn_graph, grid)
+
+    def test_sort_nodes_subset(self):
+        (bpmn_graph, _, [start_id, task1_id, task2_id], _) = UpdateLayoutTests.create_diagram()
+        self.assertEqual(layouter.sort_nodes_subset(bpmn_graph, [task2_id, start_id, task1_id]),
+                         [start_id, task1_id, task2_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
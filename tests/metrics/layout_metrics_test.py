@@ -2,20 +2,25 @@
 """
 Layout metrics computing tests
 """
+import copy
+import glob
 import os
+import random
 import unittest
 
 import bpmn_python.diagram_layout_metrics as metrics
 import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
 
 
 class MetricsTests(unittest.TestCase):
     crossing_points_example_path = "../examples/metrics/crossing_point_test.bpmn"
     cycles_example_path = "../examples/metrics/cycles_test.bpmn"
+    examples_pattern = "../examples/*/*.bpmn"
 
     @staticmethod
-    def load_example_diagram(filepath):
-        bpmn_graph = diagram.BpmnDiagramGraph()
+    def load_example_diagram(filepath, multigraph=False):
+        bpmn_graph = diagram.BpmnDiagramGraph(multigraph=multigraph)
         bpmn_graph.load_diagram_from_xml_file(os.path.abspath(filepath))
         return bpmn_graph
 
@@ -24,6 +29,54 @@ class MetricsTests(unittest.TestCase):
         cross_points = metrics.count_crossing_points(bpmn_graph)
         self.assertEqual(cross_points, 6, "Crossing points count does not match")
 
+    def test_count_crossing_points_matches_pairwise(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = MetricsTests.load_example_diagram(example_path)
+            self.assertEqual(metrics.count_crossing_points(bpmn_graph),
+                             metrics.count_crossing_points_pairwise(bpmn_graph), example_path)
+            self.assertEqual(metrics.count_crossing_points_vectorized(bpmn_graph),
+                             metrics.count_crossing_points_pairwise(bpmn_graph), example_path)
+
+    @staticmethod
+    def generate_random_layout(generator, canvas_size):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        node_ids = [bpmn_graph.add_task_to_diagram(process_id, task_name="task" + str(index))[0]
+                    for index in range(30)]
+        for index in range(200):
+            [_, flow] = bpmn_graph.add_sequence_flow_to_diagram(process_id, generator.choice(node_ids),
+                                                                generator.choice(node_ids))
+            # small canvas produces many collinear, touching and overlapping segments
+            flow[consts.Consts.waypoints] = [(float(generator.randint(0, canvas_size)),
+                                              float(generator.randint(0, canvas_size)))
+                                             for _ in range(generator.randint(2, 4))]
+        return bpmn_graph
+
+    def test_count_crossing_points_random_waypoints(self):
+        generator = random.Random(0)
+        for canvas_size in [5, 50, 1000]:
+            bpmn_graph = MetricsTests.generate_random_layout(generator, canvas_size)
+            self.assertEqual(metrics.count_crossing_points(bpmn_graph),
+                             metrics.count_crossing_points_pairwise(bpmn_graph))
+
+    def test_count_crossing_points_batch(self):
+        generator = random.Random(1)
+        layouts = [MetricsTests.generate_random_layout(generator, canvas_size) for canvas_size in [5, 50, 1000, 50]]
+        layouts.append(metrics.get_segments_array(layouts[0]))
+        expected = [metrics.count_crossing_points_pairwise(bpmn_graph) for bpmn_graph in layouts[:-1]]
+        expected.append(expected[0])
+        self.assertEqual(metrics.count_crossing_points_batch(layouts), expected)
+        self.assertEqual(metrics.count_crossing_points_batch([]), [])
+
+        # small chunks split pairs of segments between many array operations
+        chunk_size = metrics.crossing_pairs_chunk_size
+        metrics.crossing_pairs_chunk_size = 100
+        try:
+            self.assertEqual(metrics.count_crossing_points_batch(layouts), expected)
+        finally:
+            metrics.crossing_pairs_chunk_size = chunk_size
+
     def test_count_segments(self):
         bpmn_graph = MetricsTests.load_example_diagram(self.crossing_points_example_path)
         segments_count = metrics.count_segments(bpmn_graph)
@@ -39,6 +92,107 @@ class MetricsTests(unittest.TestCase):
         (longest_path, longest_path_len) = metrics.compute_longest_path_tasks(bpmn_graph)
         self.assertEqual(longest_path_len, 6, "Path length does not match")
 
+    @staticmethod
+    def search_longest_paths(bpmn_graph):
+        """
+        Reference computation of the longest paths with exhaustive search of find_longest_path and
+        find_longest_path_tasks.
+        """
+        longest_path = []
+        longest_path_tasks = []
+        for node in copy.deepcopy(bpmn_graph.get_nodes()):
+            if len(node[1][consts.Consts.incoming_flow]) == 0:
+                (path, path_len) = metrics.find_longest_path([], node, bpmn_graph)
+                if path_len > len(longest_path):
+                    longest_path = path
+                (_, qualified_nodes) = metrics.find_longest_path_tasks([], [], node, bpmn_graph)
+                if len(qualified_nodes) > len(longest_path_tasks):
+                    longest_path_tasks = qualified_nodes
+        return [node[0] for node in longest_path], [node[0] for node in longest_path_tasks]
+
+    def assert_longest_paths_match_search(self, bpmn_graph, message=None):
+        (longest_path, longest_path_len) = metrics.compute_longest_path(bpmn_graph)
+        (longest_path_tasks, longest_path_tasks_len) = metrics.compute_longest_path_tasks(bpmn_graph)
+        self.assertEqual(len(longest_path), longest_path_len)
+        self.assertEqual(len(longest_path_tasks), longest_path_tasks_len)
+        self.assertEqual(([node[0] for node in longest_path], [node[0] for node in longest_path_tasks]),
+                         MetricsTests.search_longest_paths(bpmn_graph), message)
+
+    def test_compute_longest_paths_match_search(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = MetricsTests.load_example_diagram(example_path)
+            self.assert_longest_paths_match_search(bpmn_graph, example_path)
+
+    def test_compute_longest_paths_random_cycles(self):
+        generator = random.Random(0)
+        for _ in range(100):
+            bpmn_graph = diagram.BpmnDiagramGraph(multigraph=True)
+            bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+            process_id = bpmn_graph.add_process_to_diagram()
+            node_ids = []
+            for index in range(generator.randint(2, 9)):
+                if generator.random() < 0.5:
+                    node_ids.append(bpmn_graph.add_task_to_diagram(process_id, task_name="task" + str(index))[0])
+                else:
+                    node_ids.append(bpmn_graph.add_exclusive_gateway_to_diagram(process_id)[0])
+            for _ in range(generator.randint(1, 14)):
+                bpmn_graph.add_sequence_flow_to_diagram(process_id, generator.choice(node_ids),
+                                                        generator.choice(node_ids))
+            self.assert_longest_paths_match_search(bpmn_graph)
+
+    def test_compute_longest_paths_gateway_chain(self):
+        # number of paths grows exponentially with number of split/join blocks
+        blocks = 100
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [last_id, _] = bpmn_graph.add_start_event_to_diagram(process_id)
+        for _ in range(blocks):
+            [split_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id)
+            [join_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id)
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, split_id)
+            for _ in range(2):
+                [task_id, _] = bpmn_graph.add_task_to_diagram(process_id)
+                bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, task_id)
+                bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, join_id)
+            last_id = join_id
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, end_id)
+
+        self.assertEqual(metrics.compute_longest_path(bpmn_graph)[1], 3 * blocks + 2)
+        self.assertEqual(metrics.compute_longest_path_tasks(bpmn_graph)[1], blocks)
+
+    def test_compute_longest_paths_long_cycle(self):
+        # path inside cycle is longer than recursion limit
+        tasks = 1500
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [start_id, _] = bpmn_graph.add_start_event_to_diagram(process_id)
+        [join_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, start_id, join_id)
+        last_id = join_id
+        for _ in range(tasks):
+            [task_id, _] = bpmn_graph.add_task_to_diagram(process_id)
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, task_id)
+            last_id = task_id
+        [split_id, _] = bpmn_graph.add_exclusive_gateway_to_diagram(process_id)
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, last_id, split_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, join_id)
+        bpmn_graph.add_sequence_flow_to_diagram(process_id, split_id, end_id)
+
+        self.assertEqual(metrics.compute_longest_path(bpmn_graph)[1], tasks + 4)
+        self.assertEqual(metrics.compute_longest_path_tasks(bpmn_graph)[1], tasks)
+
+    def test_metrics_of_multigraph(self):
+        bpmn_graph = MetricsTests.load_example_diagram(self.crossing_points_example_path, multigraph=True)
+        self.assertEqual(metrics.count_crossing_points(bpmn_graph), 6, "Crossing points count does not match")
+        self.assertEqual(metrics.count_segments(bpmn_graph), 25, "Segments count does not match")
+        bpmn_graph = MetricsTests.load_example_diagram(self.cycles_example_path, multigraph=True)
+        self.assertEqual(metrics.compute_longest_path(bpmn_graph)[1], 9, "Path length does not match")
+        self.assertEqual(metrics.compute_longest_path_tasks(bpmn_graph)[1], 6, "Path length does not match")
+
 
 if __name__ == '__main__':
     unittest.main()
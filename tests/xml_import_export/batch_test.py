@@ -0,0 +1,67 @@
+# coding=utf-8
+"""
+Test unit, checking batch import, export and conversion of diagrams in pool of worker processes
+"""
+import glob
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_batch as batch
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+
+import diagram_test_utils as test_utils
+
+
+class BatchTests(test_utils.DiagramAssertions, unittest.TestCase):
+    """
+    This class contains tests for loading, exporting and converting many diagrams with bpmn_diagram_batch module.
+    """
+    examples_pattern = "../examples/*/*.bpmn"
+    output_directory = "./output/test-batch/"
+    example_path = "../examples/xml_import_export/lanes.bpmn"
+
+    def test_diagram_payload(self):
+        for multigraph in [False, True]:
+            bpmn_graph = test_utils.load_diagram(self.example_path, multigraph=multigraph)
+            payload = batch.get_diagram_payload(bpmn_graph)
+            self.assert_same_diagrams(bpmn_graph, batch.create_diagram_from_payload(payload))
+            compact_graph = batch.create_diagram_from_payload(payload, compact=True)
+            self.assertEqual(compact_graph.diagram_graph.is_multigraph(), multigraph)
+            self.assert_same_diagrams(bpmn_graph, compact_graph)
+
+    def test_load_many(self):
+        example_paths = [os.path.abspath(path) for path in sorted(glob.glob(self.examples_pattern))]
+        missing_path = os.path.abspath("../examples/missing.bpmn")
+        results = list(batch.load_many(example_paths + [missing_path], workers=2))
+        self.assertEqual(sorted(result[0] for result in results), sorted(example_paths + [missing_path]))
+        for (filepath, bpmn_graph, error) in results:
+            if filepath == missing_path:
+                self.assertIsNone(bpmn_graph)
+                self.assertTrue(error)
+            else:
+                self.assertIsNone(error)
+                self.assert_same_diagrams(test_utils.load_diagram(filepath), bpmn_graph)
+
+        ordered_results = list(batch.load_many(example_paths, workers=2, streaming=True, ordered=True))
+        self.assertEqual([result[0] for result in ordered_results], example_paths)
+
+    def test_export_and_convert_many(self):
+        bpmn_graph = test_utils.load_diagram(self.example_path)
+        results = batch.export_many([("lanes_export.bpmn", bpmn_graph), ("lanes_export_2.bpmn", bpmn_graph)],
+                                    self.output_directory, workers=2)
+        self.assertEqual(results, [("lanes_export.bpmn", None), ("lanes_export_2.bpmn", None)])
+        self.assert_same_diagrams(
+            test_utils.load_diagram(os.path.join(self.output_directory, "lanes_export.bpmn")),
+            test_utils.load_diagram(os.path.join(self.output_directory, "lanes_export_2.bpmn")))
+
+        results = list(batch.convert_many([os.path.abspath(self.example_path)], self.output_directory,
+                                          file_format="xml_no_di"))
+        self.assertEqual(results, [(os.path.abspath(self.example_path), "lanes.bpmn", None)])
+        self.assertTrue(os.path.exists(os.path.join(self.output_directory, "lanes.bpmn")))
+
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            batch.export_many([("lanes.json", bpmn_graph)], self.output_directory, file_format="json")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# coding=utf-8
+"""
+Test unit, checking that Diagram Interchange coordinates are imported as numbers and exported without loss
+"""
+import glob
+import os
+import unittest
+import xml.dom.minidom as minidom
+
+import bpmn_python.bpmn_diagram_export as bpmn_export
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+
+class DiCoordinatesTests(unittest.TestCase):
+    """
+    This class contains tests for import and export of BPMNShape bounds and BPMNEdge waypoints.
+    """
+    examples_pattern = "../examples/xml_import_export/*"
+    example_path = "../examples/xml_import_export/camunda_simple_example.bpmn"
+    output_directory = "./output/test-di-coordinates/"
+
+    @staticmethod
+    def get_geometry(bpmn_graph):
+        nodes = dict((node_id, tuple(node.get(name) for name in [consts.Consts.x, consts.Consts.y,
+                                                                 consts.Consts.width, consts.Consts.height]))
+                     for node_id, node in bpmn_graph.get_nodes())
+        flows = dict((flow[consts.Consts.id], flow.get(consts.Consts.waypoints))
+                     for _, _, flow in bpmn_graph.get_flows())
+        return nodes, flows
+
+    def test_format_coordinate(self):
+        self.assertEqual(bpmn_export.BpmnDiagramGraphExport.format_coordinate(150.0), "150")
+        self.assertEqual(bpmn_export.BpmnDiagramGraphExport.format_coordinate(63.355407047387615),
+                         "63.355407047387615")
+        self.assertEqual(bpmn_export.BpmnDiagramGraphExport.format_coordinate(-0.5), "-0.5")
+        self.assertEqual(bpmn_export.BpmnDiagramGraphExport.format_coordinate("100"), "100")
+
+    def test_coordinates_round_trip(self):
+        for example_path in glob.glob(self.examples_pattern):
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+            nodes, flows = self.get_geometry(bpmn_graph)
+            for values in nodes.values():
+                for value in values:
+                    self.assertIsInstance(value, float)
+            for waypoints in flows.values():
+                for waypoint in waypoints:
+                    self.assertIsInstance(waypoint[0], float)
+                    self.assertIsInstance(waypoint[1], float)
+
+            output_file = os.path.basename(example_path) + ".xml"
+            bpmn_graph.export_xml_file(self.output_directory, output_file)
+            exported_graph = diagram.BpmnDiagramGraph()
+            exported_graph.load_diagram_from_xml_file(os.path.abspath(os.path.join(self.output_directory,
+                                                                                   output_file)))
+            self.assertEqual(self.get_geometry(exported_graph), (nodes, flows))
+
+    def test_import_all_di_elements_of_plane(self):
+        expected_graph = diagram.BpmnDiagramGraph()
+        expected_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+
+        # shape referring to the same BPMN element as edge, and shape without 'bpmnElement' attribute, are added
+        # after each edge
+        document = minidom.parse(self.example_path)
+        for edge in document.getElementsByTagNameNS("*", "BPMNEdge"):
+            for bpmn_element in [edge.getAttribute(consts.Consts.bpmn_element), None]:
+                shape = document.createElementNS(edge.namespaceURI, "bpmndi:BPMNShape")
+                if bpmn_element is not None:
+                    shape.setAttribute(consts.Consts.bpmn_element, bpmn_element)
+                bounds = document.createElementNS(edge.namespaceURI, "dc:Bounds")
+                for name in [consts.Consts.x, consts.Consts.y, consts.Consts.width, consts.Consts.height]:
+                    bounds.setAttribute(name, "10")
+                shape.appendChild(bounds)
+                edge.parentNode.insertBefore(shape, edge.nextSibling)
+        if not os.path.exists(self.output_directory):
+            os.makedirs(self.output_directory)
+        output_path = os.path.join(self.output_directory, "camunda_simple_example_extra_shapes.bpmn")
+        with open(output_path, "w") as output_file:
+            document.writexml(output_file)
+
+        for streaming in [False, True]:
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(os.path.abspath(output_path), streaming=streaming)
+            self.assertEqual(self.get_geometry(bpmn_graph), self.get_geometry(expected_graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# coding=utf-8
+"""
+Test unit, checking registration of element handlers of default XML importer
+"""
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_import as bpmn_import
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+
+class ElementHandlersTests(unittest.TestCase):
+    """
+    This class contains tests for importing child elements of process with handlers registered
+    in BpmnDiagramGraphImport.
+    """
+    example_path = "../examples/xml_import_export/camunda_simple_example.bpmn"
+    bpmn_namespace = "http://www.omg.org/spec/BPMN/20100524/MODEL"
+
+    def setUp(self):
+        self.default_handlers = dict(bpmn_import.BpmnDiagramGraphImport.element_handlers)
+
+    def tearDown(self):
+        bpmn_import.BpmnDiagramGraphImport.element_handlers.clear()
+        bpmn_import.BpmnDiagramGraphImport.element_handlers.update(self.default_handlers)
+
+    def load_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        return bpmn_graph
+
+    def test_wrap_default_handler(self):
+        default_handler = bpmn_import.BpmnDiagramGraphImport.get_element_handler(consts.Consts.task)
+        self.assertIsNotNone(default_handler)
+        self.assertTrue(bpmn_import.BpmnDiagramGraphImport.has_default_element_handlers())
+
+        def task_handler(diagram_graph, sequence_flows, process_id, process_attributes, element):
+            default_handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+            diagram_graph.node[element.getAttribute(consts.Consts.id)]["prefix"] = element.prefix
+
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler(consts.Consts.task, task_handler)
+        self.assertFalse(bpmn_import.BpmnDiagramGraphImport.has_default_element_handlers())
+        bpmn_graph = self.load_diagram()
+        tasks = bpmn_graph.get_nodes(consts.Consts.task)
+        self.assertEqual(len(tasks), 4)
+        for (_, task) in tasks:
+            self.assertEqual(task["prefix"], "bpmn")
+        self.assertEqual(len(bpmn_graph.get_flows()), 8)
+
+    def test_namespace_handler_and_unregister(self):
+        default_handler = bpmn_import.BpmnDiagramGraphImport.get_element_handler(consts.Consts.task)
+        used_handlers = []
+
+        def get_recording_handler(name):
+            def handler(diagram_graph, sequence_flows, process_id, process_attributes, element):
+                used_handlers.append(name)
+                default_handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+            return handler
+
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler(consts.Consts.task, get_recording_handler("any"))
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler(consts.Consts.task,
+                                                                    get_recording_handler("namespace"),
+                                                                    self.bpmn_namespace)
+        # handler registered for namespace of element takes precedence over handler of any namespace
+        self.assertEqual(len(self.load_diagram().get_nodes(consts.Consts.task)), 4)
+        self.assertEqual(used_handlers, ["namespace"] * 4)
+
+        del used_handlers[:]
+        bpmn_import.BpmnDiagramGraphImport.unregister_element_handler(consts.Consts.task, self.bpmn_namespace)
+        self.assertIsNone(bpmn_import.BpmnDiagramGraphImport.get_element_handler(consts.Consts.task,
+                                                                                 self.bpmn_namespace))
+        self.assertEqual(len(self.load_diagram().get_nodes(consts.Consts.task)), 4)
+        self.assertEqual(used_handlers, ["any"] * 4)
+
+    def test_wrap_sequence_flow_handler(self):
+        default_handler = bpmn_import.BpmnDiagramGraphImport.get_element_handler(consts.Consts.sequence_flow)
+        self.assertIsNotNone(default_handler)
+
+        def flow_handler(diagram_graph, sequence_flows, process_id, process_attributes, element):
+            # flow nodes are imported before sequence flows
+            self.assertTrue(diagram_graph.has_node(element.getAttribute(consts.Consts.source_ref)))
+            self.assertTrue(diagram_graph.has_node(element.getAttribute(consts.Consts.target_ref)))
+            default_handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+            sequence_flows[element.getAttribute(consts.Consts.id)]["prefix"] = element.prefix
+
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler(consts.Consts.sequence_flow, flow_handler)
+        self.assertFalse(bpmn_import.BpmnDiagramGraphImport.has_default_element_handlers())
+        bpmn_graph = self.load_diagram()
+        self.assertEqual(len(bpmn_graph.get_flows()), 8)
+        self.assertEqual(len(bpmn_graph.sequence_flows), 8)
+        for flow in bpmn_graph.sequence_flows.values():
+            self.assertEqual(flow["prefix"], "bpmn")
+
+        bpmn_import.BpmnDiagramGraphImport.unregister_element_handler(consts.Consts.sequence_flow)
+        bpmn_graph = self.load_diagram()
+        self.assertEqual(len(bpmn_graph.get_nodes(consts.Consts.task)), 4)
+        self.assertEqual(len(bpmn_graph.get_flows()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# coding=utf-8
+"""
+Test unit, checking cache of imported diagrams
+"""
+import os
+import shutil
+import unittest
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_import as bpmn_import
+import bpmn_python.bpmn_diagram_import_cache as import_cache
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+import diagram_test_utils as test_utils
+
+
+class ImportCacheTests(test_utils.DiagramAssertions, unittest.TestCase):
+    """
+    This class contains tests for loading diagrams through BpmnDiagramImportCache.
+    """
+    output_directory = "./output/test-import-cache/"
+    example_path = "../examples/xml_import_export/lanes.bpmn"
+    other_example_path = "../examples/xml_import_export/camunda_simple_example.bpmn"
+
+    def setUp(self):
+        if os.path.exists(self.output_directory):
+            shutil.rmtree(self.output_directory)
+
+    def test_cache_returns_independent_diagrams(self):
+        cache = import_cache.BpmnDiagramImportCache()
+        expected = test_utils.load_diagram(self.example_path)
+        first = test_utils.load_diagram(self.example_path, cache=cache)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 1, 1))
+        self.assert_same_diagrams(expected, first)
+
+        # modifications of loaded diagram don't change cached state
+        (node_id, node) = next(iter(first.get_nodes()))
+        node[consts.Consts.node_name] = "modified"
+        next(iter(first.process_elements.values()))[consts.Consts.name] = "modified"
+        first.collaboration.clear()
+        second = test_utils.load_diagram(self.example_path, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assert_same_diagrams(expected, second)
+        self.assertIsNot(second.get_node_by_id(node_id)[1], node)
+
+    def test_cache_lru_eviction(self):
+        cache = import_cache.BpmnDiagramImportCache()
+        test_utils.load_diagram(self.example_path, cache=cache)
+        lanes_size = cache.size
+        test_utils.load_diagram(self.other_example_path, cache=cache)
+        self.assertEqual(len(cache), 2)
+
+        cache = import_cache.BpmnDiagramImportCache(max_size=lanes_size)
+        test_utils.load_diagram(self.other_example_path, cache=cache)
+        test_utils.load_diagram(self.example_path, cache=cache)
+        # the least recently used snapshot is evicted, when size limit is exceeded
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, lanes_size)
+        test_utils.load_diagram(self.example_path, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_cache_directory(self):
+        cache = import_cache.BpmnDiagramImportCache(directory=self.output_directory)
+        expected = test_utils.load_diagram(self.example_path, cache=cache)
+        self.assertEqual(len(os.listdir(self.output_directory)), 1)
+
+        # new cache (e.g. after restart) loads snapshot saved by the previous one
+        cache = import_cache.BpmnDiagramImportCache(max_size=0, directory=self.output_directory)
+        self.assert_same_diagrams(expected, test_utils.load_diagram(self.example_path, cache=cache))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 0, 0))
+
+        # snapshots of different importers are kept separately
+        test_utils.load_diagram(self.example_path, streaming=True, cache=cache)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(os.listdir(self.output_directory)), 2)
+
+    def test_cache_keeps_graph_kinds_separately(self):
+        bpmn_graph = diagram.BpmnDiagramGraph(multigraph=True)
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [task1_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task1")
+        [task2_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name="task2")
+        for _ in range(2):
+            bpmn_graph.add_sequence_flow_to_diagram(process_id, task1_id, task2_id)
+        bpmn_graph.export_xml_file(self.output_directory, "parallel_flows.bpmn")
+        filepath = os.path.join(self.output_directory, "parallel_flows.bpmn")
+
+        cache = import_cache.BpmnDiagramImportCache()
+        # simple graph merges parallel flows, its snapshot is not used for multigraph
+        self.assertEqual(len(test_utils.load_diagram(filepath, cache=cache).get_flows()), 1)
+        multigraph = test_utils.load_diagram(filepath, multigraph=True, cache=cache)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 2, 2))
+        self.assertEqual(len(multigraph.get_flows()), 2)
+        self.assert_same_diagrams(test_utils.load_diagram(filepath, multigraph=True), multigraph)
+
+    def test_corrupted_snapshot_is_imported_again(self):
+        cache = import_cache.BpmnDiagramImportCache(directory=self.output_directory)
+        expected = test_utils.load_diagram(self.example_path, cache=cache)
+        [snapshot_name] = os.listdir(self.output_directory)
+        snapshot_path = os.path.join(self.output_directory, snapshot_name)
+        with open(snapshot_path, "rb") as input_file:
+            data = input_file.read()
+        with open(snapshot_path, "wb") as output_file:
+            output_file.write(data[:len(data) // 2])
+
+        cache = import_cache.BpmnDiagramImportCache(directory=self.output_directory)
+        self.assert_same_diagrams(expected, test_utils.load_diagram(self.example_path, cache=cache))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 1, 1))
+        # corrupted file is replaced by snapshot of the new import
+        with open(snapshot_path, "rb") as input_file:
+            self.assertEqual(input_file.read(), data)
+        self.assert_same_diagrams(expected, test_utils.load_diagram(self.example_path, cache=cache))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_cache_bypassed_with_element_handlers(self):
+        cache = import_cache.BpmnDiagramImportCache(directory=self.output_directory)
+        test_utils.load_diagram(self.example_path, cache=cache)
+        default_handler = bpmn_import.BpmnDiagramGraphImport.get_element_handler(consts.Consts.task)
+
+        def task_handler(diagram_graph, sequence_flows, process_id, process_attributes, element):
+            default_handler(diagram_graph, sequence_flows, process_id, process_attributes, element)
+            # attribute, that is not serializable to JSON
+            diagram_graph.node[element.getAttribute(consts.Consts.id)]["tags"] = {"tag"}
+
+        bpmn_import.BpmnDiagramGraphImport.register_element_handler(consts.Consts.task, task_handler)
+        try:
+            # snapshot cached before handler was registered is not used
+            bpmn_graph = test_utils.load_diagram(self.example_path, cache=cache)
+            with self.assertRaises(bpmn_exception.BpmnPythonError):
+                test_utils.load_diagram(self.example_path, streaming=True, cache=cache)
+        finally:
+            bpmn_import.BpmnDiagramGraphImport.register_element_handler(consts.Consts.task, default_handler)
+        self.assertTrue(bpmn_graph.get_nodes(consts.Consts.task))
+        for (_, task) in bpmn_graph.get_nodes(consts.Consts.task):
+            self.assertEqual(task["tags"], {"tag"})
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 3, 1))
+        self.assertEqual(len(os.listdir(self.output_directory)), 1)
+
+        bpmn_graph = test_utils.load_diagram(self.example_path, cache=cache)
+        self.assertNotIn("tags", bpmn_graph.get_nodes(consts.Consts.task)[0][1])
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
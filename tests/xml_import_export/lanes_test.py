@@ -4,8 +4,11 @@ Test unit, using simple graph made in Signavio editor for import/export operatio
 """
 import os
 import unittest
+import xml.etree.cElementTree as eTree
 
+import bpmn_python.bpmn_diagram_export as bpmn_export
 import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
 
 
 class BPMNEditorTests(unittest.TestCase):
@@ -28,5 +31,61 @@ class BPMNEditorTests(unittest.TestCase):
         bpmn_graph.export_xml_file(self.output_directory, self.output_file_with_di)
         bpmn_graph.export_xml_file_no_di(self.output_directory, self.output_file_no_di)
 
+    def test_import_nested_lane_di(self):
+        """
+        Test for importing Diagram Interchange information of a lane nested in child lane sets
+        """
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        lane_set = bpmn_graph.process_elements["sid-931F7364-7F12-4B42-8A43-528FFBCF8922"][consts.Consts.lane_set]
+        lane = lane_set[consts.Consts.lanes]["sid-99BE382A-318D-46E0-9204-B46B0DD6DDAB"]
+        lane = lane[consts.Consts.child_lane_set][consts.Consts.lanes]["sid-F8CD5050-3B20-4D31-A7A7-91C8F127338C"]
+        lane = lane[consts.Consts.child_lane_set][consts.Consts.lanes]["sid-AE294A25-8A09-4A53-B9F6-F0618046588A"]
+        self.assertEqual(lane[consts.Consts.name], "4a")
+        self.assertEqual((lane[consts.Consts.x], lane[consts.Consts.y], lane[consts.Consts.width]),
+                         (150.0, 75.0, 510.0))
+        self.assertEqual(lane[consts.Consts.is_horizontal], "true")
+
+    def test_partition_diagram(self):
+        """
+        Test for grouping nodes and flows of diagram with multiple pools by process and flow kind, used by export
+        """
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        (nodes_by_process, flows_by_process, message_flows_params) = \
+            bpmn_export.BpmnDiagramGraphExport.partition_diagram(bpmn_graph)
+        for process_id in bpmn_graph.process_elements:
+            self.assertEqual(nodes_by_process.get(process_id, []),
+                             bpmn_graph.get_nodes_list_by_process_id(process_id))
+            self.assertEqual(sorted(flow[2][consts.Consts.id] for flow in flows_by_process.get(process_id, [])),
+                             sorted(flow[2][consts.Consts.id]
+                                    for flow in bpmn_graph.get_flows_list_by_process_id(process_id)))
+        message_flows = bpmn_graph.collaboration[consts.Consts.message_flows]
+        self.assertTrue(message_flows)
+        self.assertEqual(sorted(message_flows_params), sorted(message_flows))
+        for message_flow_id in message_flows:
+            self.assertIs(message_flows_params[message_flow_id], bpmn_graph.get_flow_by_id(message_flow_id)[2])
+
+    def test_export_lanes_example_no_di(self):
+        """
+        Test for exporting diagram with multiple pools without Diagram Interchange data, each node and sequence flow
+        is exported once, in its own process, and message flows are not exported
+        """
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        bpmn_graph.export_xml_file_no_di(self.output_directory, self.output_file_no_di)
+        definitions = eTree.parse(os.path.join(self.output_directory, self.output_file_no_di)).getroot()
+        exported_ids = {}
+        for process in definitions:
+            for element in process:
+                exported_ids[element.get(consts.Consts.id)] = process.get(consts.Consts.id)
+        self.assertEqual(sum(len(process) for process in definitions), len(exported_ids))
+        expected_ids = dict((node_id, node[consts.Consts.process]) for (node_id, node) in bpmn_graph.get_nodes())
+        expected_ids.update((flow[2][consts.Consts.id], flow[2][consts.Consts.process])
+                            for flow in bpmn_graph.get_flows()
+                            if flow[2][consts.Consts.id] in bpmn_graph.sequence_flows)
+        self.assertEqual(exported_ids, expected_ids)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+# coding=utf-8
+"""
+Test unit, checking that diagram saved to binary snapshot is loaded back unchanged
+"""
+import glob
+import os
+import struct
+import unittest
+
+import bpmn_python.bpmn_diagram_exception as bpmn_exception
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_diagram_snapshot as bpmn_snapshot
+import bpmn_python.bpmn_python_consts as consts
+
+import diagram_test_utils as test_utils
+
+
+class SnapshotTests(test_utils.DiagramAssertions, unittest.TestCase):
+    """
+    This class contains tests for saving diagrams to binary snapshots and loading them back.
+    """
+    examples_pattern = "../examples/*/*.bpmn"
+    output_directory = "./output/test-snapshot/"
+    example_path = "../examples/xml_import_export/lanes.bpmn"
+
+    def setUp(self):
+        if not os.path.exists(self.output_directory):
+            os.makedirs(self.output_directory)
+
+    def test_snapshot_of_examples(self):
+        example_paths = sorted(glob.glob(self.examples_pattern))
+        self.assertTrue(example_paths)
+        snapshot_path = os.path.join(self.output_directory, "example.snapshot")
+        for example_path in example_paths:
+            for multigraph in [False, True]:
+                bpmn_graph = diagram.BpmnDiagramGraph(multigraph=multigraph)
+                bpmn_graph.load_diagram_from_xml_file(os.path.abspath(example_path))
+                bpmn_graph.save_snapshot(snapshot_path)
+                for use_mmap in [True, False]:
+                    loaded_graph = diagram.BpmnDiagramGraph(multigraph=multigraph, compact=use_mmap)
+                    loaded_graph.load_snapshot(snapshot_path, use_mmap=use_mmap)
+                    self.assert_same_diagrams(bpmn_graph, loaded_graph)
+
+    def test_snapshot_of_created_diagram(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [task_id, task] = bpmn_graph.add_task_to_diagram(process_id, task_name=u"zadanie ą")
+        [end_id, _] = bpmn_graph.add_end_event_to_diagram(process_id)
+        [flow_id, flow] = bpmn_graph.add_sequence_flow_to_diagram(process_id, task_id, end_id)
+        # attributes, that are not kept in arrays of snapshot
+        task[consts.Consts.x] = "10"
+        task[consts.Consts.width] = float("nan")
+        flow[consts.Consts.waypoints] = [(1.0, 2.0), ("3", "4")]
+        snapshot_path = os.path.join(self.output_directory, "created.snapshot")
+        bpmn_graph.save_snapshot(snapshot_path)
+        loaded_graph = diagram.BpmnDiagramGraph()
+        loaded_graph.load_snapshot(snapshot_path)
+        loaded_task = loaded_graph.get_node_by_id(task_id)[1]
+        self.assertEqual(loaded_task[consts.Consts.node_name], u"zadanie ą")
+        self.assertEqual(loaded_task[consts.Consts.x], "10")
+        self.assertNotEqual(loaded_task[consts.Consts.width], loaded_task[consts.Consts.width])
+        self.assertEqual(loaded_task[consts.Consts.y], task[consts.Consts.y])
+        self.assertEqual([list(point) for point in loaded_graph.get_flow_by_id(flow_id)[2][consts.Consts.waypoints]],
+                         [[1.0, 2.0], ["3", "4"]])
+        self.assertEqual(loaded_graph.sequence_flows, bpmn_graph.sequence_flows)
+
+    def test_map_node_bounds(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        snapshot_path = os.path.join(self.output_directory, "lanes.snapshot")
+        bpmn_graph.save_snapshot(snapshot_path)
+        (node_ids, bounds) = bpmn_snapshot.BpmnDiagramGraphSnapshot.map_node_bounds(snapshot_path)
+        self.assertEqual(sorted(node_ids), sorted(node_id for (node_id, _) in bpmn_graph.get_nodes()))
+        for (node_id, node_bounds) in zip(node_ids, bounds.tolist()):
+            node = bpmn_graph.get_node_by_id(node_id)[1]
+            self.assertEqual(node_bounds, [node[consts.Consts.x], node[consts.Consts.y], node[consts.Consts.width],
+                                           node[consts.Consts.height]])
+        del bounds
+
+    def test_invalid_snapshot(self):
+        invalid_path = os.path.join(self.output_directory, "invalid.snapshot")
+        with open(invalid_path, "wb") as output_file:
+            output_file.write(b"<?xml version='1.0' encoding='UTF-8'?><definitions/>")
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            diagram.BpmnDiagramGraph().load_snapshot(invalid_path)
+
+        with open(invalid_path, "wb") as output_file:
+            output_file.write(struct.pack(bpmn_snapshot.BpmnDiagramGraphSnapshot.header_format,
+                                          bpmn_snapshot.BpmnDiagramGraphSnapshot.magic, 99, 0))
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            diagram.BpmnDiagramGraph().load_snapshot(invalid_path, use_mmap=False)
+
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.load_diagram_from_xml_file(os.path.abspath(self.example_path))
+        bpmn_graph.save_snapshot(invalid_path)
+        with open(invalid_path, "rb") as input_file:
+            data = input_file.read()
+        with open(invalid_path, "wb") as output_file:
+            output_file.write(data[:-1])
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            diagram.BpmnDiagramGraph().load_snapshot(invalid_path)
+
+    def test_snapshot_of_not_serializable_attributes(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        [_, task] = bpmn_graph.add_task_to_diagram(process_id)
+        task["tags"] = {"tag"}
+        snapshot_path = os.path.join(self.output_directory, "not_serializable.snapshot")
+        with self.assertRaises(bpmn_exception.BpmnPythonError):
+            bpmn_graph.save_snapshot(snapshot_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
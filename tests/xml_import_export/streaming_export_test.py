@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+Test unit, comparing documents written by streaming and ElementTree based XML exporters
+"""
+import glob
+import io
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_rep as diagram
+import bpmn_python.bpmn_python_consts as consts
+
+import diagram_test_utils as test_utils
+
+
+class StreamingExportTests(test_utils.DiagramAssertions, unittest.TestCase):
+    """
+    This class contains tests checking that diagram exported with streaming exporter is imported the same as diagram
+    exported with the default exporter.
+    """
+    examples_pattern = "../examples/*/*.bpmn"
+    output_directory = "./output/test-streaming-export/"
+    example_path = "../examples/xml_import_export/lanes.bpmn"
+
+    def test_streaming_export_of_examples(self):
+        example_paths = sorted(glob.glob(self.examples_pattern))
+        self.assertTrue(example_paths)
+        for example_path in example_paths:
+            bpmn_graph = test_utils.load_diagram(example_path)
+            filename = os.path.basename(example_path)
+            bpmn_graph.export_xml_file(self.output_directory, "tree_" + filename)
+            bpmn_graph.export_xml_file(self.output_directory, "streaming_" + filename, streaming=True)
+            self.assert_same_diagrams(
+                test_utils.load_diagram(os.path.join(self.output_directory, "tree_" + filename)),
+                test_utils.load_diagram(os.path.join(self.output_directory, "streaming_" + filename)))
+
+    def test_streaming_export_to_file_object(self):
+        bpmn_graph = test_utils.load_diagram(self.example_path)
+        binary_output = io.BytesIO()
+        bpmn_graph.write_xml(binary_output)
+        text_output = io.StringIO()
+        bpmn_graph.write_xml(text_output)
+        self.assertEqual(binary_output.getvalue().decode("utf-8"), text_output.getvalue())
+
+        compact_output = io.BytesIO()
+        bpmn_graph.write_xml(compact_output, indent=None)
+        # only XML declaration is followed by new line
+        self.assertEqual(compact_output.getvalue().count(b"\n"), 1)
+
+        bpmn_graph.export_xml_file(self.output_directory, "tree_file_object_lanes.bpmn")
+        filepath = os.path.abspath(os.path.join(self.output_directory, "file_object_lanes.bpmn"))
+        with open(filepath, "wb") as output_file:
+            output_file.write(binary_output.getvalue())
+        self.assert_same_diagrams(
+            test_utils.load_diagram(os.path.join(self.output_directory, "tree_file_object_lanes.bpmn")),
+            test_utils.load_diagram(filepath))
+
+    def test_streaming_export_no_di(self):
+        bpmn_graph = test_utils.load_diagram(self.example_path)
+        output = io.BytesIO()
+        bpmn_graph.write_xml(output, with_di=False)
+        self.assertNotIn(b"BPMNDiagram", output.getvalue())
+        self.assertIn(b"<process", output.getvalue())
+
+    def test_streaming_export_escaping(self):
+        bpmn_graph = diagram.BpmnDiagramGraph()
+        bpmn_graph.create_new_diagram_graph(diagram_name="diagram1")
+        process_id = bpmn_graph.add_process_to_diagram()
+        task_name = "a & <b> \"c\"\n'd'"
+        [task_id, _] = bpmn_graph.add_task_to_diagram(process_id, task_name=task_name)
+        output = io.BytesIO()
+        bpmn_graph.write_xml(output)
+        output.seek(0)
+        imported_graph = diagram.BpmnDiagramGraph()
+        imported_graph.load_diagram_from_xml_file(output, streaming=True)
+        self.assertEqual(imported_graph.get_node_by_id(task_id)[1][consts.Consts.node_name], task_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# coding=utf-8
+"""
+Test unit, comparing inner representations created by streaming and minidom based XML importers
+"""
+import glob
+import os
+import unittest
+
+import bpmn_python.bpmn_diagram_rep as diagram
+
+import diagram_test_utils as test_utils
+
+
+class StreamingImportTests(test_utils.DiagramAssertions, unittest.TestCase):
+    """
+    This class contains tests checking that streaming import of every example diagram gives the same result as
+    the default import.
+    """
+    examples_pattern = "../examples/*/*"
+    output_directory = "./output/test-streaming/"
+    example_path = "../examples/xml_import_export/lanes.bpmn"
+
+    def test_streaming_import_of_examples(self):
+        example_paths = sorted(glob.glob(self.examples_pattern))
+        self.assertTrue(example_paths)
+        for example_path in example_paths:
+            filepath = os.path.abspath(example_path)
+            self.assert_same_diagrams(test_utils.load_diagram(filepath),
+                                      test_utils.load_diagram(filepath, streaming=True), ordered=True)
+
+    def test_streaming_import_from_file_object(self):
+        filepath = os.path.abspath(self.example_path)
+        with open(filepath, "rb") as example_file:
+            bpmn_graph = diagram.BpmnDiagramGraph()
+            bpmn_graph.load_diagram_from_xml_file(example_file, streaming=True)
+        self.assert_same_diagrams(test_utils.load_diagram(filepath), bpmn_graph, ordered=True)
+        bpmn_graph.export_xml_file(self.output_directory, "lanes-streaming-output.xml")
+
+
+if __name__ == '__main__':
+    unittest.main()